@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from datetime import date, timedelta
+from pathlib import Path
 
 from fastapi import BackgroundTasks, FastAPI, HTTPException
 
@@ -9,7 +10,7 @@ from ims.core.logging import setup_logging
 from ims.core.settings import get_settings
 from ims.domain.types import AnalyzeRequest, RunStatus, TimelineResponse, WatchlistItem
 from ims.storage.db import connect, init_db
-from ims.storage.repos import Repos
+from ims.storage.repos import MOOD_ROLLUPS, Repos
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,31 @@ def _startup() -> None:
             app.state.scheduler_state = start_scheduler(settings)
         except Exception as e:  # noqa: BLE001
             logger.exception("Failed to start scheduler: %s", e)
+    if settings.ollama_enabled:
+        try:
+            from ims.pipelines.summaries import SummaryWorker
+
+            app.state.summary_worker = SummaryWorker(settings).start()
+        except Exception as e:  # noqa: BLE001
+            logger.exception("Failed to start summary worker: %s", e)
+
+
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    scheduler_state = getattr(app.state, "scheduler_state", None)
+    if scheduler_state is not None:
+        scheduler_state.scheduler.shutdown(wait=False)
+    summary_worker = getattr(app.state, "summary_worker", None)
+    if summary_worker is not None:
+        summary_worker.stop()
+
+    from ims.providers.http import close_http_client
+    from ims.services.ollama import close_ollama_client
+    from ims.services.workers import close_cpu_pool
+
+    close_http_client()
+    close_ollama_client()
+    close_cpu_pool()
 
 
 @app.get("/health")
@@ -76,24 +102,25 @@ def analyze(symbol: str, req: AnalyzeRequest, background_tasks: BackgroundTasks)
             run = repos.create_run(symbol)
         except Exception as e:  # noqa: BLE001
             raise HTTPException(500, f"Unable to create analyze run for {symbol}: {e}") from e
-    background_tasks.add_task(_execute_analyze_run, run.id, symbol, req.lookback_days)
+    background_tasks.add_task(_execute_analyze_run, run.id, symbol, req.lookback_days, req.full_refresh)
     return {"run_id": run.id, "status": "RUNNING"}
 
 
-def _execute_analyze_run(run_id: str, symbol: str, lookback_days: int) -> None:
+def _execute_analyze_run(run_id: str, symbol: str, lookback_days: int, full_refresh: bool = False) -> None:
     with connect(settings.db_path) as conn:
         repos = Repos(conn)
         try:
             from ims.pipelines.analyze import run_analyze
 
-            run_analyze(
+            result = run_analyze(
                 repos=repos,
                 settings=settings,
                 symbol=symbol,
                 lookback_days=lookback_days,
                 run_id=run_id,
+                full_refresh=full_refresh,
             )
-            repos.finish_run(run_id, "SUCCESS")
+            repos.finish_run(run_id, "SUCCESS" if result.ok else "FAILED")
         except Exception as e:  # noqa: BLE001
             repos.add_run_log(run_id, "ERROR", f"Analyze failed: {e}")
             repos.finish_run(run_id, "FAILED")
@@ -110,18 +137,26 @@ def get_run(run_id: str):
 
 
 @app.get("/timeline/{symbol}", response_model=TimelineResponse)
-def timeline(symbol: str, from_: str | None = None, to: str | None = None):  # noqa: A002
+def timeline(
+    symbol: str, from_: str | None = None, to: str | None = None, resolution: str = "day"  # noqa: A002
+):
     symbol = symbol.upper().strip()
+    if resolution not in MOOD_ROLLUPS:
+        raise HTTPException(400, f"resolution must be one of: {', '.join(MOOD_ROLLUPS)}")
     to_date = date.fromisoformat(to) if to else date.today()
     from_date = date.fromisoformat(from_) if from_ else (to_date - timedelta(days=90))
+    from ims.storage.price_store import get_price_store
+
     with connect(settings.db_path) as conn:
-        repos = Repos(conn)
+        repos = Repos(conn, price_store=get_price_store(settings))
         return {
             "symbol": symbol,
             "prices": repos.list_prices(symbol, from_date.isoformat(), to_date.isoformat()),
             "filings": repos.list_filings(symbol, from_date.isoformat(), to_date.isoformat()),
             "mood_daily": repos.list_mood_daily(symbol, from_date.isoformat(), to_date.isoformat()),
             "headlines": repos.list_headlines(symbol, from_date.isoformat(), to_date.isoformat()),
+            "resolution": resolution,
+            "mood": repos.list_mood(symbol, from_date.isoformat(), to_date.isoformat(), resolution),
         }
 
 
@@ -133,3 +168,41 @@ def filing_detail(filing_id: str):
         if not f:
             raise HTTPException(404, "Filing not found")
         return f
+
+
+@app.get("/filings/{filing_id}/text")
+def filing_text(filing_id: str, full: bool = False):
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        if full:
+            from ims.pipelines.filings import materialize_full_text
+
+            payload = materialize_full_text(repos=repos, settings=settings, filing_id=filing_id)
+        else:
+            f = repos.get_filing(filing_id)
+            payload = None
+            if f and f.get("text_path"):
+                path = Path(f["text_path"])
+                payload = {
+                    "filing_id": filing_id,
+                    "text": path.read_text(encoding="utf-8", errors="ignore") if path.exists() else "",
+                    "complete": bool(f.get("text_complete", 1)),
+                }
+        if payload is None:
+            raise HTTPException(404, "Filing not found")
+        return payload
+
+
+@app.get("/summaries/queue")
+def summary_queue():
+    with connect(settings.db_path) as conn:
+        return {"enabled": settings.ollama_enabled, **Repos(conn).summary_queue_stats()}
+
+
+@app.get("/stats/text-cache")
+def text_cache_stats():
+    from ims.storage.text_cache import cache_counters
+
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        return {**cache_counters(), **repos.text_cache_usage()}
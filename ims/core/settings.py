@@ -16,11 +16,17 @@ class Settings:
     db_path: Path = _user_home() / ".india-market-sentinel" / "ims.db"
     data_dir: Path = _user_home() / ".india-market-sentinel" / "data"
     logs_dir: Path = _user_home() / ".india-market-sentinel" / "logs"
+    db_busy_timeout_s: float = float(os.getenv("IMS_DB_BUSY_TIMEOUT_S", "30"))
 
     # Network
     http_timeout_s: float = 20.0
     http_retries: int = 3
     user_agent: str = "IndiaMarketSentinel/0.1 (+local-first)"
+    http_max_connections: int = int(os.getenv("IMS_HTTP_MAX_CONNECTIONS", "20"))
+    http_max_keepalive_connections: int = int(os.getenv("IMS_HTTP_MAX_KEEPALIVE", "10"))
+    http_max_per_host: int = int(os.getenv("IMS_HTTP_MAX_PER_HOST", "6"))
+    http_keepalive_expiry_s: float = float(os.getenv("IMS_HTTP_KEEPALIVE_S", "30"))
+    http2_enabled: bool = os.getenv("IMS_HTTP2", "false").lower() in ("1", "true", "yes", "y")
 
     # BSE
     bse_ann_endpoint: str = os.getenv(
@@ -28,15 +34,61 @@ class Settings:
         "https://api.bseindia.com/BseIndiaAPI/api/AnnGetData/w",
     )
 
+    # Filings
+    filings_download_concurrency: int = int(os.getenv("IMS_FILINGS_CONCURRENCY", "4"))
+    filings_cpu_workers: int = int(os.getenv("IMS_FILINGS_CPU_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+    # When true, known attachment URLs are re-checked with a HEAD request (ETag/Content-Length)
+    # before being skipped; by default BSE attachment URLs are treated as immutable.
+    filings_revalidate_urls: bool = os.getenv("IMS_FILINGS_REVALIDATE_URLS", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+        "y",
+    )
+
+    # Text-layer extractor: pypdf2 | pypdf | pymupdf | pdftotext | auto (fastest available)
+    pdf_text_backend: str = os.getenv("IMS_PDF_TEXT_BACKEND", "pypdf2")
+
+    # PDF extraction / OCR execution: "process" (spawned worker pool) or "inline"
+    pdf_worker_backend: str = os.getenv("IMS_PDF_WORKER_BACKEND", "process")
+    pdf_workers: int = int(os.getenv("IMS_PDF_WORKERS", str(os.cpu_count() or 2)))
+    pdf_task_timeout_s: float = float(os.getenv("IMS_PDF_TASK_TIMEOUT_S", "180"))
+    pdf_worker_max_tasks: int = int(os.getenv("IMS_PDF_WORKER_MAX_TASKS", "50"))
+
+    # Extracted-text cache (keyed by PDF sha256 + extractor/OCR settings)
+    text_cache_enabled: bool = os.getenv("IMS_TEXT_CACHE", "true").lower() in ("1", "true", "yes", "y")
+    text_cache_max_mb: float = float(os.getenv("IMS_TEXT_CACHE_MAX_MB", "256"))
+
     # OCR
     ocr_lang: str = os.getenv("IMS_OCR_LANG", "eng")
     ocr_max_pages: int = int(os.getenv("IMS_OCR_MAX_PAGES", "12"))
+    ocr_dpi: int = int(os.getenv("IMS_OCR_DPI", "200"))
+    # Pages rasterized + recognized concurrently per document (also the cap on live page images).
+    ocr_workers: int = int(os.getenv("IMS_OCR_WORKERS", "2"))
     pdf_text_min_chars: int = int(os.getenv("IMS_PDF_TEXT_MIN_CHARS", "250"))
+    # Extraction budget for ingest (0 = unlimited); the rest of the document is extracted on
+    # demand via GET /filings/{id}/text?full=true.
+    pdf_text_page_budget: int = int(os.getenv("IMS_PDF_TEXT_PAGE_BUDGET", "20"))
+    pdf_text_char_budget: int = int(os.getenv("IMS_PDF_TEXT_CHAR_BUDGET", "20000"))
+    # Pages whose own text layer is shorter than this (or mostly garbage) are OCRed individually.
+    pdf_page_text_min_chars: int = int(os.getenv("IMS_PDF_PAGE_TEXT_MIN_CHARS", "40"))
+
+    # Summarization: heuristics classify the title plus this many leading characters of text.
+    summary_scan_chars: int = int(os.getenv("IMS_SUMMARY_SCAN_CHARS", "20000"))
 
     # News RSS
     google_news_ceid: str = os.getenv("IMS_GOOGLE_NEWS_CEID", "IN:en")
     google_news_hl: str = os.getenv("IMS_GOOGLE_NEWS_HL", "en-IN")
     google_news_gl: str = os.getenv("IMS_GOOGLE_NEWS_GL", "IN")
+    # Watchlist refreshes fetch this many news queries concurrently.
+    news_fetch_concurrency: int = int(os.getenv("IMS_NEWS_CONCURRENCY", "4"))
+    # Near-duplicate collapsing: headlines of one symbol within the window whose estimated word-set
+    # similarity reaches the threshold are stored as copies of the first one (cluster_size).
+    news_dedupe_enabled: bool = os.getenv("IMS_NEWS_DEDUPE", "true").lower() in ("1", "true", "yes", "y")
+    news_dedupe_window_hours: float = float(os.getenv("IMS_NEWS_DEDUPE_WINDOW_HOURS", "48"))
+    news_dedupe_min_similarity: float = float(os.getenv("IMS_NEWS_DEDUPE_MIN_SIMILARITY", "0.7"))
+    # Drop headlines that do not mention the company (symbol, name variants, initials, ISIN).
+    news_relevance_filter: bool = os.getenv("IMS_NEWS_RELEVANCE", "true").lower() in ("1", "true", "yes", "y")
 
     # Sentiment
     mood_positive_threshold: float = float(os.getenv("IMS_MOOD_POS_TH", "0.10"))
@@ -44,6 +96,14 @@ class Settings:
 
     # Price
     price_default_lookback_days: int = int(os.getenv("IMS_PRICE_LOOKBACK_DAYS", "90"))
+    # Watchlist refreshes download prices for this many tickers per Yahoo request.
+    price_batch_size: int = int(os.getenv("IMS_PRICE_BATCH_SIZE", "50"))
+    # Refreshes only fetch bars after the last stored one, re-reading this many days before it.
+    price_overlap_days: int = int(os.getenv("IMS_PRICE_OVERLAP_DAYS", "5"))
+    # A symbol's resolved Yahoo ticker (.NS / .BO / bare) is reused for this long, or until it fails.
+    price_ticker_ttl_days: float = float(os.getenv("IMS_PRICE_TICKER_TTL_DAYS", "30"))
+    # Keep a columnar, month-partitioned copy of prices under data_dir/prices and serve reads from it.
+    price_store_enabled: bool = os.getenv("IMS_PRICE_STORE", "false").lower() in ("1", "true", "yes", "y")
 
     # Scheduler
     scheduler_enabled: bool = os.getenv("IMS_SCHEDULER_ENABLED", "true").lower() in (
@@ -63,6 +123,16 @@ class Settings:
     )
     ollama_base_url: str = os.getenv("IMS_OLLAMA_BASE_URL", "http://localhost:11434")
     ollama_model: str = os.getenv("IMS_OLLAMA_MODEL", "llama3.2")
+    ollama_timeout_s: float = float(os.getenv("IMS_OLLAMA_TIMEOUT_S", "30"))
+    # Generations in flight at once across the whole process (the local model serializes anyway).
+    ollama_max_concurrency: int = int(os.getenv("IMS_OLLAMA_MAX_CONCURRENCY", "2"))
+    ollama_cache_size: int = int(os.getenv("IMS_OLLAMA_CACHE_SIZE", "1024"))
+    # Low-confidence filings are summarized by a background worker polling this often.
+    summary_queue_poll_s: float = float(os.getenv("IMS_SUMMARY_QUEUE_POLL_S", "5"))
+    summary_job_max_attempts: int = int(os.getenv("IMS_SUMMARY_JOB_MAX_ATTEMPTS", "3"))
+    # A failed job is retried after base * 2^(attempts - 1) seconds, capped at max.
+    summary_job_retry_base_s: float = float(os.getenv("IMS_SUMMARY_JOB_RETRY_BASE_S", "60"))
+    summary_job_retry_max_s: float = float(os.getenv("IMS_SUMMARY_JOB_RETRY_MAX_S", "3600"))
 
 
 def get_settings() -> Settings:
@@ -22,6 +22,8 @@ class RunStatus(BaseModel):
 
 class AnalyzeRequest(BaseModel):
     lookback_days: int = 30
+    # Refetch the whole price window instead of only the bars after the last stored one.
+    full_refresh: bool = False
 
 
 class TimelineResponse(BaseModel):
@@ -30,4 +32,7 @@ class TimelineResponse(BaseModel):
     filings: list[dict]
     mood_daily: list[dict]
     headlines: list[dict]
+    resolution: str = "day"
+    # Mood rollup at `resolution`: bucket, mood_avg, mood_wavg (confidence-weighted), counts.
+    mood: list[dict] = Field(default_factory=list)
 
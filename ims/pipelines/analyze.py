@@ -1,28 +1,49 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from collections.abc import Callable, Collection
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import date, timedelta
+from typing import Any
 
 from ims.core.settings import Settings
 from ims.providers.bse import BseAnnouncementsProvider
-from ims.providers.http import HttpClient
+from ims.providers.http import get_http_client
 from ims.providers.news import GoogleNewsRssProvider
 from ims.providers.price import YahooPriceProvider
 from ims.pipelines.filings import FilingIngestStats, ingest_filings
 from ims.pipelines.news import NewsIngestStats, ingest_news
 from ims.pipelines.price import PriceIngestStats, ingest_prices
+from ims.storage.db import connect
+from ims.storage.price_store import get_price_store
 from ims.storage.repos import Repos
 
 logger = logging.getLogger(__name__)
 
+ANALYZE_STAGES = ("filings", "news", "prices")
+
 
 @dataclass(frozen=True)
 class AnalyzeResult:
     run_id: str
-    filings: FilingIngestStats
-    news: NewsIngestStats
-    prices: PriceIngestStats
+    filings: FilingIngestStats | None
+    news: NewsIngestStats | None
+    prices: PriceIngestStats | None
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _run_stage(settings: Settings, stage: Callable[[Repos], Any]) -> Any:
+    # Each stage runs on its own thread with its own connection: SQLite connections are not
+    # shared across threads. The connection is in autocommit mode so a stage never holds the
+    # write lock while it waits on the network; the pipelines group each batch of writes
+    # (prices, a symbol's headlines, one filing) into a `write_transaction`.
+    with connect(settings.db_path, autocommit=True, timeout_s=settings.db_busy_timeout_s) as conn:
+        return stage(Repos(conn, price_store=get_price_store(settings)))
 
 
 def run_analyze(
@@ -32,7 +53,18 @@ def run_analyze(
     symbol: str,
     lookback_days: int,
     run_id: str,
+    stages: Collection[str] = ANALYZE_STAGES,
+    full_refresh: bool = False,
 ) -> AnalyzeResult:
+    """
+    Run the filings, news and price stages for one symbol concurrently.
+
+    `stages` selects a subset; the scheduler runs news and prices for the whole watchlist in
+    batches and only filings per symbol. Prices are fetched incrementally unless `full_refresh`.
+
+    Stage failures do not cancel sibling stages; they are logged to the run and reported in
+    `AnalyzeResult.errors` (callers mark the run FAILED when `result.ok` is False).
+    """
     company = repos.get_company(symbol)
     if not company:
         raise RuntimeError(f"Unknown company symbol: {symbol} (seed companies first)")
@@ -40,50 +72,95 @@ def run_analyze(
     if not scrip_code:
         raise RuntimeError(f"Missing BSE scrip code for {symbol}. Update companies table/seed.")
 
-    http = HttpClient(
-        timeout_s=settings.http_timeout_s, retries=settings.http_retries, user_agent=settings.user_agent
-    )
+    http = get_http_client(settings)
     bse_provider = BseAnnouncementsProvider(http=http, endpoint=settings.bse_ann_endpoint)
     news_provider = GoogleNewsRssProvider(http=http, settings=settings)
-    price_provider = YahooPriceProvider()
 
     to_d = date.today()
     from_d = to_d - timedelta(days=max(lookback_days, 30))
 
     repos.add_run_log(run_id, "INFO", f"Analyze started for {symbol} lookback_days={lookback_days}")
+    # Stage connections must see the run row (and must not wait on our write lock).
+    repos.conn.commit()
 
-    filings_stats = ingest_filings(
-        repos=repos,
-        settings=settings,
-        http=http,
-        provider=bse_provider,
-        run_id=run_id,
-        symbol=symbol,
-        scrip_code=str(scrip_code),
-        from_date=from_d,
-        to_date=to_d,
-    )
-    repos.add_run_log(
-        run_id,
-        "INFO",
-        f"Filings: fetched={filings_stats.fetched} downloaded={filings_stats.downloaded} "
-        f"persisted={filings_stats.persisted} ocr_used={filings_stats.ocr_used}",
-    )
-
-    news_stats = ingest_news(
-        repos=repos,
-        run_id=run_id,
-        symbol=symbol,
-        company_name=company["name"],
-        provider=news_provider,
-        lookback_days=lookback_days,
-    )
-    repos.add_run_log(run_id, "INFO", f"News: fetched={news_stats.fetched} persisted={news_stats.persisted}")
+    stage_fns: dict[str, Callable[[Repos], Any]] = {
+        "filings": lambda r: ingest_filings(
+            repos=r,
+            settings=settings,
+            http=http,
+            provider=bse_provider,
+            run_id=run_id,
+            symbol=symbol,
+            scrip_code=str(scrip_code),
+            from_date=from_d,
+            to_date=to_d,
+        ),
+        "news": lambda r: ingest_news(
+            repos=r,
+            settings=settings,
+            run_id=run_id,
+            symbol=symbol,
+            company_name=company["name"],
+            isin=company.get("isin"),
+            provider=news_provider,
+            lookback_days=lookback_days,
+        ),
+        "prices": lambda r: ingest_prices(
+            repos=r,
+            run_id=run_id,
+            symbol=symbol,
+            provider=YahooPriceProvider(),
+            lookback_days=lookback_days,
+            ticker_ttl_days=settings.price_ticker_ttl_days,
+            overlap_days=settings.price_overlap_days,
+            full_refresh=full_refresh,
+        ),
+    }
+    stage_fns = {name: fn for name, fn in stage_fns.items() if name in stages}
 
-    price_stats = ingest_prices(
-        repos=repos, run_id=run_id, symbol=symbol, provider=price_provider, lookback_days=lookback_days
-    )
-    repos.add_run_log(run_id, "INFO", f"Prices: bars={price_stats.bars}")
+    results: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(stage_fns)), thread_name_prefix=f"analyze-{symbol}") as pool:
+        futures = {pool.submit(_run_stage, settings, fn): name for name, fn in stage_fns.items()}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                results[name] = fut.result()
+            except Exception as e:  # noqa: BLE001
+                logger.exception("Analyze stage failed stage=%s symbol=%s", name, symbol)
+                errors[name] = str(e)
 
-    return AnalyzeResult(run_id=run_id, filings=filings_stats, news=news_stats, prices=price_stats)
+    filings_stats = results.get("filings")
+    if filings_stats is not None:
+        repos.add_run_log(
+            run_id,
+            "INFO",
+            f"Filings: fetched={filings_stats.fetched} downloaded={filings_stats.downloaded} "
+            f"persisted={filings_stats.persisted} ocr_used={filings_stats.ocr_used} "
+            f"ocr_truncated={filings_stats.ocr_truncated} "
+            f"skipped_known_url={filings_stats.skipped_known_url} requests_saved={filings_stats.requests_saved} "
+            f"bytes_saved={filings_stats.bytes_saved} text_cache_hits={filings_stats.cache_hits} "
+            f"text_cache_misses={filings_stats.cache_misses} summaries_queued={filings_stats.summaries_queued}",
+        )
+    news_stats = results.get("news")
+    if news_stats is not None:
+        repos.add_run_log(
+            run_id,
+            "INFO",
+            f"News: fetched={news_stats.fetched} persisted={news_stats.persisted} "
+            f"duplicates={news_stats.duplicates} dropped_irrelevant={news_stats.dropped_irrelevant}",
+        )
+    price_stats = results.get("prices")
+    if price_stats is not None:
+        repos.add_run_log(
+            run_id,
+            "INFO",
+            f"Prices: bars={price_stats.bars} days={price_stats.period_days} "
+            f"full_refresh={price_stats.full_refresh}",
+        )
+    for name, err in errors.items():
+        repos.add_run_log(run_id, "ERROR", f"{name.capitalize()} stage failed: {err}")
 
+    return AnalyzeResult(
+        run_id=run_id, filings=filings_stats, news=news_stats, prices=price_stats, errors=errors
+    )
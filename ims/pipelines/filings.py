@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-import hashlib
 import logging
-from dataclasses import dataclass
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
 
 from ims.core.settings import Settings
-from ims.providers.bse import BseAnnouncementsProvider
-from ims.providers.http import HttpClient
-from ims.services.ocr import ocr_pdf
-from ims.services.pdf_text import extract_pdf_text
+from ims.pipelines.summaries import LLM_CONFIDENCE_THRESHOLD
+from ims.providers.bse import BseAnnouncement, BseAnnouncementsProvider
+from ims.providers.http import DownloadResult, HttpClient
+from ims.services.ocr import ocr_pdf, tesseract_version
+from ims.services.pdf_text import extract_pdf_text, page_needs_ocr, resolve_backend
 from ims.services.summarize import summarize_filing
+from ims.services.workers import get_cpu_pool
+from ims.storage.db import write_transaction
 from ims.storage.repos import Repos, stable_id
+from ims.storage.text_cache import CachedText, TextCache
 
 logger = logging.getLogger(__name__)
 
@@ -24,14 +29,219 @@ class FilingIngestStats:
     ocr_used: int
     persisted: int
     skipped_existing: int
+    skipped_known_url: int = 0
+    requests_saved: int = 0
+    bytes_saved: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    summaries_queued: int = 0
+    # Filings with more pages needing OCR than `ocr_max_pages`.
+    ocr_truncated: int = 0
 
 
-def _sha256(path: Path) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+@dataclass(frozen=True)
+class _ProcessedFiling:
+    ann: BseAnnouncement
+    pdf_sha256: str
+    pdf_path: Path
+    text_path: Path
+    text_source: str
+    category: str
+    summary: str
+    confidence: float
+    ocr_used: bool
+    ocr_pages: int
+    ocr_engine_version: str | None
+    ocr_page_list: list[int] = field(default_factory=list)
+    text_complete: bool = True
+    ocr_truncated: bool = False
+    extracted: CachedText | None = None
+    from_cache: bool = False
+
+
+def _parse_length(headers) -> int | None:
+    try:
+        return int(headers.get("content-length"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _unchanged_remote(known: dict, headers) -> bool:
+    etag = headers.get("etag")
+    if etag and known.get("etag"):
+        return etag == known["etag"]
+    length = _parse_length(headers)
+    if length is not None and known.get("content_length") is not None:
+        return length == known["content_length"]
+    return False
+
+
+def _fetch(
+    *, http: HttpClient, settings: Settings, symbol: str, ann: BseAnnouncement, known: dict | None
+) -> DownloadResult | None:
+    """I/O stage: download the attachment; None means a revalidated, unchanged known URL."""
+    if known is not None:
+        try:
+            headers = http.head(ann.pdf_url)
+        except Exception as e:  # noqa: BLE001
+            # Hosts that refuse HEAD (405/403) or time out: keep the ingested copy, as without
+            # revalidation, rather than failing a filing we already have.
+            logger.info("HEAD revalidation failed, keeping known copy url=%s err=%s", ann.pdf_url, e)
+            return None
+        if _unchanged_remote(known, headers):
+            return None
+    date_dir = (ann.announced_at or date.today().isoformat()).split("T")[0]
+    base_dir = settings.data_dir / "filings" / symbol.upper() / date_dir
+    return http.download(ann.pdf_url, base_dir)
+
+
+def _extract(*, settings: Settings, pdf_path: Path, extractor: str, budgeted: bool = True) -> CachedText:
+    """
+    Text layer per page, with OCR for pages whose text layer is missing or garbage.
+
+    When `budgeted`, extraction stops at `pdf_text_page_budget` pages / `pdf_text_char_budget`
+    characters: summaries only need the opening text, and large annual reports would
+    otherwise dominate ingest time.
+    """
+    cpu = get_cpu_pool(settings)
+    pdf_text = cpu.run(
+        extract_pdf_text,
+        pdf_path,
+        backend=extractor,
+        max_pages=(settings.pdf_text_page_budget or None) if budgeted else None,
+        max_chars=(settings.pdf_text_char_budget or None) if budgeted else None,
+    )
+    page_texts = list(pdf_text.page_texts)
+    ocr_version = None
+    ocr_page_list: list[int] = []
+    ocr_truncated = False
+
+    # OCR only pages whose text layer is empty or garbage; an almost text-free document
+    # (a plain scan) is OCRed from the first page as before, and one whose text layer yields
+    # no pages at all (broken or image-only) from page 1 up to the OCR budget.
+    if not page_texts:
+        ocr_targets = list(range(1, settings.ocr_max_pages + 1))
+    elif len(pdf_text.text.strip()) < settings.pdf_text_min_chars:
+        ocr_targets = list(range(1, len(page_texts) + 1))
+    else:
+        ocr_targets = [
+            i
+            for i, t in enumerate(page_texts, start=1)
+            if page_needs_ocr(t, min_chars=settings.pdf_page_text_min_chars)
+        ]
+    if ocr_targets:
+        ocr = cpu.run(
+            ocr_pdf,
+            pdf_path,
+            lang=settings.ocr_lang,
+            max_pages=settings.ocr_max_pages,
+            dpi=settings.ocr_dpi,
+            workers=settings.ocr_workers,
+            pages=ocr_targets,
+        )
+        ocr_version = ocr.engine_version
+        if not page_texts:
+            page_texts = [""] * max((p.page for p in ocr.pages), default=0)
+            ocr_truncated = ocr.total_pages > len(ocr.pages)
+        else:
+            ocr_truncated = len(ocr.pages) < len(ocr_targets)
+        for page in ocr.pages:
+            ocr_page_list.append(page.page)
+            if page.text.strip():
+                page_texts[page.page - 1] = page.text
+
+    # `text_source` says where the text came from; pages left out by the OCR budget are
+    # reported separately, so a scan cut short by `ocr_max_pages` is still "ocr", not "mixed".
+    if not ocr_page_list:
+        text_source = "pdf_text"
+    elif set(range(1, len(page_texts) + 1)) <= set(ocr_targets):
+        text_source = "ocr"
+    else:
+        text_source = "mixed"
+    if ocr_truncated:
+        logger.info(
+            "OCR budget reached path=%s pages_needing_ocr=%s ocr_max_pages=%s",
+            pdf_path.name,
+            len(ocr_targets),
+            settings.ocr_max_pages,
+        )
+    return CachedText(
+        text="\n".join(page_texts).strip(),
+        text_source=text_source,
+        ocr_page_list=ocr_page_list,
+        engine_version=ocr_version,
+        complete=pdf_text.complete,
+        ocr_truncated=ocr_truncated,
+    )
+
+
+def _process(
+    *,
+    settings: Settings,
+    ann: BseAnnouncement,
+    dl: DownloadResult,
+    extractor: str,
+    cached: CachedText | None,
+) -> _ProcessedFiling:
+    """
+    CPU stage: text extraction (unless cached), OCR fallback and heuristic summarization.
+    Never touches the DB; low-confidence summaries are upgraded later by the summary queue.
+    """
+    extracted = cached or _extract(settings=settings, pdf_path=dl.path, extractor=extractor)
+    text = extracted.text
+
+    sr = summarize_filing(ann.title, text, scan_chars=settings.summary_scan_chars)
+
+    text_path = dl.path.with_suffix(".txt")
+    text_path.write_text(text, encoding="utf-8", errors="ignore")
+
+    return _ProcessedFiling(
+        ann=ann,
+        pdf_sha256=dl.sha256,
+        pdf_path=dl.path,
+        text_path=text_path,
+        text_source=extracted.text_source,
+        category=sr.category,
+        summary=sr.summary,
+        confidence=sr.confidence,
+        ocr_used=bool(extracted.ocr_page_list),
+        ocr_pages=len(extracted.ocr_page_list),
+        ocr_engine_version=extracted.engine_version,
+        ocr_page_list=extracted.ocr_page_list,
+        text_complete=extracted.complete,
+        ocr_truncated=extracted.ocr_truncated,
+        extracted=extracted,
+        from_cache=cached is not None,
+    )
+
+
+def _persist(repos: Repos, symbol: str, pf: _ProcessedFiling) -> str:
+    filing_id = stable_id(symbol.upper(), pf.pdf_sha256)
+    repos.upsert_filing(
+        filing_id=filing_id,
+        symbol=symbol,
+        announced_at=pf.ann.announced_at,
+        title=pf.ann.title,
+        category=pf.category,
+        summary=pf.summary,
+        confidence=pf.confidence,
+        pdf_url=pf.ann.pdf_url,
+        pdf_sha256=pf.pdf_sha256,
+        text_source=pf.text_source,
+    )
+    repos.insert_filing_artifact(
+        artifact_id=stable_id(filing_id, "artifact"),
+        filing_id=filing_id,
+        pdf_path=str(pf.pdf_path),
+        text_path=str(pf.text_path),
+        ocr_used=pf.ocr_used,
+        ocr_pages=pf.ocr_pages,
+        ocr_engine_version=pf.ocr_engine_version,
+        ocr_page_list=pf.ocr_page_list,
+        text_complete=pf.text_complete,
+        ocr_truncated=pf.ocr_truncated,
+    )
+    return filing_id
 
 
 def ingest_filings(
@@ -46,88 +256,174 @@ def ingest_filings(
     from_date: date,
     to_date: date,
 ) -> FilingIngestStats:
+    """
+    Download, extract, summarize and persist a symbol's announcements.
+
+    Downloads run on a pool of `filings_download_concurrency` threads and extraction/OCR/
+    summarization on a separate pool of `filings_cpu_workers`; each announcement moves to the
+    CPU pool as soon as its download finishes. All DB reads and writes stay on the calling
+    thread, which is the single writer for `repos`.
+    """
     anns = provider.list_announcements(scrip_code=scrip_code, from_date=from_date, to_date=to_date)
-    stats = {"fetched": len(anns), "downloaded": 0, "ocr_used": 0, "persisted": 0, "skipped_existing": 0}
+    stats = {
+        "fetched": len(anns),
+        "downloaded": 0,
+        "ocr_used": 0,
+        "persisted": 0,
+        "skipped_existing": 0,
+        "skipped_known_url": 0,
+        "requests_saved": 0,
+        "bytes_saved": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "summaries_queued": 0,
+        "ocr_truncated": 0,
+    }
+    extractor = resolve_backend(settings.pdf_text_backend).name
+    text_cache = TextCache(repos, settings) if settings.text_cache_enabled else None
+    engine_version = tesseract_version() if text_cache else None
 
-    for ann in anns:
-        try:
-            date_dir = (ann.announced_at or date.today().isoformat()).split("T")[0]
-            base_dir = settings.data_dir / "filings" / symbol.upper() / date_dir
-            tmp_pdf = base_dir / "download.pdf"
-            http.download(ann.pdf_url, tmp_pdf)
-            stats["downloaded"] += 1
-
-            pdf_sha = _sha256(tmp_pdf)
-            if repos.filing_exists(symbol, pdf_sha):
-                stats["skipped_existing"] += 1
-                continue
-
-            pdf_path = base_dir / f"{pdf_sha}.pdf"
-            tmp_pdf.replace(pdf_path)
-
-            pdf_text = extract_pdf_text(pdf_path)
-            text = pdf_text.text.strip()
-            text_source = "pdf_text"
-            ocr_used = False
-            ocr_pages = 0
-            ocr_version = None
-
-            if len(text) < settings.pdf_text_min_chars:
-                ocr = ocr_pdf(pdf_path, lang=settings.ocr_lang, max_pages=settings.ocr_max_pages)
-                text = ocr.text.strip() or text
-                ocr_used = True
-                text_source = "ocr"
-                ocr_pages = ocr.pages_ocr
-                ocr_version = ocr.engine_version
-                stats["ocr_used"] += 1
-
-            # Summarize (heuristics first)
-            sr = summarize_filing(ann.title, text)
-            summary = sr.summary
-            confidence = sr.confidence
-            category = sr.category
-
-            # Optional Ollama fallback for low confidence
-            if settings.ollama_enabled and confidence < 0.55:
-                try:
-                    from ims.services.ollama import OllamaClient
+    def fail(ann: BseAnnouncement, e: Exception) -> None:
+        repos.add_run_log(run_id, "ERROR", f"Filing ingest failed: {ann.title} ({e})")
+        logger.error("Filing ingest failed: %s", ann.title, exc_info=e)
+
+    with (
+        ThreadPoolExecutor(max(1, settings.filings_download_concurrency), "filings-io") as io_pool,
+        ThreadPoolExecutor(max(1, settings.filings_cpu_workers), "filings-cpu") as cpu_pool,
+    ):
+        pending: dict[Future, tuple[BseAnnouncement, dict | None]] = {}
+        cache_keys: dict[str, str] = {}
+        seen_shas: set[str] = set()
 
-                    summary = OllamaClient(
-                        base_url=settings.ollama_base_url, model=settings.ollama_model
-                    ).summarize_one_sentence(title=ann.title, text=text)
-                    confidence = max(confidence, 0.60)
+        for ann in anns:
+            try:
+                # Attachments we have already ingested for this symbol are skipped before any
+                # bytes are transferred (optionally after a cheap HEAD revalidation).
+                known = repos.get_pdf_url_index(ann.pdf_url)
+                if known and repos.filing_exists(symbol, known["pdf_sha256"]):
+                    if not settings.filings_revalidate_urls:
+                        stats["skipped_known_url"] += 1
+                        stats["requests_saved"] += 1
+                        stats["bytes_saved"] += known.get("content_length") or 0
+                        continue
+                else:
+                    known = None
+                fut = io_pool.submit(_fetch, http=http, settings=settings, symbol=symbol, ann=ann, known=known)
+                pending[fut] = (ann, known)
+            except Exception as e:  # noqa: BLE001
+                fail(ann, e)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                ann, known = pending.pop(fut)
+                try:
+                    result = fut.result()
+                    if result is None:
+                        stats["skipped_known_url"] += 1
+                        stats["bytes_saved"] += (known or {}).get("content_length") or 0
+                    elif isinstance(result, DownloadResult):
+                        stats["downloaded"] += 1
+                        repos.upsert_pdf_url_index(
+                            pdf_url=ann.pdf_url, pdf_sha256=result.sha256, content_length=result.size, etag=result.etag
+                        )
+                        # Two announcements in one run can share an attachment.
+                        if result.sha256 in seen_shas or repos.filing_exists(symbol, result.sha256):
+                            stats["skipped_existing"] += 1
+                            continue
+                        seen_shas.add(result.sha256)
+                        cached = None
+                        if text_cache is not None:
+                            key = text_cache.key(
+                                pdf_sha256=result.sha256, extractor=extractor, engine_version=engine_version
+                            )
+                            cache_keys[result.sha256] = key
+                            cached = text_cache.get(key)
+                            stats["cache_hits" if cached else "cache_misses"] += 1
+                        fut = cpu_pool.submit(
+                            _process, settings=settings, ann=ann, dl=result, extractor=extractor, cached=cached
+                        )
+                        pending[fut] = (ann, known)
+                    else:
+                        with write_transaction(repos.conn, "persist_filing"):
+                            filing_id = _persist(repos, symbol, result)
+                            queued = settings.ollama_enabled and result.confidence < LLM_CONFIDENCE_THRESHOLD
+                            if queued:
+                                repos.enqueue_summary_job(filing_id)
+                        stats["summaries_queued"] += int(queued)
+                        if text_cache is not None and not result.from_cache and result.extracted is not None:
+                            text_cache.put(
+                                cache_keys[result.pdf_sha256],
+                                pdf_sha256=result.pdf_sha256,
+                                extractor=extractor,
+                                entry=result.extracted,
+                            )
+                        if result.ocr_used:
+                            stats["ocr_used"] += 1
+                        if result.ocr_truncated:
+                            stats["ocr_truncated"] += 1
+                        stats["persisted"] += 1
                 except Exception as e:  # noqa: BLE001
-                    repos.add_run_log(run_id, "WARN", f"Ollama fallback failed: {e}")
-
-            text_path = base_dir / f"{pdf_sha}.txt"
-            text_path.write_text(text, encoding="utf-8", errors="ignore")
-
-            filing_id = stable_id(symbol.upper(), pdf_sha)
-            repos.upsert_filing(
-                filing_id=filing_id,
-                symbol=symbol,
-                announced_at=ann.announced_at,
-                title=ann.title,
-                category=category,
-                summary=summary,
-                confidence=confidence,
-                pdf_url=ann.pdf_url,
-                pdf_sha256=pdf_sha,
-                text_source=text_source,
-            )
-            repos.insert_filing_artifact(
-                artifact_id=stable_id(filing_id, "artifact"),
-                filing_id=filing_id,
-                pdf_path=str(pdf_path),
-                text_path=str(text_path),
-                ocr_used=ocr_used,
-                ocr_pages=ocr_pages,
-                ocr_engine_version=ocr_version,
-            )
-            stats["persisted"] += 1
-        except Exception as e:  # noqa: BLE001
-            repos.add_run_log(run_id, "ERROR", f"Filing ingest failed: {ann.title} ({e})")
-            logger.exception("Filing ingest failed")
+                    fail(ann, e)
 
     return FilingIngestStats(**stats)
 
+
+# One lock per filing being materialized, so concurrent `full` requests extract it once.
+_materializing: dict[str, threading.Lock] = {}
+_materializing_lock = threading.Lock()
+
+
+def _materialize(repos: Repos, settings: Settings, filing: dict) -> str:
+    extractor = resolve_backend(settings.pdf_text_backend).name
+    text_cache = TextCache(repos, settings) if settings.text_cache_enabled else None
+    key = None
+    extracted = None
+    if text_cache is not None:
+        key = text_cache.key(
+            pdf_sha256=filing["pdf_sha256"], extractor=extractor, engine_version=tesseract_version(), budgeted=False
+        )
+        extracted = text_cache.get(key)
+    if extracted is None:
+        extracted = _extract(settings=settings, pdf_path=Path(filing["pdf_path"]), extractor=extractor, budgeted=False)
+        if text_cache is not None:
+            text_cache.put(key, pdf_sha256=filing["pdf_sha256"], extractor=extractor, entry=extracted)
+    Path(filing["text_path"]).write_text(extracted.text, encoding="utf-8", errors="ignore")
+    repos.mark_filing_text_complete(
+        filing["id"],
+        text_source=extracted.text_source,
+        ocr_page_list=extracted.ocr_page_list,
+        ocr_engine_version=extracted.engine_version,
+        ocr_truncated=extracted.ocr_truncated,
+    )
+    # Visible to the requests waiting on this filing's lock.
+    repos.conn.commit()
+    return extracted.text
+
+
+def materialize_full_text(*, repos: Repos, settings: Settings, filing_id: str) -> dict | None:
+    """
+    Return a filing's stored text, first extracting the whole document if ingest stopped at
+    the extraction budget.
+
+    Extraction and OCR run on the shared CPU pool, once per document: the result goes to the
+    text cache under the unbudgeted key, the `.txt` artifact is rewritten and the filing's
+    `text_source` / OCR fields are updated.
+    """
+    filing = repos.get_filing(filing_id)
+    if not filing or not filing.get("text_path"):
+        return None
+    if not filing.get("text_complete", 1):
+        with _materializing_lock:
+            lock = _materializing.setdefault(filing_id, threading.Lock())
+        with lock:
+            try:
+                filing = repos.get_filing(filing_id)
+                if not filing.get("text_complete", 1):
+                    return {"filing_id": filing_id, "text": _materialize(repos, settings, filing), "complete": True}
+            finally:
+                with _materializing_lock:
+                    _materializing.pop(filing_id, None)
+    text_path = Path(filing["text_path"])
+    text = text_path.read_text(encoding="utf-8", errors="ignore") if text_path.exists() else ""
+    return {"filing_id": filing_id, "text": text, "complete": True}
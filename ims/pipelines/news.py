@@ -1,69 +1,223 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from datetime import date, datetime, timezone
+from dataclasses import dataclass, field
 
-from ims.providers.news import GoogleNewsRssProvider
-from ims.services.sentiment import score_headline
+from ims.core.settings import Settings
+from ims.providers.news import GoogleNewsRssProvider, NewsItem, canonical_url
+from ims.services.minhash import headline_tokens, lsh_bands, minhash, pack, similarity, unpack
+from ims.services.relevance import alias_index, company_index, filter_relevant
+from ims.services.sentiment import SentimentScore, score_headlines
+from ims.storage.db import write_transaction
 from ims.storage.repos import Repos, stable_id
 
 logger = logging.getLogger(__name__)
 
+_ITEMS_PER_QUERY = 50
+
 
 @dataclass(frozen=True)
 class NewsIngestStats:
     fetched: int
     persisted: int
+    duplicates: int = 0
+    dropped_irrelevant: int = 0
+
+
+@dataclass(frozen=True)
+class NewsBatchResult:
+    stats: dict[str, NewsIngestStats]
+    errors: dict[str, str] = field(default_factory=dict)
+    queries: int = 0
+    items: int = 0
+    unique_headlines: int = 0
+
+
+def news_query(symbol: str, company_name: str) -> str:
+    return f"{symbol} {company_name} stock"
+
+
+def _dedupe(items: list[NewsItem]) -> list[NewsItem]:
+    """First item per canonical URL (the same article often arrives with different tracking params)."""
+    seen: dict[str, NewsItem] = {}
+    for it in items:
+        seen.setdefault(canonical_url(it.url), it)
+    return list(seen.values())
+
+
+class _NearDuplicates:
+    """Per-symbol near-duplicate check against the incremental LSH index in the DB."""
+
+    # Very short titles ("Stock update") share too many words with unrelated ones.
+    MIN_TOKENS = 3
+
+    def __init__(self, repos: Repos, settings: Settings):
+        self.repos = repos
+        self.enabled = settings.news_dedupe_enabled
+        self.window_hours = settings.news_dedupe_window_hours
+        self.min_similarity = settings.news_dedupe_min_similarity
+
+    def signature(self, title: str) -> tuple[int, ...] | None:
+        tokens = headline_tokens(title)
+        return minhash(tokens) if self.enabled and len(tokens) >= self.MIN_TOKENS else None
+
+    def find(self, symbol: str, it: NewsItem, sig: tuple[int, ...]) -> tuple[str, float] | None:
+        """Best stored match `(headline_id, similarity)` at or above the threshold, if any."""
+        best: tuple[str, float] | None = None
+        for cand in self.repos.find_lsh_candidates(symbol, lsh_bands(sig), it.published_at, self.window_hours):
+            if cand["minhash"] is None:
+                continue
+            sim = similarity(sig, unpack(cand["minhash"]))
+            if sim >= self.min_similarity and (best is None or sim > best[1]):
+                best = (cand["id"], sim)
+        return best
+
+
+def _persist(
+    repos: Repos,
+    settings: Settings,
+    run_id: str,
+    symbol: str,
+    items: list[NewsItem],
+    scores: list[SentimentScore],
+) -> tuple[int, int]:
+    """Store scored headlines, collapsing near-duplicates; returns (persisted, duplicates)."""
+    dups = _NearDuplicates(repos, settings)
+    persisted = duplicates = 0
+    # One write transaction per batch, not one commit per statement on autocommit connections.
+    with write_transaction(repos.conn, "persist_news"):
+        for it, ss in zip(items, scores):
+            try:
+                # Ids and stored links use the canonical URL, so the same article arriving with other
+                # tracking params (another feed, a later refresh) maps to the same row.
+                url = canonical_url(it.url)
+                hid = stable_id(symbol.upper(), url)
+                state = repos.headline_state(hid)
+                if state == "duplicate":
+                    duplicates += 1
+                    continue
+                sig = dups.signature(it.title) if state is None else None
+                match = dups.find(symbol, it, sig) if sig is not None else None
+                if match is not None:
+                    repos.add_news_duplicate(
+                        headline_id=hid,
+                        canonical_id=match[0],
+                        symbol=symbol,
+                        published_at=it.published_at,
+                        source=it.source,
+                        title=it.title,
+                        url=url,
+                        similarity=match[1],
+                    )
+                    duplicates += 1
+                    continue
+                # Mood rollups are updated incrementally by upsert_headline, so only unique stories count.
+                repos.upsert_headline(
+                    headline_id=hid,
+                    symbol=symbol,
+                    published_at=it.published_at,
+                    source=it.source,
+                    title=it.title,
+                    url=url,
+                    mood_score=ss.score,
+                    confidence=ss.confidence,
+                )
+                if sig is not None:
+                    repos.index_headline_minhash(hid, symbol, pack(sig), lsh_bands(sig))
+                persisted += 1
+            except Exception as e:  # noqa: BLE001
+                repos.add_run_log(run_id, "WARN", f"News ingest failed: {e}")
+    return persisted, duplicates
 
 
 def ingest_news(
     *,
     repos: Repos,
+    settings: Settings,
     run_id: str,
     symbol: str,
     company_name: str,
     provider: GoogleNewsRssProvider,
     lookback_days: int,
+    isin: str | None = None,
 ) -> NewsIngestStats:
-    query = f"{symbol} {company_name} stock"
-    items = provider.search(query, limit=50)
-    persisted = 0
-    by_day: dict[date, list[float]] = {}
+    items = provider.search(news_query(symbol, company_name), limit=_ITEMS_PER_QUERY)
+    unique = _dedupe(items)
+    dropped = 0
+    if settings.news_relevance_filter:
+        unique, dropped = filter_relevant(alias_index(symbol.upper(), company_name, isin), unique)
+    persisted, duplicates = _persist(
+        repos, settings, run_id, symbol, unique, score_headlines(it.title for it in unique)
+    )
+    return NewsIngestStats(
+        fetched=len(items), persisted=persisted, duplicates=duplicates, dropped_irrelevant=dropped
+    )
 
-    for it in items:
-        try:
-            ss = score_headline(it.title)
-            hid = stable_id(symbol.upper(), it.url)
-            repos.upsert_headline(
-                headline_id=hid,
-                symbol=symbol,
-                published_at=it.published_at,
-                source=it.source,
-                title=it.title,
-                url=it.url,
-                mood_score=ss.score,
-                confidence=ss.confidence,
-            )
-            persisted += 1
-
-            if it.published_at:
-                dt = _parse_iso(it.published_at)
-                if dt:
-                    day = dt.date()
-                    by_day.setdefault(day, []).append(ss.score)
-        except Exception as e:  # noqa: BLE001
-            repos.add_run_log(run_id, "WARN", f"News ingest failed: {e}")
-
-    for d, scores in by_day.items():
-        repos.upsert_mood_daily(symbol, d, scores)
-
-    return NewsIngestStats(fetched=len(items), persisted=persisted)
-
-
-def _parse_iso(s: str) -> datetime | None:
-    try:
-        return datetime.fromisoformat(s.replace("Z", "+00:00")).astimezone(timezone.utc)
-    except Exception:  # noqa: BLE001
-        return None
 
+def ingest_news_batch(
+    *,
+    repos: Repos,
+    settings: Settings,
+    provider: GoogleNewsRssProvider,
+    companies: list[dict],
+    run_ids: dict[str, str],
+) -> NewsBatchResult:
+    """
+    News stage for a whole watchlist: fetch every symbol's query concurrently, parse each feed
+    once, dedupe articles across symbols by canonical URL, drop headlines that do not mention the
+    symbol's company, score each remaining headline once and fan the scored headlines out to
+    `news_headlines` per symbol.
+
+    `companies` are rows with `symbol`, `name` and optionally `isin`; `run_ids` maps each symbol
+    to its run for logs.
+    """
+    queries = {c["symbol"]: news_query(c["symbol"], c["name"]) for c in companies}
+    indexes = {c["symbol"]: company_index(c) for c in companies}
+    feeds = provider.search_many(
+        queries.values(), limit=_ITEMS_PER_QUERY, max_workers=settings.news_fetch_concurrency
+    )
+
+    per_symbol: dict[str, list[NewsItem]] = {}
+    fetched: dict[str, int] = {}
+    dropped: dict[str, int] = {}
+    errors: dict[str, str] = {}
+    articles: dict[str, NewsItem] = {}
+    for symbol, query in queries.items():
+        feed = feeds[query]
+        if isinstance(feed, Exception):
+            errors[symbol] = str(feed)
+            continue
+        fetched[symbol] = len(feed)
+        keys = []
+        for it in feed:
+            key = canonical_url(it.url)
+            # Scored once per article; every symbol's copy is stored under the canonical URL.
+            keys.append(key)
+            articles.setdefault(key, it)
+        items = [articles[k] for k in dict.fromkeys(keys)]
+        if settings.news_relevance_filter:
+            items, dropped[symbol] = filter_relevant(indexes[symbol], items)
+        per_symbol[symbol] = items
+
+    # Only headlines some symbol kept are scored.
+    keys = list(dict.fromkeys(canonical_url(it.url) for items in per_symbol.values() for it in items))
+    scored = dict(zip(keys, score_headlines(articles[k].title for k in keys)))
+
+    stats: dict[str, NewsIngestStats] = {}
+    for symbol, items in per_symbol.items():
+        scores = [scored[canonical_url(it.url)] for it in items]
+        persisted, duplicates = _persist(repos, settings, run_ids[symbol], symbol, items, scores)
+        stats[symbol] = NewsIngestStats(
+            fetched=fetched[symbol],
+            persisted=persisted,
+            duplicates=duplicates,
+            dropped_irrelevant=dropped.get(symbol, 0),
+        )
+
+    return NewsBatchResult(
+        stats=stats,
+        errors=errors,
+        queries=len(set(queries.values())),
+        items=sum(fetched.values()),
+        unique_headlines=len(articles),
+    )
@@ -1,25 +1,213 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
+from datetime import date, datetime
 
-from ims.providers.price import YahooPriceProvider
+from ims.providers.price import PriceColumns, YahooPriceProvider
 from ims.storage.repos import Repos
 
 logger = logging.getLogger(__name__)
 
+# A re-read bar whose close moved by more than this means Yahoo re-based the history (a split,
+# or a corrected feed): the symbol's whole stored history is fetched again.
+ADJUSTMENT_TOLERANCE = 0.005
+
 
 @dataclass(frozen=True)
 class PriceIngestStats:
     bars: int
+    # Days requested from Yahoo, and whether the whole stored history was fetched again.
+    period_days: int = 0
+    full_refresh: bool = False
+
+
+@dataclass(frozen=True)
+class PriceBatchResult:
+    stats: dict[str, PriceIngestStats]
+    errors: dict[str, str] = field(default_factory=dict)
+    # Multi-ticker downloads made, and symbols that had to be fetched one by one.
+    requests: int = 0
+    fallbacks: int = 0
+
+
+def _bar_date(ts: str) -> date:
+    return datetime.fromisoformat(ts).date()
+
+
+def _full_window(bounds: tuple[str, str] | None, lookback_days: int, today: date) -> int:
+    """The lookback, stretched to cover every stored bar."""
+    if bounds is None:
+        return lookback_days
+    return max(lookback_days, (today - _bar_date(bounds[0])).days + 1)
+
+
+def _window(
+    bounds: tuple[str, str] | None, *, lookback_days: int, overlap_days: int, full_refresh: bool, today: date
+) -> int:
+    """Days to request: from `overlap_days` before the last stored bar, or everything."""
+    if full_refresh or bounds is None:
+        return _full_window(bounds, lookback_days, today)
+    return max(1, min(lookback_days, (today - _bar_date(bounds[1])).days + overlap_days))
+
+
+def _rebased(repos: Repos, symbol: str, cols: PriceColumns, last_ts: str) -> bool:
+    """Whether re-read bars disagree with the stored closes."""
+    if not len(cols):
+        return False
+    stored = repos.price_closes(symbol, cols.ts[0])
+    for ts, close in zip(cols.ts.tolist(), cols.close.tolist()):
+        old = stored.get(ts)
+        # The last stored bar may have been captured mid-session, so it is allowed to change.
+        if ts >= last_ts or old is None or math.isnan(close):
+            continue
+        if abs(close - old) > ADJUSTMENT_TOLERANCE * abs(old):
+            return True
+    return False
+
+
+def _store(
+    repos: Repos,
+    provider: YahooPriceProvider,
+    symbol: str,
+    ticker: str,
+    cols: PriceColumns,
+    bounds: tuple[str, str] | None,
+    *,
+    period_days: int,
+    lookback_days: int,
+    full_refresh: bool,
+    today: date,
+) -> PriceIngestStats:
+    if bounds is not None and not full_refresh and _rebased(repos, symbol, cols, bounds[1]):
+        period_days = _full_window(bounds, lookback_days, today)
+        logger.info("Price history re-based, refetching symbol=%s days=%s", symbol, period_days)
+        _, cols = provider.history_resolved(symbol, period_days=period_days, prefer=ticker)
+        return PriceIngestStats(
+            bars=repos.replace_price_columns(symbol, cols), period_days=period_days, full_refresh=True
+        )
+    return PriceIngestStats(
+        bars=repos.upsert_price_columns(symbol, cols), period_days=period_days, full_refresh=full_refresh
+    )
+
+
+def ingest_prices(
+    *,
+    repos: Repos,
+    run_id: str,
+    symbol: str,
+    provider: YahooPriceProvider,
+    lookback_days: int,
+    ticker_ttl_days: float = 30.0,
+    overlap_days: int = 5,
+    full_refresh: bool = False,
+) -> PriceIngestStats:
+    """
+    Fetch the bars after the last stored one (re-reading `overlap_days` before it, so the last
+    bar is corrected) or, with `full_refresh` or no stored bars, the whole window.
+    """
+    today = date.today()
+    bounds = repos.price_bounds([symbol]).get(symbol.upper())
+    period = _window(
+        bounds, lookback_days=lookback_days, overlap_days=overlap_days, full_refresh=full_refresh, today=today
+    )
+    known = repos.get_yahoo_tickers([symbol], max_age_days=ticker_ttl_days).get(symbol.upper())
+    try:
+        ticker, cols = provider.history_resolved(symbol, period_days=period, prefer=known)
+    except Exception:
+        if known:
+            repos.delete_yahoo_ticker(symbol)
+        raise
+    if ticker != known:
+        repos.set_yahoo_ticker(symbol, ticker)
+    return _store(
+        repos,
+        provider,
+        symbol,
+        ticker,
+        cols,
+        bounds,
+        period_days=period,
+        lookback_days=lookback_days,
+        full_refresh=full_refresh,
+        today=today,
+    )
+
+
+def ingest_prices_batch(
+    *,
+    repos: Repos,
+    provider: YahooPriceProvider,
+    symbols: list[str],
+    lookback_days: int,
+    chunk_size: int = 50,
+    ticker_ttl_days: float = 30.0,
+    overlap_days: int = 5,
+    full_refresh: bool = False,
+) -> PriceBatchResult:
+    """
+    Price stage for a whole watchlist: one multi-ticker download per `chunk_size` symbols, split
+    per symbol into `prices`. Each symbol is downloaded under its cached Yahoo ticker (younger
+    than `ticker_ttl_days`) or its primary one; symbols missing from the batch fall back to the
+    remaining candidates one by one, and the ticker that worked is cached.
+
+    Like `ingest_prices`, only bars after the last stored one are requested; symbols needing the
+    same number of days share downloads.
+    """
+    today = date.today()
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    bounds = repos.price_bounds(symbols)
+    periods = {
+        s: _window(
+            bounds.get(s),
+            lookback_days=lookback_days,
+            overlap_days=overlap_days,
+            full_refresh=full_refresh,
+            today=today,
+        )
+        for s in symbols
+    }
+    known = repos.get_yahoo_tickers(symbols, max_age_days=ticker_ttl_days)
+    tickers = {s: known.get(s) or provider.primary_ticker(s) for s in symbols}
 
+    size = max(1, chunk_size)
+    batch: dict[str, PriceColumns] = {}
+    requests = 0
+    for period in sorted(set(periods.values())):
+        group = [s for s in symbols if periods[s] == period]
+        batch.update(provider.history_many(group, period_days=period, chunk_size=size, tickers=tickers))
+        requests += (len(group) + size - 1) // size
 
-def ingest_prices(*, repos: Repos, run_id: str, symbol: str, provider: YahooPriceProvider, lookback_days: int) -> PriceIngestStats:
-    bars = provider.history(symbol, period_days=lookback_days)
-    rows = [
-        {"ts": b.ts, "open": b.open, "high": b.high, "low": b.low, "close": b.close, "volume": b.volume}
-        for b in bars
-    ]
-    repos.upsert_prices(symbol, rows)
-    return PriceIngestStats(bars=len(rows))
+    stats: dict[str, PriceIngestStats] = {}
+    errors: dict[str, str] = {}
+    fallbacks = 0
+    for symbol in symbols:
+        try:
+            ticker, cols = tickers[symbol], batch.get(symbol)
+            if cols is None:
+                fallbacks += 1
+                ticker, cols = provider.history_resolved(
+                    symbol, period_days=periods[symbol], exclude=(tickers[symbol],)
+                )
+            if ticker != known.get(symbol):
+                repos.set_yahoo_ticker(symbol, ticker)
+            stats[symbol] = _store(
+                repos,
+                provider,
+                symbol,
+                ticker,
+                cols,
+                bounds.get(symbol),
+                period_days=periods[symbol],
+                lookback_days=lookback_days,
+                full_refresh=full_refresh,
+                today=today,
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Price ingest failed symbol=%s err=%s", symbol, e)
+            if symbol in known:
+                repos.delete_yahoo_ticker(symbol)
+            errors[symbol] = str(e)
 
+    return PriceBatchResult(stats=stats, errors=errors, requests=requests, fallbacks=fallbacks)
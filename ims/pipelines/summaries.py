@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+
+from ims.core.settings import Settings
+from ims.services.ollama import OllamaClient, get_ollama_client
+from ims.storage.db import connect
+from ims.storage.repos import Repos
+
+logger = logging.getLogger(__name__)
+
+# Heuristic summaries below this confidence are queued for the LLM; an LLM summary is
+# recorded with at least LLM_CONFIDENCE.
+LLM_CONFIDENCE_THRESHOLD = 0.55
+LLM_CONFIDENCE = 0.60
+
+
+def process_summary_jobs(
+    repos: Repos, settings: Settings, *, client: OllamaClient | None = None, limit: int | None = None
+) -> int:
+    """
+    Claim a batch of pending summary jobs, summarize them concurrently and upgrade the filings.
+
+    Returns the number of jobs claimed (0 when no job is due). Failed jobs go back to the
+    queue with exponential backoff until they have been tried `summary_job_max_attempts` times.
+    (An unreachable model thus does not burn every attempt within seconds.)
+    """
+    client = client or get_ollama_client(settings)
+    jobs = repos.claim_summary_jobs(limit or max(1, settings.ollama_max_concurrency) * 2)
+    if not jobs:
+        return 0
+
+    items: list[tuple[str, str]] = []
+    for job in jobs:
+        path = Path(job["text_path"]) if job["text_path"] else None
+        text = path.read_text(encoding="utf-8", errors="ignore") if path and path.exists() else ""
+        items.append((job["title"], text))
+
+    for job, result in zip(jobs, client.summarize_many(items)):
+        if isinstance(result, Exception):
+            retry_in_s = None
+            if job["attempts"] < settings.summary_job_max_attempts:
+                retry_in_s = min(
+                    settings.summary_job_retry_max_s, settings.summary_job_retry_base_s * 2 ** (job["attempts"] - 1)
+                )
+            repos.fail_summary_job(job["filing_id"], str(result), retry_in_s=retry_in_s)
+        else:
+            repos.complete_summary_job(job["filing_id"], summary=result, confidence=LLM_CONFIDENCE)
+    return len(jobs)
+
+
+def drain_summary_jobs(repos: Repos, settings: Settings, *, client: OllamaClient | None = None) -> int:
+    """
+    Process summary jobs until none is due, for runs without a `SummaryWorker` (CLI, scripts).
+    Jobs waiting to be retried stay queued. Returns the number of jobs claimed.
+    """
+    total = 0
+    while claimed := process_summary_jobs(repos, settings, client=client):
+        total += claimed
+    return total
+
+
+class SummaryWorker:
+    """
+    Background thread that drains `summary_jobs`, so analyze runs finish with heuristic
+    summaries and never wait on the local model.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="summary-worker", daemon=True)
+
+    def start(self) -> SummaryWorker:
+        with connect(self.settings.db_path, autocommit=True, timeout_s=self.settings.db_busy_timeout_s) as conn:
+            requeued = Repos(conn).requeue_running_summary_jobs()
+        if requeued:
+            logger.info("Requeued %s interrupted summary jobs", requeued)
+        self._thread.start()
+        logger.info("Summary worker started poll_s=%s", self.settings.summary_queue_poll_s)
+        return self
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout_s)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            claimed = 0
+            try:
+                with connect(
+                    self.settings.db_path, autocommit=True, timeout_s=self.settings.db_busy_timeout_s
+                ) as conn:
+                    claimed = process_summary_jobs(Repos(conn), self.settings)
+            except Exception as e:  # noqa: BLE001
+                logger.exception("Summary worker iteration failed: %s", e)
+            if not claimed:
+                self._stop.wait(self.settings.summary_queue_poll_s)
@@ -1,30 +1,126 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import tempfile
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import json
+from pathlib import Path
+from urllib.parse import urlsplit
 
 import httpx
 
+from ims.core.settings import Settings
+
 logger = logging.getLogger(__name__)
 
 
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except Exception:  # noqa: BLE001
+        return False
+    return True
+
+
 @dataclass(frozen=True)
+class DownloadResult:
+    path: Path
+    sha256: str
+    size: int
+    etag: str | None
+
+
+@dataclass
 class HttpClient:
+    """
+    Retrying HTTP client backed by one long-lived, pooled `httpx.Client`.
+
+    The underlying client is created lazily on first use and reused for every call
+    (and every retry), so connections to the same host are kept alive between requests.
+    `max_per_host` caps concurrent requests to a single host on top of the pool-wide limits.
+    """
+
     timeout_s: float
     retries: int
     user_agent: str
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    max_per_host: int = 6
+    keepalive_expiry_s: float = 30.0
+    http2: bool = False
+    transport: httpx.BaseTransport | None = None
+
+    _client: httpx.Client | None = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _host_slots: dict[str, threading.BoundedSemaphore] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> HttpClient:
+        return cls(
+            timeout_s=settings.http_timeout_s,
+            retries=settings.http_retries,
+            user_agent=settings.user_agent,
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            max_per_host=settings.http_max_per_host,
+            keepalive_expiry_s=settings.http_keepalive_expiry_s,
+            http2=settings.http2_enabled,
+        )
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _build_client(self) -> httpx.Client:
+        http2 = self.http2
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but the `h2` package is not installed; using HTTP/1.1")
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_s,
+        )
+        return httpx.Client(
+            timeout=self.timeout_s,
+            headers={"User-Agent": self.user_agent},
+            follow_redirects=True,
+            limits=limits,
+            http2=http2,
+            transport=self.transport,
+        )
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(max(1, self.max_per_host))
+                self._host_slots[host] = slot
+        return slot
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
 
     def get_text(self, url: str, *, params: dict | None = None, headers: dict | None = None) -> str:
         last_exc: Exception | None = None
-        merged_headers = {"User-Agent": self.user_agent}
-        if headers:
-            merged_headers.update(headers)
         for attempt in range(1, self.retries + 1):
             try:
-                with httpx.Client(timeout=self.timeout_s, headers=merged_headers, follow_redirects=True) as c:
-                    r = c.get(url, params=params)
+                with self._host_slot(url):
+                    r = self.client.get(url, params=params, headers=headers)
                     r.raise_for_status()
                     return r.text
             except Exception as e:  # noqa: BLE001
@@ -41,24 +137,87 @@ class HttpClient:
         except Exception as e:  # noqa: BLE001
             raise RuntimeError(f"Invalid JSON from {url}") from e
 
-    def download(self, url: str, dst_path, *, headers: dict | None = None) -> None:
+    def head(self, url: str, *, headers: dict | None = None) -> httpx.Headers:
+        """Response headers; 4xx answers (e.g. 405 from hosts without HEAD) raise without retrying."""
+        last_exc: Exception | None = None
+        for attempt in range(1, self.retries + 1):
+            try:
+                with self._host_slot(url):
+                    r = self.client.head(url, headers=headers)
+                    r.raise_for_status()
+                    return r.headers
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code < 500:
+                    raise
+                last_exc = e
+                logger.warning("HEAD failed attempt=%s url=%s err=%s", attempt, url, e)
+                time.sleep(min(2**attempt, 8))
+            except Exception as e:  # noqa: BLE001
+                last_exc = e
+                sleep_s = min(2**attempt, 8)
+                logger.warning("HEAD failed attempt=%s url=%s err=%s", attempt, url, e)
+                time.sleep(sleep_s)
+        raise RuntimeError(f"HEAD failed after {self.retries} retries: {url}") from last_exc
+
+    def download(
+        self, url: str, dst_dir: Path, *, suffix: str = ".pdf", headers: dict | None = None
+    ) -> DownloadResult:
+        """
+        Stream `url` into `dst_dir/<sha256><suffix>`, hashing the bytes as they arrive.
+
+        Bytes go to a unique temp file in `dst_dir` first and are atomically renamed into the
+        content-addressed path, so concurrent downloads never share a temp path and callers
+        never need to re-read the file to hash it.
+        """
         last_exc: Exception | None = None
-        merged_headers = {"User-Agent": self.user_agent}
-        if headers:
-            merged_headers.update(headers)
+        dst_dir.mkdir(parents=True, exist_ok=True)
         for attempt in range(1, self.retries + 1):
+            fd, tmp_name = tempfile.mkstemp(dir=dst_dir, prefix=".download-", suffix=".part")
+            tmp_path = Path(tmp_name)
+            f = os.fdopen(fd, "wb")
             try:
-                with httpx.Client(timeout=self.timeout_s, headers=merged_headers, follow_redirects=True) as c:
-                    with c.stream("GET", url) as r:
+                h = hashlib.sha256()
+                size = 0
+                with self._host_slot(url):
+                    with self.client.stream("GET", url, headers=headers) as r:
                         r.raise_for_status()
-                        dst_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(dst_path, "wb") as f:
+                        with f:
                             for chunk in r.iter_bytes():
+                                h.update(chunk)
                                 f.write(chunk)
-                return
+                                size += len(chunk)
+                        etag = r.headers.get("etag")
+                digest = h.hexdigest()
+                final_path = dst_dir / f"{digest}{suffix}"
+                os.replace(tmp_path, final_path)
+                return DownloadResult(path=final_path, sha256=digest, size=size, etag=etag)
             except Exception as e:  # noqa: BLE001
                 last_exc = e
+                f.close()
+                tmp_path.unlink(missing_ok=True)
                 sleep_s = min(2**attempt, 8)
                 logger.warning("DOWNLOAD failed attempt=%s url=%s err=%s", attempt, url, e)
                 time.sleep(sleep_s)
         raise RuntimeError(f"DOWNLOAD failed after {self.retries} retries: {url}") from last_exc
+
+
+_shared: HttpClient | None = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client(settings: Settings) -> HttpClient:
+    """Process-wide pooled client shared by all providers."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = HttpClient.from_settings(settings)
+    return _shared
+
+
+def close_http_client() -> None:
+    global _shared
+    with _shared_lock:
+        client, _shared = _shared, None
+    if client is not None:
+        client.close()
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import logging
 import urllib.parse
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
@@ -21,6 +23,24 @@ class NewsItem:
     url: str
 
 
+# Query parameters that only identify the referrer / campaign, never the article.
+_TRACKING_PARAMS = {"oc", "gclid", "fbclid", "ref", "ref_src", "cmpid", "ito", "mc_cid", "mc_eid"}
+
+
+def canonical_url(url: str) -> str:
+    """Identity of an article link: lowercase scheme/host, no fragment, no tracking params or trailing slash."""
+    parts = urllib.parse.urlsplit(url.strip())
+    query = [
+        (k, v)
+        for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urllib.parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, urllib.parse.urlencode(sorted(query)), "")
+    )
+
+
 class GoogleNewsRssProvider:
     def __init__(self, http: HttpClient, settings: Settings):
         self.http = http
@@ -55,3 +75,22 @@ class GoogleNewsRssProvider:
             out.append(NewsItem(published_at=published_at, source=source, title=title, url=link))
         return out
 
+    def search_many(
+        self, queries: Iterable[str], *, limit: int = 30, max_workers: int = 4
+    ) -> dict[str, list[NewsItem] | Exception]:
+        """
+        Run several searches concurrently; each distinct query is fetched and parsed once.
+
+        A failed query maps to its exception so one bad feed does not sink the batch.
+        """
+
+        def one(query: str) -> list[NewsItem] | Exception:
+            try:
+                return self.search(query, limit=limit)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("News search failed query=%s err=%s", query, e)
+                return e
+
+        unique = list(dict.fromkeys(queries))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="news") as pool:
+            return dict(zip(unique, pool.map(one, unique)))
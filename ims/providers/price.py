@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Collection, Mapping, Sequence
 from dataclasses import dataclass
-from datetime import datetime, timezone
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+OHLCV = ("open", "high", "low", "close", "volume")
+
 
 @dataclass(frozen=True)
 class PriceBar:
@@ -19,9 +22,87 @@ class PriceBar:
     volume: float | None
 
 
+@dataclass(frozen=True)
+class PriceColumns:
+    """
+    Price history as columns: `ts` holds ISO-8601 strings with a `+HH:MM` offset (the format
+    stored in `prices.ts`), the OHLCV arrays are float64 with NaN for missing values.
+    """
+
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def empty(cls) -> PriceColumns:
+        return cls(np.array([], dtype=object), *(np.array([], dtype="float64") for _ in OHLCV))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> PriceColumns:
+        """From `(symbol, ts, open, high, low, close, volume)` tuples (None becomes NaN)."""
+        if not rows:
+            return cls.empty()
+        _, ts, *cols = zip(*rows)
+        return cls(np.array(ts, dtype=object), *(np.array(c, dtype="float64") for c in cols))
+
+    def rows(self, symbol: str):
+        """`(symbol, ts, open, high, low, close, volume)` tuples with NaN as None, for executemany."""
+        cols = []
+        for name in OHLCV:
+            arr = getattr(self, name)
+            obj = arr.astype(object)
+            obj[np.isnan(arr)] = None
+            cols.append(obj.tolist())
+        return zip([symbol.upper()] * len(self), self.ts.tolist(), *cols)
+
+    def bars(self) -> list[PriceBar]:
+        return [PriceBar(ts, *vals) for _, ts, *vals in self.rows("")]
+
+
+def _iso_timestamps(idx: pd.DatetimeIndex) -> np.ndarray:
+    """Vectorized `Timestamp.isoformat()` (seconds precision); naive timestamps are taken as UTC."""
+    if idx.tz is None:
+        idx = idx.tz_localize("UTC")
+    wall = idx.tz_localize(None)
+    text = wall.values.astype("datetime64[s]").astype(str).astype(object)
+    # Offsets take a handful of distinct values (one, or two across DST), so format each once.
+    offsets = (wall.values - idx.tz_convert("UTC").tz_localize(None).values) // np.timedelta64(60, "s")
+    uniq, inverse = np.unique(offsets, return_inverse=True)
+    labels = np.array(
+        [f"{'-' if m < 0 else '+'}{abs(int(m)) // 60:02d}:{abs(int(m)) % 60:02d}" for m in uniq], dtype=object
+    )
+    return text + labels[inverse]
+
+
+def price_columns(df: pd.DataFrame | None) -> PriceColumns:
+    """Convert a yfinance history frame (DatetimeIndex, Open/High/Low/Close/Volume) in bulk."""
+    if df is None or df.empty:
+        return PriceColumns.empty()
+    if isinstance(df.index, pd.DatetimeIndex):
+        idx = df.index
+    else:
+        col = "Date" if "Date" in df.columns else "Datetime"
+        idx = pd.DatetimeIndex(pd.to_datetime(df[col]))
+    cols = []
+    for name in OHLCV:
+        key = name.capitalize()
+        if key in df.columns:
+            cols.append(pd.to_numeric(df[key], errors="coerce").to_numpy(dtype="float64", na_value=np.nan))
+        else:
+            cols.append(np.full(len(df), np.nan))
+    return PriceColumns(_iso_timestamps(idx), *cols)
+
+
 class YahooPriceProvider:
-    def __init__(self):
-        import yfinance as yf  # lazy import
+    def __init__(self, yf=None):
+        if yf is None:
+            import yfinance as yf  # lazy import
 
         self.yf = yf
 
@@ -29,50 +110,84 @@ class YahooPriceProvider:
         base = symbol.upper().strip()
         return [base + ".NS", base + ".BO", base]
 
-    def history(self, symbol: str, *, period_days: int) -> list[PriceBar]:
+    def primary_ticker(self, symbol: str) -> str:
+        """The ticker tried first, and the one batch downloads use."""
+        return self._candidates(symbol)[0]
+
+    def history_many(
+        self,
+        symbols: Sequence[str],
+        *,
+        period_days: int,
+        chunk_size: int = 50,
+        tickers: Mapping[str, str] | None = None,
+    ) -> dict[str, PriceColumns]:
+        """
+        Daily history for many symbols with one multi-ticker `yf.download` per chunk, split per
+        symbol. One ticker is tried per symbol: `tickers[symbol]` (a previously resolved one) or
+        the `primary_ticker`. Symbols absent from the result (unknown ticker, failed chunk) are
+        left out, for the caller to fetch one by one.
+        """
+        out: dict[str, PriceColumns] = {}
+        tickers = tickers or {}
+        by_ticker = {tickers.get(s) or self.primary_ticker(s): s for s in dict.fromkeys(symbols)}
+        batch = list(by_ticker)
+        for i in range(0, len(batch), max(1, chunk_size)):
+            chunk = batch[i : i + max(1, chunk_size)]
+            try:
+                df = self.yf.download(
+                    chunk,
+                    period=f"{period_days}d",
+                    group_by="ticker",
+                    auto_adjust=False,
+                    # Keep exchange-local timestamps, as Ticker.history returns them.
+                    ignore_tz=False,
+                    threads=True,
+                    progress=False,
+                )
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Yahoo batch download failed tickers=%s err=%s", len(chunk), e)
+                continue
+            if df is None or df.empty:
+                continue
+            for ticker in chunk:
+                if isinstance(df.columns, pd.MultiIndex):
+                    if ticker not in df.columns.get_level_values(0):
+                        continue
+                    part = df[ticker]
+                elif len(chunk) == 1:
+                    part = df
+                else:
+                    continue
+                part = part.dropna(how="all")
+                if not part.empty:
+                    out[by_ticker[ticker]] = price_columns(part)
+        return out
+
+    def history_resolved(
+        self, symbol: str, *, period_days: int, prefer: str | None = None, exclude: Collection[str] = ()
+    ) -> tuple[str, PriceColumns]:
+        """
+        History from the first ticker that returns data, trying `prefer` (a previously resolved
+        ticker) before the `.NS` / `.BO` / bare candidates; returns `(ticker, columns)`.
+        """
         last_err: Exception | None = None
-        for ticker in self._candidates(symbol):
+        for ticker in dict.fromkeys([prefer, *self._candidates(symbol)] if prefer else self._candidates(symbol)):
+            if ticker in exclude:
+                continue
             try:
                 t = self.yf.Ticker(ticker)
                 df = t.history(period=f"{period_days}d", auto_adjust=False)
                 if df is None or df.empty:
                     continue
-                df = df.reset_index()
-                out: list[PriceBar] = []
-                for _, r in df.iterrows():
-                    ts = r.get("Date") or r.get("Datetime")
-                    if isinstance(ts, pd.Timestamp):
-                        if ts.tzinfo is None:
-                            ts = ts.replace(tzinfo=timezone.utc)
-                        ts_str = ts.isoformat()
-                    elif isinstance(ts, datetime):
-                        ts_str = ts.isoformat()
-                    else:
-                        ts_str = str(ts)
-                    out.append(
-                        PriceBar(
-                            ts=ts_str,
-                            open=_to_float(r.get("Open")),
-                            high=_to_float(r.get("High")),
-                            low=_to_float(r.get("Low")),
-                            close=_to_float(r.get("Close")),
-                            volume=_to_float(r.get("Volume")),
-                        )
-                    )
-                return out
+                return ticker, price_columns(df)
             except Exception as e:  # noqa: BLE001
                 last_err = e
                 logger.warning("Yahoo history failed ticker=%s err=%s", ticker, e)
         raise RuntimeError(f"Yahoo price history unavailable for {symbol}") from last_err
 
+    def history_columns(self, symbol: str, *, period_days: int, exclude: Collection[str] = ()) -> PriceColumns:
+        return self.history_resolved(symbol, period_days=period_days, exclude=exclude)[1]
 
-def _to_float(v) -> float | None:
-    try:
-        if v is None:
-            return None
-        if pd.isna(v):
-            return None
-        return float(v)
-    except Exception:  # noqa: BLE001
-        return None
-
+    def history(self, symbol: str, *, period_days: int) -> list[PriceBar]:
+        return self.history_columns(symbol, period_days=period_days).bars()
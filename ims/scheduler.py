@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -19,30 +20,152 @@ class SchedulerState:
 
 def start_scheduler(settings: Settings) -> SchedulerState:
     sched = BackgroundScheduler(daemon=True)
+    sched.add_job(
+        refresh_watchlist,
+        "interval",
+        args=[settings],
+        minutes=settings.scheduler_interval_minutes,
+        id="watchlist-refresh",
+    )
+    sched.start()
+    logger.info("Scheduler started interval_minutes=%s", settings.scheduler_interval_minutes)
+    return SchedulerState(scheduler=sched)
 
-    def refresh_watchlist() -> None:
-        from ims.pipelines.analyze import run_analyze
 
-        with connect(settings.db_path) as conn:
-            repos = Repos(conn)
-            for item in repos.list_watchlist():
-                symbol = item["symbol"]
-                run = repos.create_run(symbol)
+def refresh_watchlist(settings: Settings) -> None:
+    """
+    One watchlist refresh: the batched news and price stages and the per-symbol filings stages
+    run concurrently, each on its own thread and connection, then every run is finished.
+    """
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        items = repos.list_watchlist()
+        if not items:
+            return
+        runs = {item["symbol"]: repos.create_run(item["symbol"]) for item in items}
+        # The stages write through their own connections and must see the runs.
+        conn.commit()
+        run_ids = {s: r.id for s, r in runs.items()}
+
+        failed: set[str] = set()
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="watchlist") as pool:
+            stages = {
+                name: pool.submit(fn, settings, items, run_ids)
+                for name, fn in (("news", _refresh_news), ("prices", _refresh_prices), ("filings", _refresh_filings))
+            }
+            for name, fut in stages.items():
                 try:
-                    run_analyze(
-                        repos=repos,
-                        settings=settings,
-                        symbol=symbol,
-                        lookback_days=settings.price_default_lookback_days,
-                        run_id=run.id,
-                    )
-                    repos.finish_run(run.id, "SUCCESS")
+                    failed |= fut.result()
                 except Exception as e:  # noqa: BLE001
-                    repos.add_run_log(run.id, "ERROR", f"Watchdog analyze failed: {e}")
-                    repos.finish_run(run.id, "FAILED")
+                    logger.exception("Watchlist %s stage failed", name)
+                    for run_id in run_ids.values():
+                        repos.add_run_log(run_id, "ERROR", f"{name.capitalize()} stage failed: {e}")
+                    failed |= set(run_ids)
 
-    sched.add_job(refresh_watchlist, "interval", minutes=settings.scheduler_interval_minutes, id="watchlist-refresh")
-    sched.start()
-    logger.info("Scheduler started interval_minutes=%s", settings.scheduler_interval_minutes)
-    return SchedulerState(scheduler=sched)
+        for symbol, run_id in run_ids.items():
+            repos.finish_run(run_id, "FAILED" if symbol in failed else "SUCCESS")
+
+
+def _refresh_filings(settings: Settings, items: list[dict], run_ids: dict[str, str]) -> set[str]:
+    """Filings stage per symbol; returns the symbols whose filings failed."""
+    from ims.pipelines.analyze import run_analyze
+
+    failed: set[str] = set()
+    with connect(settings.db_path, autocommit=True, timeout_s=settings.db_busy_timeout_s) as conn:
+        repos = Repos(conn)
+        for item in items:
+            symbol = item["symbol"]
+            try:
+                result = run_analyze(
+                    repos=repos,
+                    settings=settings,
+                    symbol=symbol,
+                    lookback_days=settings.price_default_lookback_days,
+                    run_id=run_ids[symbol],
+                    stages=("filings",),
+                )
+                if not result.ok:
+                    failed.add(symbol)
+            except Exception as e:  # noqa: BLE001
+                repos.add_run_log(run_ids[symbol], "ERROR", f"Watchdog analyze failed: {e}")
+                failed.add(symbol)
+    return failed
+
+
+def _refresh_news(settings: Settings, items: list[dict], run_ids: dict[str, str]) -> set[str]:
+    """Batched news stage for the whole watchlist; returns the symbols whose news failed."""
+    from ims.pipelines.news import ingest_news_batch
+    from ims.providers.http import get_http_client
+    from ims.providers.news import GoogleNewsRssProvider
+
+    with connect(settings.db_path, autocommit=True, timeout_s=settings.db_busy_timeout_s) as conn:
+        repos = Repos(conn)
+        try:
+            result = ingest_news_batch(
+                repos=repos,
+                settings=settings,
+                provider=GoogleNewsRssProvider(http=get_http_client(settings), settings=settings),
+                companies=items,
+                run_ids=run_ids,
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.exception("Watchlist news batch failed")
+            for run_id in run_ids.values():
+                repos.add_run_log(run_id, "ERROR", f"News stage failed: {e}")
+            return set(run_ids)
+
+        batch = (
+            f"News batch: queries={result.queries} items={result.items} "
+            f"unique_headlines={result.unique_headlines}"
+        )
+        for symbol, run_id in run_ids.items():
+            stats = result.stats.get(symbol)
+            if stats is not None:
+                repos.add_run_log(
+                    run_id,
+                    "INFO",
+                    f"News: fetched={stats.fetched} persisted={stats.persisted} "
+                    f"duplicates={stats.duplicates} dropped_irrelevant={stats.dropped_irrelevant} ({batch})",
+                )
+            else:
+                repos.add_run_log(run_id, "ERROR", f"News stage failed: {result.errors.get(symbol, 'unknown')}")
+        return set(result.errors)
+
+
+def _refresh_prices(settings: Settings, items: list[dict], run_ids: dict[str, str]) -> set[str]:
+    """Batched price stage for the whole watchlist; returns the symbols whose prices failed."""
+    from ims.pipelines.price import ingest_prices_batch
+    from ims.providers.price import YahooPriceProvider
+    from ims.storage.price_store import get_price_store
+
+    with connect(settings.db_path, autocommit=True, timeout_s=settings.db_busy_timeout_s) as conn:
+        repos = Repos(conn, price_store=get_price_store(settings))
+        try:
+            result = ingest_prices_batch(
+                repos=repos,
+                provider=YahooPriceProvider(),
+                symbols=[item["symbol"] for item in items],
+                lookback_days=settings.price_default_lookback_days,
+                chunk_size=settings.price_batch_size,
+                ticker_ttl_days=settings.price_ticker_ttl_days,
+                overlap_days=settings.price_overlap_days,
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.exception("Watchlist price batch failed")
+            for run_id in run_ids.values():
+                repos.add_run_log(run_id, "ERROR", f"Prices stage failed: {e}")
+            return set(run_ids)
 
+        batch = f"Price batch: requests={result.requests} fallbacks={result.fallbacks}"
+        for symbol, run_id in run_ids.items():
+            stats = result.stats.get(symbol)
+            if stats is not None:
+                repos.add_run_log(
+                    run_id,
+                    "INFO",
+                    f"Prices: bars={stats.bars} days={stats.period_days} "
+                    f"full_refresh={stats.full_refresh} ({batch})",
+                )
+            else:
+                repos.add_run_log(run_id, "ERROR", f"Prices stage failed: {result.errors.get(symbol, 'unknown')}")
+        return set(result.errors)
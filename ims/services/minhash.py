@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import struct
+
+# MinHash signatures for near-duplicate headline detection, banded for LSH lookups.
+#
+# Syndicated copies of a story differ in a word or two ("wins" / "bags", a publisher suffix),
+# which MinHash over word sets handles better than SimHash does on ~10-word titles.
+# With 16 bands of 4 rows, two titles with word-set Jaccard 0.8 share a band >99.9% of the
+# time, while titles at Jaccard 0.3 do ~12% of the time (and are then rejected by `similarity`).
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# Version of the tokenizer + hash family; stored band rows from another version never match.
+MINHASH_VERSION = 1
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(20240611)
+_PERMS = tuple((_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM))
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("a an and as at by for from in is of on the to with".split())
+_PACK = struct.Struct(f"<{NUM_PERM}Q")
+
+
+def headline_tokens(title: str) -> frozenset[str]:
+    """Content words of a headline, without the trailing ' - Publisher' Google News appends."""
+    head, sep, tail = (title or "").rpartition(" - ")
+    if sep and head and len(tail) <= 40:
+        title = head
+    return frozenset(t for t in _TOKEN_RE.findall(title.lower()) if t not in _STOPWORDS)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(tokens: frozenset[str]) -> tuple[int, ...]:
+    hashes = [_token_hash(t) for t in tokens]
+    if not hashes:
+        return (_MERSENNE,) * NUM_PERM
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMS)
+
+
+def lsh_bands(signature: tuple[int, ...]) -> list[int]:
+    """One signed 64-bit key per band (SQLite INTEGER range)."""
+    out = []
+    for i in range(BANDS):
+        band = struct.pack(f"<{ROWS}Q", *signature[i * ROWS : (i + 1) * ROWS])
+        digest = hashlib.blake2b(band, digest_size=8, person=f"band{i}v{MINHASH_VERSION}".encode()).digest()
+        out.append(int.from_bytes(digest, "little", signed=True))
+    return out
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the underlying word sets."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def pack(signature: tuple[int, ...]) -> bytes:
+    return _PACK.pack(*signature)
+
+
+def unpack(blob: bytes) -> tuple[int, ...]:
+    return _PACK.unpack(blob)
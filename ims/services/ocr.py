@@ -1,20 +1,71 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import pytesseract
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class OcrPage:
+    page: int
+    text: str
+    raster_ms: float
+    ocr_ms: float
+
+
 @dataclass(frozen=True)
 class OcrResult:
     text: str
     pages_ocr: int
     engine_version: str | None
+    pages: tuple[OcrPage, ...] = ()
+    # Pages in the document (OCRed or not).
+    total_pages: int = 0
+
+
+@lru_cache(maxsize=1)
+def tesseract_version() -> str | None:
+    try:
+        return pytesseract.get_tesseract_version().string  # type: ignore[attr-defined]
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _ocr_page(pdf_path: Path, page: int, *, lang: str, dpi: int) -> OcrPage:
+    # Rasterize exactly one page, OCR it and drop the image before the worker takes the
+    # next page, so at most `workers` page bitmaps are alive at any time.
+    t0 = time.perf_counter()
+    try:
+        images = convert_from_path(str(pdf_path), dpi=dpi, first_page=page, last_page=page, grayscale=True)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Rasterize failed page=%s err=%s", page, e)
+        return OcrPage(page=page, text="", raster_ms=(time.perf_counter() - t0) * 1000.0, ocr_ms=0.0)
+    t1 = time.perf_counter()
+    texts: list[str] = []
+    try:
+        for img in images:
+            texts.append(pytesseract.image_to_string(img, lang=lang))
+    except Exception as e:  # noqa: BLE001
+        logger.warning("OCR failed page=%s err=%s", page, e)
+    finally:
+        for img in images:
+            img.close()
+    t2 = time.perf_counter()
+    return OcrPage(
+        page=page,
+        text="\n".join(texts).strip(),
+        raster_ms=(t1 - t0) * 1000.0,
+        ocr_ms=(t2 - t1) * 1000.0,
+    )
 
 
 def ocr_pdf(
@@ -22,24 +73,38 @@ def ocr_pdf(
     *,
     lang: str,
     max_pages: int,
+    dpi: int = 200,
+    workers: int = 1,
+    pages: Sequence[int] | None = None,
 ) -> OcrResult:
+    """
+    OCR up to `max_pages` pages (the first ones, or the given 1-based `pages`), one page per
+    task across `workers` threads.
+
+    Rasterization (poppler) and recognition (tesseract) both run as subprocesses, so threads
+    parallelize them; peak memory is bounded by `workers` grayscale page images at `dpi`.
+    """
     try:
-        images = convert_from_path(str(pdf_path), first_page=1, last_page=max_pages)
+        total = int(pdfinfo_from_path(str(pdf_path)).get("Pages", 0))
     except Exception as e:  # noqa: BLE001
         raise RuntimeError(
             "pdf2image failed. On macOS install poppler: `brew install poppler`"
         ) from e
 
-    texts: list[str] = []
-    for idx, img in enumerate(images, start=1):
-        try:
-            texts.append(pytesseract.image_to_string(img, lang=lang))
-        except Exception as e:  # noqa: BLE001
-            logger.warning("OCR failed page=%s err=%s", idx, e)
-    version = None
-    try:
-        version = pytesseract.get_tesseract_version().string  # type: ignore[attr-defined]
-    except Exception:  # noqa: BLE001
-        version = None
-    return OcrResult(text="\n".join(texts).strip(), pages_ocr=len(images), engine_version=version)
+    if pages is None:
+        page_numbers = list(range(1, min(total, max_pages) + 1))
+    else:
+        page_numbers = sorted({n for n in pages if 1 <= n <= total})[:max_pages]
+    if workers <= 1 or len(page_numbers) <= 1:
+        results = [_ocr_page(pdf_path, n, lang=lang, dpi=dpi) for n in page_numbers]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr") as pool:
+            results = list(pool.map(lambda n: _ocr_page(pdf_path, n, lang=lang, dpi=dpi), page_numbers))
 
+    return OcrResult(
+        text="\n".join(p.text for p in results if p.text).strip(),
+        pages_ocr=len(results),
+        engine_version=tesseract_version(),
+        pages=tuple(results),
+        total_pages=total,
+    )
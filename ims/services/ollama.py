@@ -1,27 +1,119 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
 import httpx
 
+from ims.core.settings import Settings
 
-@dataclass(frozen=True)
+logger = logging.getLogger(__name__)
+
+# Bump whenever the prompt (or its post-processing) changes so cached summaries are not reused.
+PROMPT_VERSION = 1
+
+
+def _prompt(title: str, text: str) -> str:
+    return (
+        "Summarize the following corporate announcement in exactly ONE sentence.\n"
+        "Rules: factual only; include numbers/dates if present; no speculation.\n\n"
+        f"TITLE: {title}\n\nTEXT:\n{text[:8000]}\n"
+    )
+
+
+@dataclass
 class OllamaClient:
+    """
+    One-sentence summaries from a local Ollama model.
+
+    Reuses one `httpx.Client`, memoizes summaries in an LRU keyed by
+    (model, PROMPT_VERSION, prompt hash), and caps in-flight generations at `max_concurrency`
+    no matter how many threads call it, so a watchlist refresh cannot queue up dozens of
+    generations on the local model at once.
+    """
+
     base_url: str
     model: str
     timeout_s: float = 30.0
+    max_concurrency: int = 2
+    cache_size: int = 1024
+    transport: httpx.BaseTransport | None = None
 
-    def summarize_one_sentence(self, *, title: str, text: str) -> str:
-        prompt = (
-            "Summarize the following corporate announcement in exactly ONE sentence.\n"
-            "Rules: factual only; include numbers/dates if present; no speculation.\n\n"
-            f"TITLE: {title}\n\nTEXT:\n{text[:8000]}\n"
+    _client: httpx.Client | None = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _slots: threading.BoundedSemaphore = field(init=False, repr=False, compare=False)
+    _cache: OrderedDict[tuple[str, int, str], str] = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+    hits: int = field(default=0, init=False, compare=False)
+    misses: int = field(default=0, init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._slots = threading.BoundedSemaphore(max(1, self.max_concurrency))
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> OllamaClient:
+        return cls(
+            base_url=settings.ollama_base_url,
+            model=settings.ollama_model,
+            timeout_s=settings.ollama_timeout_s,
+            max_concurrency=settings.ollama_max_concurrency,
+            cache_size=settings.ollama_cache_size,
         )
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(timeout=self.timeout_s, transport=self.transport)
+        return self._client
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    def _key(self, prompt: str) -> tuple[str, int, str]:
+        return (self.model, PROMPT_VERSION, hashlib.sha256(prompt.encode("utf-8", errors="ignore")).hexdigest())
+
+    def _cached(self, key: tuple[str, int, str]) -> str | None:
+        with self._lock:
+            resp = self._cache.get(key)
+            if resp is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return resp
+
+    def _remember(self, key: tuple[str, int, str], resp: str) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = resp
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def summarize_one_sentence(self, *, title: str, text: str) -> str:
+        prompt = _prompt(title, text)
+        key = self._key(prompt)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
         payload = {"model": self.model, "prompt": prompt, "stream": False}
         url = self.base_url.rstrip("/") + "/api/generate"
-        with httpx.Client(timeout=self.timeout_s) as c:
-            r = c.post(url, json=payload)
+        with self._slots:
+            r = self.client.post(url, json=payload)
             r.raise_for_status()
             data = r.json()
         resp = (data.get("response") or "").strip()
@@ -31,5 +123,52 @@ class OllamaClient:
         resp = resp.replace("\n", " ").strip()
         if len(resp) > 280:
             resp = resp[:277].rstrip() + "..."
+        self._remember(key, resp)
         return resp
 
+    def summarize_many(self, items: Sequence[tuple[str, str]]) -> list[str | Exception]:
+        """
+        Summarize `(title, text)` pairs concurrently (at most `max_concurrency` at a time).
+
+        Results are in input order; a failed item yields its exception instead of a summary.
+        """
+
+        def one(item: tuple[str, str]) -> str | Exception:
+            try:
+                return self.summarize_one_sentence(title=item[0], text=item[1])
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Ollama summary failed title=%s err=%s", item[0], e)
+                return e
+
+        if len(items) <= 1:
+            return [one(item) for item in items]
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency), thread_name_prefix="ollama") as pool:
+            return list(pool.map(one, items))
+
+    async def asummarize_one_sentence(self, *, title: str, text: str) -> str:
+        return await asyncio.to_thread(self.summarize_one_sentence, title=title, text=text)
+
+    async def asummarize_many(self, items: Sequence[tuple[str, str]]) -> list[str | Exception]:
+        return await asyncio.to_thread(self.summarize_many, items)
+
+
+_shared: OllamaClient | None = None
+_shared_lock = threading.Lock()
+
+
+def get_ollama_client(settings: Settings) -> OllamaClient:
+    """Process-wide Ollama client, so the summary cache and concurrency cap are shared."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = OllamaClient.from_settings(settings)
+    return _shared
+
+
+def close_ollama_client() -> None:
+    global _shared
+    with _shared_lock:
+        client, _shared = _shared, None
+    if client is not None:
+        client.close()
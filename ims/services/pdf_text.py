@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import logging
+import shutil
+import subprocess
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Protocol
 
 from PyPDF2 import PdfReader
 
@@ -13,15 +17,171 @@ logger = logging.getLogger(__name__)
 class PdfTextResult:
     text: str
     pages: int
+    page_texts: tuple[str, ...] = ()
+    # False when extraction stopped at a page/character budget before the end of the document.
+    complete: bool = True
 
 
-def extract_pdf_text(pdf_path: Path) -> PdfTextResult:
-    reader = PdfReader(str(pdf_path))
-    chunks: list[str] = []
-    for p in reader.pages:
+class PdfTextBackend(Protocol):
+    """A text-layer extractor. `name` also identifies the backend in text-cache keys."""
+
+    name: str
+
+    def available(self) -> bool: ...
+
+    def iter_pages(self, pdf_path: Path, *, last_page: int | None = None) -> Iterator[str]: ...
+
+
+class PyPdf2Backend:
+    name = "pypdf2"
+
+    def available(self) -> bool:
+        return True
+
+    def iter_pages(self, pdf_path: Path, *, last_page: int | None = None) -> Iterator[str]:
+        reader = PdfReader(str(pdf_path))
+        for p in reader.pages[:last_page]:
+            try:
+                yield p.extract_text() or ""
+            except Exception as e:  # noqa: BLE001
+                logger.warning("PDF text extract failed page err=%s", e)
+                yield ""
+
+
+class PypdfBackend:
+    """PyPDF2's maintained successor; optional (`pip install pypdf`)."""
+
+    name = "pypdf"
+
+    def available(self) -> bool:
+        try:
+            import pypdf  # noqa: F401
+        except Exception:  # noqa: BLE001
+            return False
+        return True
+
+    def iter_pages(self, pdf_path: Path, *, last_page: int | None = None) -> Iterator[str]:
+        from pypdf import PdfReader as PypdfReader
+
+        reader = PypdfReader(str(pdf_path))
+        for p in reader.pages[:last_page]:
+            try:
+                yield p.extract_text() or ""
+            except Exception as e:  # noqa: BLE001
+                logger.warning("PDF text extract failed page err=%s", e)
+                yield ""
+
+
+class PyMuPdfBackend:
+    """MuPDF bindings; optional (`pip install pymupdf`)."""
+
+    name = "pymupdf"
+
+    def available(self) -> bool:
         try:
-            chunks.append(p.extract_text() or "")
-        except Exception as e:  # noqa: BLE001
-            logger.warning("PDF text extract failed page err=%s", e)
-    return PdfTextResult(text="\n".join(chunks).strip(), pages=len(reader.pages))
+            import pymupdf  # noqa: F401
+        except Exception:  # noqa: BLE001
+            return False
+        return True
+
+    def iter_pages(self, pdf_path: Path, *, last_page: int | None = None) -> Iterator[str]:
+        import pymupdf
+
+        with pymupdf.open(str(pdf_path)) as doc:
+            for page in doc.pages(0, last_page):
+                try:
+                    yield page.get_text() or ""
+                except Exception as e:  # noqa: BLE001
+                    logger.warning("PDF text extract failed page err=%s", e)
+                    yield ""
+
+
+class PdftotextBackend:
+    """Poppler's `pdftotext` CLI, installed alongside pdf2image's `pdftoppm`."""
+
+    name = "pdftotext"
+
+    def available(self) -> bool:
+        return shutil.which("pdftotext") is not None
+
+    def iter_pages(self, pdf_path: Path, *, last_page: int | None = None) -> Iterator[str]:
+        cmd = ["pdftotext", "-enc", "UTF-8", "-layout"]
+        if last_page is not None:
+            cmd += ["-l", str(last_page)]
+        proc = subprocess.run([*cmd, str(pdf_path), "-"], capture_output=True, check=True)
+        # pdftotext ends every page with a form feed.
+        pages = proc.stdout.decode("utf-8", errors="replace").split("\f")
+        if pages and not pages[-1].strip():
+            pages.pop()
+        yield from pages
+
+
+BACKENDS: dict[str, PdfTextBackend] = {
+    b.name: b for b in (PyPdf2Backend(), PypdfBackend(), PyMuPdfBackend(), PdftotextBackend())
+}
+
+# Preference order for the opt-in `auto`: fastest locally available first. The default stays on
+# pypdf2; the backend name is part of the text-cache key, so switching re-extracts cached PDFs.
+_AUTO_ORDER = ("pdftotext", "pymupdf", "pypdf", "pypdf2")
+
+
+def available_backends() -> list[str]:
+    return [name for name, b in BACKENDS.items() if b.available()]
+
+
+def resolve_backend(name: str) -> PdfTextBackend:
+    """Map a setting value (`auto` or a backend name) to an available backend."""
+    name = (name or "auto").lower()
+    if name == "auto":
+        return next(BACKENDS[n] for n in _AUTO_ORDER if BACKENDS[n].available())
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown PDF text backend: {name} (choose from auto, {', '.join(BACKENDS)})")
+    if not backend.available():
+        logger.warning("PDF text backend %s is not available; falling back to pypdf2", name)
+        return BACKENDS["pypdf2"]
+    return backend
+
+
+def iter_pdf_pages(pdf_path: Path, *, backend: str = "pypdf2", last_page: int | None = None) -> Iterator[str]:
+    """Lazily yield page texts; pages after the consumer stops are never extracted."""
+    return resolve_backend(backend).iter_pages(pdf_path, last_page=last_page)
+
+
+def extract_pdf_text(
+    pdf_path: Path,
+    *,
+    backend: str = "pypdf2",
+    max_pages: int | None = None,
+    max_chars: int | None = None,
+) -> PdfTextResult:
+    """
+    Extract page texts, stopping early once `max_pages` pages or `max_chars` characters are in.
+
+    With no budget the whole document is extracted. A budgeted result has `complete=False`
+    when it stopped early (or ended exactly at the page budget, where the total is unknown).
+    """
+    chunks: list[str] = []
+    total = 0
+    complete = True
+    for text in iter_pdf_pages(pdf_path, backend=backend, last_page=max_pages):
+        chunks.append(text)
+        total += len(text.strip())
+        if max_chars is not None and total >= max_chars:
+            complete = False
+            break
+    if max_pages is not None and len(chunks) >= max_pages:
+        complete = False
+    return PdfTextResult(
+        text="\n".join(chunks).strip(), pages=len(chunks), page_texts=tuple(chunks), complete=complete
+    )
+
 
+def page_needs_ocr(text: str, *, min_chars: int) -> bool:
+    """True when a page's text layer is missing, too short, or mostly non-text glyphs."""
+    stripped = text.strip()
+    if len(stripped) < min_chars:
+        return True
+    # Broken font encodings extract as runs of symbols / replacement characters.
+    readable = sum(1 for ch in stripped if ch.isalnum() or ch.isspace() or ch in ".,;:-()%/&'\"₹")
+    return readable / len(stripped) < 0.6
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ims.providers.news import NewsItem
+
+# Headline relevance: does a headline name the company at all?
+#
+# The news query ("BEL Bharat Electronics Ltd stock") also returns market wraps and stories about
+# other companies. Each company gets an alias index (symbol, name variants, ISIN, initials) that
+# is compiled once; headlines mentioning none of the aliases are dropped before scoring.
+
+# Tickers and initials this short ("BEL", "LT", "IOC", "RIL") are matched case-sensitively, so
+# ordinary words ("bel", "lt") do not count as mentions. Name-derived aliases ("Wipro", "Titan")
+# are always matched case-insensitively.
+SHORT_ALIAS_LEN = 5
+
+_CORPORATE_SUFFIXES = frozenset(
+    "ltd ltd. limited co co. company corp corp. corporation inc inc. plc pvt pvt. private".split()
+)
+_WORD_CHARS = "A-Za-z0-9"
+
+
+def _strip_publisher(title: str) -> str:
+    """Drop the trailing ' - Publisher' Google News appends (publishers are not mentions)."""
+    head, sep, tail = title.rpartition(" - ")
+    return head if sep and head and len(tail) <= 40 else title
+
+
+def _initials(words: list[str]) -> str:
+    return "".join("&" if w in ("&", "and") else w[0].upper() for w in words)
+
+
+def _aliases(symbol: str, name: str, isin: str | None) -> tuple[list[str], list[str]]:
+    """`(codes, names)`: the ticker, initials and ISIN, and the name variants."""
+    words = (name or "").split()
+    core = list(words)
+    while len(core) > 1 and core[-1].lower() in _CORPORATE_SUFFIXES:
+        core.pop()
+
+    codes = [symbol.upper()]
+    names: list[str] = []
+    for variant in (words, core):
+        if not variant:
+            continue
+        names.append(" ".join(variant))
+        if "&" in variant:
+            names.append(" ".join("and" if w == "&" else w for w in variant))
+        if len(variant) > 1:
+            # Initials shorter than three characters ("BE") are too ambiguous ("L&T" is fine).
+            initials = _initials(variant)
+            if len(initials) >= 3:
+                codes.append(initials)
+    if isin:
+        codes.append(isin.upper())
+    codes = list(dict.fromkeys(codes))
+    return codes, [n for n in dict.fromkeys(names) if n not in codes]
+
+
+def company_aliases(symbol: str, name: str, isin: str | None = None) -> list[str]:
+    """Ways a headline can refer to the company."""
+    codes, names = _aliases(symbol, name, isin)
+    return codes + names
+
+
+def _pattern(aliases: list[str], *, fold: bool) -> re.Pattern[str] | None:
+    if not aliases:
+        return None
+    chars = _WORD_CHARS.lower() if fold else _WORD_CHARS
+    alts = (r"\s+".join(re.escape(w) for w in a.split()) for a in sorted(aliases, key=len, reverse=True))
+    return re.compile(rf"(?<![{chars}])(?:{'|'.join(alts)})(?![{chars}])")
+
+
+@dataclass(frozen=True)
+class AliasIndex:
+    symbol: str
+    aliases: tuple[str, ...]
+    exact: re.Pattern[str] | None
+    folded: re.Pattern[str] | None
+
+    @classmethod
+    def build(cls, symbol: str, name: str, isin: str | None = None) -> AliasIndex:
+        codes, names = _aliases(symbol, name, isin)
+        short = [a for a in codes if len(a) <= SHORT_ALIAS_LEN]
+        folded = [a.lower() for a in codes if a not in short] + [n.lower() for n in names]
+        return cls(
+            symbol=symbol.upper(),
+            aliases=tuple(codes + names),
+            exact=_pattern(short, fold=False),
+            folded=_pattern(folded, fold=True),
+        )
+
+    def matches(self, title: str) -> bool:
+        text = _strip_publisher(title or "")
+        if self.exact is not None and self.exact.search(text):
+            return True
+        return self.folded is not None and self.folded.search(text.lower()) is not None
+
+
+@lru_cache(maxsize=1024)
+def alias_index(symbol: str, name: str, isin: str | None = None) -> AliasIndex:
+    """Compiled alias index for a company (cached; rebuilt when the name or ISIN changes)."""
+    return AliasIndex.build(symbol, name, isin)
+
+
+def company_index(company: Mapping[str, Any]) -> AliasIndex:
+    """Alias index for a `companies` row (needs `symbol` and `name`; `isin` is optional)."""
+    return alias_index(company["symbol"], company["name"], company.get("isin") or None)
+
+
+def filter_relevant(index: AliasIndex, items: list[NewsItem]) -> tuple[list[NewsItem], int]:
+    """Items whose title mentions the company, and how many were dropped."""
+    kept = [it for it in items if index.matches(it.title)]
+    return kept, len(items) - len(kept)
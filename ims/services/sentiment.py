@@ -2,15 +2,34 @@ from __future__ import annotations
 
 import math
 import re
+import unicodedata
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 
 try:
-    from textblob import TextBlob
+    from textblob.en import sentiment as _pattern_sentiment
 except Exception:  # noqa: BLE001
-    TextBlob = None  # type: ignore[assignment]
+    _pattern_sentiment = None
 
 
-_POS_WORDS = {
+def _scorer_version() -> str:
+    if _pattern_sentiment is None:
+        return "lexicon-1"
+    try:
+        from importlib.metadata import version
+
+        return f"textblob-{version('textblob')}"
+    except Exception:  # noqa: BLE001
+        return "textblob"
+
+
+# Part of every memo key: a different scorer must never reuse another one's scores.
+SCORER_VERSION = _scorer_version()
+
+_MEMO_SIZE = 50_000
+
+_POS_WORDS = frozenset({
     "surge",
     "rally",
     "beats",
@@ -25,8 +44,8 @@ _POS_WORDS = {
     "strong",
     "growth",
     "profit",
-}
-_NEG_WORDS = {
+})
+_NEG_WORDS = frozenset({
     "fall",
     "drops",
     "drop",
@@ -41,7 +60,9 @@ _NEG_WORDS = {
     "shutdown",
     "miss",
     "misses",
-}
+})
+_WORD_RE = re.compile(r"[A-Za-z]+")
+_SPACE_RE = re.compile(r"\s+")
 
 
 @dataclass(frozen=True)
@@ -50,23 +71,48 @@ class SentimentScore:
     confidence: float
 
 
+def normalize_title(title: str) -> str:
+    """Memo key for a headline: NFKC-normalized with whitespace collapsed."""
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFKC", title or "")).strip()
+
+
 def score_headline(title: str) -> SentimentScore:
-    title = (title or "").strip()
+    return _score(SCORER_VERSION, normalize_title(title))
+
+
+def score_headlines(titles: Iterable[str]) -> list[SentimentScore]:
+    """
+    Score many headlines; results are in input order.
+
+    Syndicated headlines repeat within a refresh and across hourly refreshes, so each
+    distinct normalized title is scored once per process (LRU memo).
+    """
+    return [_score(SCORER_VERSION, normalize_title(t)) for t in titles]
+
+
+def clear_sentiment_memo() -> None:
+    _score.cache_clear()
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _score(version: str, title: str) -> SentimentScore:
     if not title:
         return SentimentScore(score=0.0, confidence=0.0)
 
-    if TextBlob is not None:
+    if _pattern_sentiment is not None:
         try:
-            blob = TextBlob(title)
-            polarity = float(blob.sentiment.polarity)
-            subjectivity = float(getattr(blob.sentiment, "subjectivity", 0.5))
-            confidence = max(0.2, min(1.0, (1.0 - subjectivity) * 0.9 + 0.1))
-            return SentimentScore(score=_clip(polarity), confidence=confidence)
+            # What `TextBlob(title).sentiment` computes, without building a TextBlob per call.
+            polarity, subjectivity = _pattern_sentiment(title)
+            confidence = max(0.2, min(1.0, (1.0 - float(subjectivity)) * 0.9 + 0.1))
+            return SentimentScore(score=_clip(float(polarity)), confidence=confidence)
         except Exception:  # noqa: BLE001
             pass
+    return _lexicon_score(title)
+
 
+def _lexicon_score(title: str) -> SentimentScore:
     # Fallback: tiny lexicon-based scoring.
-    words = {w.lower() for w in re.findall(r"[A-Za-z]+", title)}
+    words = set(_WORD_RE.findall(title.lower()))
     pos = len(words & _POS_WORDS)
     neg = len(words & _NEG_WORDS)
     raw = pos - neg
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 
@@ -11,50 +12,99 @@ class SummaryResult:
     confidence: float
 
 
-_INR_RE = re.compile(r"(?:₹|INR)\s*([0-9][0-9,]*(?:\.[0-9]+)?)", re.IGNORECASE)
-_DIV_RE = re.compile(r"\bdividend\b", re.IGNORECASE)
-_BOARD_RE = re.compile(r"\bboard meeting\b|\bmeeting of the board\b", re.IGNORECASE)
-_RESULTS_RE = re.compile(r"\b(results?|financial results?)\b", re.IGNORECASE)
-_ORDER_RE = re.compile(r"\border\b|\bcontract\b|\bwork order\b|\baward(ed)?\b", re.IGNORECASE)
-_RATING_RE = re.compile(r"\bcredit rating\b|\brating\b|\bcrisil\b|\bcare\b|\bicra\b", re.IGNORECASE)
-_REG_RE = re.compile(r"\bsebi\b|\bregulat(ory|ion)\b|\bcompliance\b", re.IGNORECASE)
-
-
-def summarize_filing(title: str, text: str) -> SummaryResult:
+# Only the title and the first `scan_chars` characters of the body are classified; filing
+# keywords and amounts sit on the cover page, while OCR text of a long document can run to MBs.
+DEFAULT_SCAN_CHARS = 20_000
+
+# Categories in priority order: the first one present anywhere in the window wins.
+_CATEGORIES = ("DIVIDEND", "BOARD_MEETING", "RESULTS", "ORDER_WIN", "CREDIT_RATING", "REGULATORY")
+_KEYWORDS: dict[str, str] = {
+    "dividend": "DIVIDEND",
+    "board meeting": "BOARD_MEETING",
+    "meeting of the board": "BOARD_MEETING",
+    "result": "RESULTS",
+    "results": "RESULTS",
+    "financial result": "RESULTS",
+    "financial results": "RESULTS",
+    "order": "ORDER_WIN",
+    "work order": "ORDER_WIN",
+    "contract": "ORDER_WIN",
+    "award": "ORDER_WIN",
+    "awarded": "ORDER_WIN",
+    "credit rating": "CREDIT_RATING",
+    "rating": "CREDIT_RATING",
+    "crisil": "CREDIT_RATING",
+    "care": "CREDIT_RATING",
+    "icra": "CREDIT_RATING",
+    "sebi": "REGULATORY",
+    "regulatory": "REGULATORY",
+    "regulation": "REGULATORY",
+    "compliance": "REGULATORY",
+}
+_PRIORITY = {name: i for i, name in enumerate(_CATEGORIES)}
+
+# All keywords and the INR amount in one alternation over lowercased text, so a single
+# left-to-right pass finds every category and the first amount. (Plain alternatives without
+# per-category groups or IGNORECASE keep `re` on its fast path.)
+_SCAN_RE = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in sorted(_KEYWORDS, key=len, reverse=True)) + r")\b"
+    r"|(?:₹|inr)\s*([0-9][0-9,]*(?:\.[0-9]+)?)"
+)
+
+
+def summarize_filing(title: str, text: str, *, scan_chars: int | None = DEFAULT_SCAN_CHARS) -> SummaryResult:
     title = (title or "").strip()
     text = (text or "").strip()
-    blob = f"{title}\n{text}"
+    if scan_chars is not None and scan_chars > 0:
+        text = text[:scan_chars]
+    category, amt = _scan(f"{title}\n{text}")
 
-    if _DIV_RE.search(blob):
-        amt = _first_inr(blob)
+    if category == "DIVIDEND":
         if amt:
             return SummaryResult("DIVIDEND", f"Company declared a dividend of ₹{amt} per share.", 0.86)
         return SummaryResult("DIVIDEND", "Company announced a dividend.", 0.62)
 
-    if _BOARD_RE.search(blob):
+    if category == "BOARD_MEETING":
         return SummaryResult("BOARD_MEETING", "Company scheduled a board meeting to consider key corporate matters.", 0.60)
 
-    if _RESULTS_RE.search(blob):
+    if category == "RESULTS":
         return SummaryResult("RESULTS", "Company announced an update related to its financial results.", 0.58)
 
-    if _ORDER_RE.search(blob):
-        amt = _first_inr(blob)
+    if category == "ORDER_WIN":
         if amt:
             return SummaryResult("ORDER_WIN", f"Company received an order worth ₹{amt}.", 0.70)
         return SummaryResult("ORDER_WIN", "Company announced an order win / contract update.", 0.55)
 
-    if _RATING_RE.search(blob):
+    if category == "CREDIT_RATING":
         return SummaryResult("CREDIT_RATING", "Company shared an update related to its credit rating.", 0.55)
 
-    if _REG_RE.search(blob):
+    if category == "REGULATORY":
         return SummaryResult("REGULATORY", "Company shared a regulatory / compliance update.", 0.52)
 
     return SummaryResult("OTHER", "Company made a corporate announcement.", 0.40)
 
 
-def _first_inr(text: str) -> str | None:
-    m = _INR_RE.search(text)
-    if not m:
-        return None
-    return m.group(1).replace(",", "")
-
+def summarize_many(
+    items: Iterable[tuple[str, str]], *, scan_chars: int | None = DEFAULT_SCAN_CHARS
+) -> list[SummaryResult]:
+    """Summarize `(title, text)` pairs."""
+    return [summarize_filing(title, text, scan_chars=scan_chars) for title, text in items]
+
+
+def _scan(blob: str) -> tuple[str | None, str | None]:
+    """Highest-priority category in `blob` and the first INR amount, in one pass."""
+    best: int | None = None
+    amt: str | None = None
+    for m in _SCAN_RE.finditer(blob.lower()):
+        keyword, amount = m.groups()
+        if keyword is None:
+            if amt is None:
+                amt = amount.replace(",", "")
+        else:
+            rank = _PRIORITY[_KEYWORDS[keyword]]
+            if best is None or rank < best:
+                best = rank
+        # Nothing later in the text can change a dividend with an amount.
+        if best == 0 and amt is not None:
+            break
+    return (_CATEGORIES[best] if best is not None else None), amt
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from ims.core.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CpuPool:
+    """
+    Execution backend for CPU-bound PDF work (`extract_pdf_text`, `ocr_pdf`).
+
+    With `workers > 0` tasks run in spawn-based worker processes, so PyPDF2/pdf2image never hold
+    the API's or the scheduler's GIL. Each worker is its own single-process executor (a slot): a
+    caller first waits for an idle slot, so `task_timeout_s` only counts the time the task
+    actually runs. A task exceeding it gets its slot's process killed (a running worker cannot
+    be cancelled otherwise) and the slot restarts on its next task; the other slots keep
+    running. Workers are also recycled every `max_tasks_per_child` tasks.
+    With `workers == 0` tasks run inline in the calling thread.
+    """
+
+    def __init__(self, workers: int, *, task_timeout_s: float, max_tasks_per_child: int | None = None):
+        self.workers = workers
+        self.task_timeout_s = task_timeout_s
+        self.max_tasks_per_child = max_tasks_per_child
+        self._slots: list[ProcessPoolExecutor | None] = [None] * max(0, workers)
+        self._idle: queue.SimpleQueue[int] = queue.SimpleQueue()
+        for slot in range(len(self._slots)):
+            self._idle.put(slot)
+        self._lock = threading.Lock()
+
+    def _ensure(self, slot: int) -> ProcessPoolExecutor:
+        with self._lock:
+            pool = self._slots[slot]
+            if pool is None:
+                pool = self._slots[slot] = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child or None,
+                )
+            return pool
+
+    def _recycle(self, slot: int, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._slots[slot] is pool:
+                self._slots[slot] = None
+        # ProcessPoolExecutor has no public way to kill a running worker before 3.14.
+        for proc in list(getattr(pool, "_processes", {}).values()):
+            proc.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        if self.workers <= 0:
+            return fn(*args, **kwargs)
+
+        slot = self._idle.get()
+        try:
+            for attempt in (1, 2):
+                pool = self._ensure(slot)
+                try:
+                    fut = pool.submit(fn, *args, **kwargs)
+                    return fut.result(timeout=self.task_timeout_s)
+                except FutureTimeoutError as e:
+                    logger.warning(
+                        "CPU task timed out fn=%s timeout_s=%s; restarting its worker", fn.__name__, self.task_timeout_s
+                    )
+                    self._recycle(slot, pool)
+                    raise TimeoutError(f"{fn.__name__} timed out after {self.task_timeout_s}s") from e
+                except BrokenProcessPool:
+                    # The worker crashed (e.g. killed for memory); retry once on a fresh one.
+                    self._recycle(slot, pool)
+                    if attempt == 2:
+                        raise
+            raise AssertionError("unreachable")
+        finally:
+            self._idle.put(slot)
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._slots = self._slots, [None] * len(self._slots)
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+
+_shared: CpuPool | None = None
+_shared_lock = threading.Lock()
+
+
+def get_cpu_pool(settings: Settings) -> CpuPool:
+    """Process-wide CPU pool configured from settings (`IMS_PDF_WORKER_BACKEND`, ...)."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                workers = settings.pdf_workers if settings.pdf_worker_backend == "process" else 0
+                _shared = CpuPool(
+                    workers,
+                    task_timeout_s=settings.pdf_task_timeout_s,
+                    max_tasks_per_child=settings.pdf_worker_max_tasks,
+                )
+    return _shared
+
+
+def close_cpu_pool() -> None:
+    global _shared
+    with _shared_lock:
+        pool, _shared = _shared, None
+    if pool is not None:
+        pool.close()
@@ -68,10 +68,56 @@ CREATE TABLE IF NOT EXISTS filing_artifacts (
   ocr_used INTEGER NOT NULL,
   ocr_pages INTEGER NOT NULL,
   ocr_engine_version TEXT,
+  ocr_page_list TEXT,
+  text_complete INTEGER NOT NULL DEFAULT 1,
+  ocr_truncated INTEGER NOT NULL DEFAULT 0,
   created_at TEXT NOT NULL DEFAULT (datetime('now')),
   FOREIGN KEY(filing_id) REFERENCES filings(id) ON DELETE CASCADE
 );
 
+-- Low-confidence filings waiting for an LLM summary (see ims.pipelines.summaries).
+CREATE TABLE IF NOT EXISTS summary_jobs (
+  filing_id TEXT PRIMARY KEY,
+  status TEXT NOT NULL DEFAULT 'PENDING',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  last_error TEXT,
+  enqueued_at TEXT NOT NULL DEFAULT (datetime('now')),
+  next_attempt_at TEXT,
+  started_at TEXT,
+  finished_at TEXT,
+  FOREIGN KEY(filing_id) REFERENCES filings(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_jobs_status ON summary_jobs(status, enqueued_at);
+
+CREATE TABLE IF NOT EXISTS pdf_url_index (
+  pdf_url TEXT PRIMARY KEY,
+  pdf_sha256 TEXT NOT NULL,
+  content_length INTEGER,
+  etag TEXT,
+  checked_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS text_cache (
+  cache_key TEXT PRIMARY KEY,
+  pdf_sha256 TEXT NOT NULL,
+  extractor TEXT NOT NULL,
+  ocr_lang TEXT NOT NULL,
+  dpi INTEGER NOT NULL,
+  engine_version TEXT,
+  text TEXT NOT NULL,
+  text_source TEXT NOT NULL,
+  ocr_page_list TEXT,
+  complete INTEGER NOT NULL DEFAULT 1,
+  ocr_truncated INTEGER NOT NULL DEFAULT 0,
+  size_bytes INTEGER NOT NULL,
+  hits INTEGER NOT NULL DEFAULT 0,
+  created_at TEXT NOT NULL DEFAULT (datetime('now')),
+  last_used_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_text_cache_lru ON text_cache(last_used_at);
+
 CREATE TABLE IF NOT EXISTS news_headlines (
   id TEXT PRIMARY KEY,
   symbol TEXT NOT NULL,
@@ -81,6 +127,8 @@ CREATE TABLE IF NOT EXISTS news_headlines (
   url TEXT NOT NULL,
   mood_score REAL NOT NULL,
   confidence REAL NOT NULL,
+  minhash BLOB,
+  cluster_size INTEGER NOT NULL DEFAULT 1,
   created_at TEXT NOT NULL DEFAULT (datetime('now')),
   FOREIGN KEY(symbol) REFERENCES companies(symbol) ON DELETE CASCADE
 );
@@ -88,6 +136,34 @@ CREATE TABLE IF NOT EXISTS news_headlines (
 CREATE UNIQUE INDEX IF NOT EXISTS idx_news_symbol_url ON news_headlines(symbol, url);
 CREATE INDEX IF NOT EXISTS idx_news_symbol_time ON news_headlines(symbol, published_at);
 
+-- LSH index over headline MinHash signatures (ims.services.minhash): one row per band.
+CREATE TABLE IF NOT EXISTS headline_lsh_bands (
+  symbol TEXT NOT NULL,
+  band INTEGER NOT NULL,
+  value INTEGER NOT NULL,
+  headline_id TEXT NOT NULL,
+  PRIMARY KEY(symbol, band, value, headline_id),
+  FOREIGN KEY(headline_id) REFERENCES news_headlines(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Near-duplicate copies of a stored (canonical) headline; they do not count toward mood.
+CREATE TABLE IF NOT EXISTS news_duplicates (
+  id TEXT PRIMARY KEY,
+  canonical_id TEXT NOT NULL,
+  symbol TEXT NOT NULL,
+  published_at TEXT,
+  source TEXT NOT NULL,
+  title TEXT NOT NULL,
+  url TEXT NOT NULL,
+  similarity REAL NOT NULL,
+  created_at TEXT NOT NULL DEFAULT (datetime('now')),
+  FOREIGN KEY(canonical_id) REFERENCES news_headlines(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_duplicates_canonical ON news_duplicates(canonical_id);
+
+-- Mood rollups per symbol and time bucket, maintained incrementally by Repos.upsert_headline.
+-- mood_avg = mood_sum / mood_count; confidence-weighted average = weighted_sum / weight_sum.
 CREATE TABLE IF NOT EXISTS mood_daily (
   symbol TEXT NOT NULL,
   date TEXT NOT NULL,
@@ -95,10 +171,42 @@ CREATE TABLE IF NOT EXISTS mood_daily (
   mood_count INTEGER NOT NULL,
   mood_pos INTEGER NOT NULL,
   mood_neg INTEGER NOT NULL,
+  mood_sum REAL NOT NULL DEFAULT 0,
+  weighted_sum REAL NOT NULL DEFAULT 0,
+  weight_sum REAL NOT NULL DEFAULT 0,
   PRIMARY KEY(symbol, date),
   FOREIGN KEY(symbol) REFERENCES companies(symbol) ON DELETE CASCADE
 );
 
+CREATE TABLE IF NOT EXISTS mood_hourly (
+  symbol TEXT NOT NULL,
+  hour TEXT NOT NULL,
+  mood_avg REAL NOT NULL,
+  mood_count INTEGER NOT NULL,
+  mood_pos INTEGER NOT NULL,
+  mood_neg INTEGER NOT NULL,
+  mood_sum REAL NOT NULL DEFAULT 0,
+  weighted_sum REAL NOT NULL DEFAULT 0,
+  weight_sum REAL NOT NULL DEFAULT 0,
+  PRIMARY KEY(symbol, hour),
+  FOREIGN KEY(symbol) REFERENCES companies(symbol) ON DELETE CASCADE
+);
+
+-- `week` is the Monday (UTC) starting the ISO week.
+CREATE TABLE IF NOT EXISTS mood_weekly (
+  symbol TEXT NOT NULL,
+  week TEXT NOT NULL,
+  mood_avg REAL NOT NULL,
+  mood_count INTEGER NOT NULL,
+  mood_pos INTEGER NOT NULL,
+  mood_neg INTEGER NOT NULL,
+  mood_sum REAL NOT NULL DEFAULT 0,
+  weighted_sum REAL NOT NULL DEFAULT 0,
+  weight_sum REAL NOT NULL DEFAULT 0,
+  PRIMARY KEY(symbol, week),
+  FOREIGN KEY(symbol) REFERENCES companies(symbol) ON DELETE CASCADE
+);
+
 CREATE TABLE IF NOT EXISTS prices (
   symbol TEXT NOT NULL,
   ts TEXT NOT NULL,
@@ -110,22 +218,82 @@ CREATE TABLE IF NOT EXISTS prices (
   PRIMARY KEY(symbol, ts),
   FOREIGN KEY(symbol) REFERENCES companies(symbol) ON DELETE CASCADE
 );
+
+-- Symbols whose whole price history is mirrored in the columnar price store (see Repos).
+CREATE TABLE IF NOT EXISTS price_store_symbols (
+  symbol TEXT PRIMARY KEY,
+  synced_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+-- Yahoo ticker that last returned data for a symbol (e.g. KEI.BO), so fetches skip dead candidates.
+CREATE TABLE IF NOT EXISTS yahoo_tickers (
+  symbol TEXT PRIMARY KEY,
+  ticker TEXT NOT NULL,
+  resolved_at TEXT NOT NULL DEFAULT (datetime('now')),
+  FOREIGN KEY(symbol) REFERENCES companies(symbol) ON DELETE CASCADE
+);
 """
 
 
+# Columns added to tables after they first shipped: (table, column, declaration).
+# CREATE TABLE above already has them; this brings older databases up to date.
+ADDED_COLUMNS: list[tuple[str, str, str]] = [
+    ("filing_artifacts", "ocr_page_list", "TEXT"),
+    ("filing_artifacts", "text_complete", "INTEGER NOT NULL DEFAULT 1"),
+    ("text_cache", "complete", "INTEGER NOT NULL DEFAULT 1"),
+    ("filing_artifacts", "ocr_truncated", "INTEGER NOT NULL DEFAULT 0"),
+    ("text_cache", "ocr_truncated", "INTEGER NOT NULL DEFAULT 0"),
+    ("summary_jobs", "next_attempt_at", "TEXT"),
+    ("mood_daily", "mood_sum", "REAL NOT NULL DEFAULT 0"),
+    ("mood_daily", "weighted_sum", "REAL NOT NULL DEFAULT 0"),
+    ("mood_daily", "weight_sum", "REAL NOT NULL DEFAULT 0"),
+    ("news_headlines", "minhash", "BLOB"),
+    ("news_headlines", "cluster_size", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+
+def _add_missing_columns(conn: sqlite3.Connection) -> set[tuple[str, str]]:
+    added: set[tuple[str, str]] = set()
+    for table, column, decl in ADDED_COLUMNS:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+            added.add((table, column))
+    return added
+
+
 def init_db(db_path: Path) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(db_path)
     try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
         conn.executescript(SCHEMA_SQL)
+        added = _add_missing_columns(conn)
+        if ("mood_daily", "mood_sum") in added or ("mood_daily", "weighted_sum") in added or (
+            "news_headlines" in tables and not {"mood_hourly", "mood_weekly"} <= tables
+        ):
+            # Rollups that are new (or were computed the old way) are rebuilt from the headlines.
+            from ims.storage.repos import Repos
+
+            Repos(conn).rebuild_mood_rollups()
         conn.commit()
     finally:
         conn.close()
 
 
 @contextmanager
-def connect(db_path: Path):
-    conn = sqlite3.connect(db_path)
+def connect(db_path: Path, *, autocommit: bool = False, timeout_s: float = 5.0):
+    """
+    Open a connection for the duration of a `with` block (committed on exit).
+
+    `autocommit=True` commits every statement immediately, so long-running writers (e.g.
+    concurrent analyze stages) never hold the SQLite write lock between statements.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        timeout=timeout_s,
+        isolation_level=None if autocommit else "DEFERRED",
+    )
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -133,3 +301,30 @@ def connect(db_path: Path):
     finally:
         conn.close()
 
+
+@contextmanager
+def write_transaction(conn: sqlite3.Connection, name: str = "ims_write"):
+    """
+    Hold the SQLite write lock for the duration of a `with` block, so a read-modify-write is
+    not interleaved with another connection's.
+
+    Opens `BEGIN IMMEDIATE` … `COMMIT` when no transaction is open (e.g. on autocommit
+    connections); inside a caller's transaction it uses a savepoint instead. Rolled back on error.
+    """
+    if conn.in_transaction:
+        conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {name}")
+            conn.execute(f"RELEASE {name}")
+            raise
+        conn.execute(f"RELEASE {name}")
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ims.core.settings import Settings
+from ims.providers.price import OHLCV, PriceColumns
+
+# One structured array per symbol and UTC month, sorted by epoch seconds:
+#   <root>/<SYMBOL>/<YYYY-MM>.npy
+# Files are memory-mapped on read, and a range read is two binary searches per month plus
+# zero-copy slices. `ts` keeps the exact string stored in SQLite (with its exchange offset).
+BAR_DTYPE = np.dtype([("epoch", "<i8"), ("ts", "S32")] + [(name, "<f8") for name in OHLCV])
+
+
+def _epochs(ts: np.ndarray) -> np.ndarray:
+    idx = pd.to_datetime(pd.Index(ts, dtype=object), utc=True, format="ISO8601")
+    return idx.tz_convert(None).values.astype("datetime64[s]").astype("int64")
+
+
+def _day_epoch(day: str) -> int:
+    return int(np.datetime64(day[:10], "D").astype("datetime64[s]").astype("int64"))
+
+
+class PriceStore:
+    """
+    Columnar, month-partitioned copy of `prices` for fast range reads of long histories.
+
+    Every file is written to a temp file and renamed into place, so readers see a month either
+    before or after a write. Writers are serialized by a lock within one process only: a
+    database's price store is written by a single process (the API, with its scheduler, or
+    one script run at a time).
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _dir(self, symbol: str) -> Path:
+        return self.root / symbol.upper()
+
+    def has(self, symbol: str) -> bool:
+        d = self._dir(symbol)
+        return d.is_dir() and any(d.glob("*.npy"))
+
+    def _months(self, symbol: str) -> list[Path]:
+        d = self._dir(symbol)
+        return sorted(d.glob("*.npy")) if d.is_dir() else []
+
+    def _write(self, path: Path, bars: np.ndarray) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, bars)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _bars(cols: PriceColumns) -> tuple[np.ndarray, np.ndarray]:
+        """Bars and their UTC month labels."""
+        bars = np.empty(len(cols), dtype=BAR_DTYPE)
+        bars["epoch"] = _epochs(cols.ts)
+        bars["ts"] = np.asarray(cols.ts, dtype="S32")
+        for name in OHLCV:
+            bars[name] = getattr(cols, name)
+        return bars, bars["epoch"].astype("datetime64[s]").astype("datetime64[M]").astype(str)
+
+    @staticmethod
+    def _sorted(bars: np.ndarray) -> np.ndarray:
+        order = np.argsort(bars["epoch"], kind="stable")
+        # Keep the last occurrence of a timestamp within one batch, too.
+        merged = bars[order]
+        keep = np.append(merged["epoch"][1:] != merged["epoch"][:-1], True)
+        return merged[keep]
+
+    def upsert(self, symbol: str, cols: PriceColumns) -> int:
+        """Merge bars into their month files (new values win on equal timestamps)."""
+        if not len(cols):
+            return 0
+        bars, months = self._bars(cols)
+        with self._lock:
+            for month in np.unique(months):
+                path = self._dir(symbol) / f"{month}.npy"
+                new = bars[months == month]
+                if path.exists():
+                    old = np.load(path)
+                    new = np.concatenate([old[~np.isin(old["epoch"], new["epoch"])], new])
+                self._write(path, self._sorted(new))
+        return len(cols)
+
+    def replace(self, symbol: str, cols: PriceColumns) -> int:
+        """Swap in a whole history: the new month files are written before stale ones are removed."""
+        bars, months = self._bars(cols)
+        with self._lock:
+            written = set()
+            for month in np.unique(months):
+                path = self._dir(symbol) / f"{month}.npy"
+                self._write(path, self._sorted(bars[months == month]))
+                written.add(path)
+            for path in self._months(symbol):
+                if path not in written:
+                    path.unlink()
+        return len(cols)
+
+    def read(self, symbol: str, start_epoch: int, end_epoch: int) -> np.ndarray:
+        """Bars with `start_epoch <= epoch < end_epoch`; a view into the file for a single month."""
+        first = str(np.datetime64(start_epoch, "s").astype("datetime64[M]"))
+        last = str(np.datetime64(max(start_epoch, end_epoch - 1), "s").astype("datetime64[M]"))
+        parts = []
+        for path in self._months(symbol):
+            if not first <= path.stem <= last:
+                continue
+            bars = np.load(path, mmap_mode="r")
+            epochs = bars["epoch"]
+            lo = np.searchsorted(epochs, start_epoch, side="left")
+            hi = np.searchsorted(epochs, end_epoch, side="left")
+            if hi > lo:
+                parts.append(bars[lo:hi])
+        if not parts:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def list_prices(self, symbol: str, from_date: str, to_date: str) -> list[dict[str, Any]]:
+        """Same rows as `Repos.list_prices`: bars whose UTC date is within [from_date, to_date]."""
+        bars = self.read(symbol, _day_epoch(from_date), _day_epoch(to_date) + 86400)
+        cols: dict[str, list[Any]] = {"ts": [t.decode("ascii") for t in bars["ts"].tolist()]}
+        for name in OHLCV:
+            arr = np.asarray(bars[name])
+            obj = arr.astype(object)
+            obj[np.isnan(arr)] = None
+            cols[name] = obj.tolist()
+        sym = symbol.upper()
+        return [
+            {"symbol": sym, "ts": ts, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for ts, o, h, lo, c, v in zip(cols["ts"], *(cols[name] for name in OHLCV))
+        ]
+
+
+_stores: dict[Path, PriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_store(settings: Settings) -> PriceStore | None:
+    """The process-wide store under `data_dir/prices` when `IMS_PRICE_STORE` is on, else None."""
+    if not settings.price_store_enabled:
+        return None
+    root = settings.data_dir / "prices"
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = PriceStore(root)
+    return store
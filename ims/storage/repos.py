@@ -6,7 +6,13 @@ import sqlite3
 import uuid
 from dataclasses import dataclass
 from datetime import date
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Iterable
+
+from ims.storage.db import write_transaction
+
+if TYPE_CHECKING:
+    from ims.providers.price import PriceColumns
+    from ims.storage.price_store import PriceStore
 
 
 def new_id() -> str:
@@ -21,6 +27,15 @@ def stable_id(*parts: str) -> str:
     return h.hexdigest()[:32]
 
 
+# Mood rollups: resolution -> (table, bucket column, SQL bucket expression over a timestamp).
+# Buckets are UTC, like the `date(published_at)` days mood_daily always used.
+MOOD_ROLLUPS: dict[str, tuple[str, str, str]] = {
+    "hour": ("mood_hourly", "hour", "strftime('%Y-%m-%dT%H:00:00', {ts})"),
+    "day": ("mood_daily", "date", "date({ts})"),
+    "week": ("mood_weekly", "week", "date({ts}, 'weekday 0', '-6 days')"),
+}
+
+
 @dataclass(frozen=True)
 class RunRecord:
     id: str
@@ -29,8 +44,10 @@ class RunRecord:
 
 
 class Repos:
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, price_store: PriceStore | None = None):
         self.conn = conn
+        # Optional columnar copy of `prices`: written alongside the table, read by list_prices.
+        self.price_store = price_store
 
     # Companies / watchlist
     def upsert_company(
@@ -64,7 +81,7 @@ class Repos:
     def list_watchlist(self) -> list[dict[str, Any]]:
         rows = self.conn.execute(
             """
-            SELECT w.symbol, c.name, c.exchange, c.bse_scrip_code, w.added_at
+            SELECT w.symbol, c.name, c.exchange, c.bse_scrip_code, c.isin, w.added_at
             FROM watchlist w JOIN companies c ON c.symbol=w.symbol
             ORDER BY w.added_at DESC
             """
@@ -169,12 +186,16 @@ class Repos:
         ocr_used: bool,
         ocr_pages: int,
         ocr_engine_version: str | None,
+        ocr_page_list: list[int] | None = None,
+        text_complete: bool = True,
+        ocr_truncated: bool = False,
     ) -> None:
         self.conn.execute(
             """
             INSERT OR REPLACE INTO filing_artifacts(
-              id, filing_id, pdf_path, text_path, ocr_used, ocr_pages, ocr_engine_version
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+              id, filing_id, pdf_path, text_path, ocr_used, ocr_pages, ocr_engine_version, ocr_page_list,
+              text_complete, ocr_truncated
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 artifact_id,
@@ -184,13 +205,252 @@ class Repos:
                 1 if ocr_used else 0,
                 int(ocr_pages),
                 ocr_engine_version,
+                json.dumps(ocr_page_list) if ocr_page_list is not None else None,
+                1 if text_complete else 0,
+                1 if ocr_truncated else 0,
             ),
         )
 
+    def mark_filing_text_complete(
+        self,
+        filing_id: str,
+        *,
+        text_source: str,
+        ocr_page_list: list[int],
+        ocr_engine_version: str | None,
+        ocr_truncated: bool = False,
+    ) -> None:
+        """Record a whole-document extraction on the filing and its artifact."""
+        with write_transaction(self.conn, "mark_filing_text_complete"):
+            self.conn.execute("UPDATE filings SET text_source=? WHERE id=?", (text_source, filing_id))
+            self.conn.execute(
+                """
+                UPDATE filing_artifacts
+                SET text_complete=1, ocr_used=?, ocr_pages=?, ocr_page_list=?, ocr_truncated=?,
+                    ocr_engine_version=COALESCE(?, ocr_engine_version)
+                WHERE filing_id=?
+                """,
+                (
+                    1 if ocr_page_list else 0,
+                    len(ocr_page_list),
+                    json.dumps(ocr_page_list),
+                    1 if ocr_truncated else 0,
+                    ocr_engine_version,
+                    filing_id,
+                ),
+            )
+
+    def get_pdf_url_index(self, pdf_url: str) -> dict[str, Any] | None:
+        row = self.conn.execute(
+            "SELECT pdf_url, pdf_sha256, content_length, etag, checked_at FROM pdf_url_index WHERE pdf_url=?",
+            (pdf_url,),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def upsert_pdf_url_index(
+        self, *, pdf_url: str, pdf_sha256: str, content_length: int | None, etag: str | None
+    ) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO pdf_url_index(pdf_url, pdf_sha256, content_length, etag)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(pdf_url) DO UPDATE SET
+              pdf_sha256=excluded.pdf_sha256,
+              content_length=COALESCE(excluded.content_length, pdf_url_index.content_length),
+              etag=COALESCE(excluded.etag, pdf_url_index.etag),
+              checked_at=datetime('now')
+            """,
+            (pdf_url, pdf_sha256, content_length, etag),
+        )
+
+    # Extracted-text cache
+    def get_text_cache(self, cache_key: str) -> dict[str, Any] | None:
+        row = self.conn.execute(
+            """
+            SELECT cache_key, pdf_sha256, extractor, engine_version, text, text_source, ocr_page_list, complete,
+                   ocr_truncated
+            FROM text_cache WHERE cache_key=?
+            """,
+            (cache_key,),
+        ).fetchone()
+        if not row:
+            return None
+        self.conn.execute(
+            "UPDATE text_cache SET hits=hits+1, last_used_at=datetime('now') WHERE cache_key=?",
+            (cache_key,),
+        )
+        payload = dict(row)
+        payload["ocr_page_list"] = json.loads(row["ocr_page_list"]) if row["ocr_page_list"] else []
+        return payload
+
+    def put_text_cache(
+        self,
+        *,
+        cache_key: str,
+        pdf_sha256: str,
+        extractor: str,
+        ocr_lang: str,
+        dpi: int,
+        engine_version: str | None,
+        text: str,
+        text_source: str,
+        ocr_page_list: list[int],
+        complete: bool = True,
+        ocr_truncated: bool = False,
+    ) -> None:
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO text_cache(
+              cache_key, pdf_sha256, extractor, ocr_lang, dpi, engine_version,
+              text, text_source, ocr_page_list, complete, ocr_truncated, size_bytes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                cache_key,
+                pdf_sha256,
+                extractor,
+                ocr_lang,
+                int(dpi),
+                engine_version,
+                text,
+                text_source,
+                json.dumps(ocr_page_list),
+                1 if complete else 0,
+                1 if ocr_truncated else 0,
+                len(text.encode("utf-8", errors="ignore")),
+            ),
+        )
+
+    def evict_text_cache(self, max_bytes: int) -> int:
+        """Drop least-recently-used entries until the cache fits in `max_bytes`."""
+        cur = self.conn.execute(
+            """
+            DELETE FROM text_cache WHERE cache_key IN (
+              SELECT cache_key FROM (
+                SELECT cache_key,
+                       SUM(size_bytes) OVER (ORDER BY last_used_at DESC, cache_key) AS running
+                FROM text_cache
+              ) WHERE running > ?
+            )
+            """,
+            (int(max_bytes),),
+        )
+        return cur.rowcount
+
+    def text_cache_usage(self) -> dict[str, Any]:
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS entries, COALESCE(SUM(size_bytes), 0) AS size_bytes, "
+            "COALESCE(SUM(hits), 0) AS stored_hits FROM text_cache"
+        ).fetchone()
+        return dict(row)
+
+    # Deferred LLM summaries
+    def enqueue_summary_job(self, filing_id: str) -> None:
+        self.conn.execute("INSERT OR IGNORE INTO summary_jobs(filing_id) VALUES (?)", (filing_id,))
+
+    def claim_summary_jobs(self, limit: int) -> list[dict[str, Any]]:
+        """Mark up to `limit` oldest due pending jobs RUNNING and return them with the filing's title/text path."""
+        # One UPDATE claims and reports the jobs, so concurrent workers never get the same one.
+        ids = [
+            r["filing_id"]
+            for r in self.conn.execute(
+                """
+                UPDATE summary_jobs SET status='RUNNING', attempts=attempts + 1, started_at=datetime('now')
+                WHERE status='PENDING' AND filing_id IN (
+                  SELECT filing_id FROM summary_jobs
+                  WHERE status='PENDING' AND (next_attempt_at IS NULL OR next_attempt_at <= datetime('now'))
+                  ORDER BY enqueued_at LIMIT ?
+                )
+                RETURNING filing_id
+                """,
+                (limit,),
+            ).fetchall()
+        ]
+        if not ids:
+            return []
+        marks = ",".join("?" for _ in ids)
+        jobs = self.conn.execute(
+            f"""
+            SELECT j.filing_id, j.attempts, f.title, f.confidence, a.text_path
+            FROM summary_jobs j
+            JOIN filings f ON f.id=j.filing_id
+            LEFT JOIN filing_artifacts a ON a.filing_id=j.filing_id
+            WHERE j.filing_id IN ({marks})
+            ORDER BY j.enqueued_at
+            """,
+            tuple(ids),
+        ).fetchall()
+        return [dict(j) for j in jobs]
+
+    def complete_summary_job(self, filing_id: str, *, summary: str, confidence: float) -> None:
+        with write_transaction(self.conn, "complete_summary_job"):
+            self.conn.execute(
+                "UPDATE filings SET summary=?, confidence=MAX(confidence, ?) WHERE id=?",
+                (summary, confidence, filing_id),
+            )
+            self.conn.execute(
+                """
+                UPDATE summary_jobs
+                SET status='DONE', last_error=NULL, next_attempt_at=NULL, finished_at=datetime('now')
+                WHERE filing_id=?
+                """,
+                (filing_id,),
+            )
+
+    def fail_summary_job(self, filing_id: str, error: str, *, retry_in_s: float | None) -> None:
+        """Back to PENDING, claimable again after `retry_in_s` seconds; FAILED when it is None."""
+        retry = retry_in_s is not None
+        self.conn.execute(
+            """
+            UPDATE summary_jobs
+            SET status=?, last_error=?,
+                next_attempt_at=CASE WHEN ? THEN datetime('now', '+' || ? || ' seconds') END,
+                finished_at=CASE WHEN ? THEN NULL ELSE datetime('now') END
+            WHERE filing_id=?
+            """,
+            ("PENDING" if retry else "FAILED", error[:500], retry, retry_in_s or 0, retry, filing_id),
+        )
+
+    def requeue_running_summary_jobs(self) -> int:
+        """Jobs left RUNNING by a previous process (crash / restart) go back to the queue."""
+        cur = self.conn.execute("UPDATE summary_jobs SET status='PENDING' WHERE status='RUNNING'")
+        return cur.rowcount
+
+    def summary_queue_stats(self) -> dict[str, Any]:
+        counts = {
+            r["status"]: r["n"]
+            for r in self.conn.execute("SELECT status, COUNT(*) AS n FROM summary_jobs GROUP BY status")
+        }
+        pending_age = self.conn.execute(
+            """
+            SELECT MAX((julianday('now') - julianday(enqueued_at)) * 86400.0) AS s
+            FROM summary_jobs WHERE status IN ('PENDING', 'RUNNING')
+            """
+        ).fetchone()["s"]
+        latency = self.conn.execute(
+            """
+            SELECT AVG(s) AS avg_s, MAX(s) AS max_s, COUNT(*) AS n FROM (
+              SELECT (julianday(finished_at) - julianday(enqueued_at)) * 86400.0 AS s
+              FROM summary_jobs WHERE status='DONE' ORDER BY finished_at DESC LIMIT 100
+            )
+            """
+        ).fetchone()
+        return {
+            "depth": counts.get("PENDING", 0) + counts.get("RUNNING", 0),
+            "pending": counts.get("PENDING", 0),
+            "running": counts.get("RUNNING", 0),
+            "done": counts.get("DONE", 0),
+            "failed": counts.get("FAILED", 0),
+            "oldest_pending_s": round(pending_age, 1) if pending_age is not None else None,
+            "recent_latency_avg_s": round(latency["avg_s"], 1) if latency["avg_s"] is not None else None,
+            "recent_latency_max_s": round(latency["max_s"], 1) if latency["max_s"] is not None else None,
+        }
+
     def list_filings(self, symbol: str, from_date: str, to_date: str) -> list[dict[str, Any]]:
         rows = self.conn.execute(
             """
-            SELECT f.*, a.pdf_path, a.text_path, a.ocr_used, a.ocr_pages
+            SELECT f.*, a.pdf_path, a.text_path, a.ocr_used, a.ocr_pages, a.ocr_page_list, a.text_complete,
+                   a.ocr_truncated
             FROM filings f
             LEFT JOIN filing_artifacts a ON a.filing_id=f.id
             WHERE f.symbol=? AND date(COALESCE(f.announced_at, f.created_at)) BETWEEN date(?) AND date(?)
@@ -203,7 +463,8 @@ class Repos:
     def get_filing(self, filing_id: str) -> dict[str, Any] | None:
         row = self.conn.execute(
             """
-            SELECT f.*, a.pdf_path, a.text_path, a.ocr_used, a.ocr_pages
+            SELECT f.*, a.pdf_path, a.text_path, a.ocr_used, a.ocr_pages, a.ocr_page_list, a.text_complete,
+                   a.ocr_truncated
             FROM filings f
             LEFT JOIN filing_artifacts a ON a.filing_id=f.id
             WHERE f.id=?
@@ -224,35 +485,204 @@ class Repos:
         url: str,
         mood_score: float,
         confidence: float,
+    ) -> bool:
+        """
+        Insert or update a headline and apply the change to the mood rollups incrementally.
+
+        Returns True when the headline is new or its time/score/confidence changed; otherwise the
+        stored row is left as it is and nothing is written.
+        """
+        # The old row decides the delta, so read, upsert and rollups share one write lock:
+        # otherwise two writers adding the same new headline would both count it.
+        with write_transaction(self.conn, "upsert_headline"):
+            old = self.conn.execute(
+                "SELECT published_at, mood_score, confidence FROM news_headlines WHERE id=?",
+                (headline_id,),
+            ).fetchone()
+            new = (published_at, float(mood_score), float(confidence))
+            if old is not None and tuple(old) == new:
+                return False
+            self.conn.execute(
+                """
+                INSERT INTO news_headlines(id, symbol, published_at, source, title, url, mood_score, confidence)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                  published_at=excluded.published_at,
+                  source=excluded.source,
+                  title=excluded.title,
+                  url=excluded.url,
+                  mood_score=excluded.mood_score,
+                  confidence=excluded.confidence
+                """,
+                (
+                    headline_id,
+                    symbol.upper(),
+                    published_at,
+                    source,
+                    title,
+                    url,
+                    float(mood_score),
+                    float(confidence),
+                ),
+            )
+            if old is not None:
+                self._apply_mood_delta(symbol, *tuple(old), sign=-1)
+            self._apply_mood_delta(symbol, *new, sign=+1)
+            return True
+
+    def _apply_mood_delta(
+        self, symbol: str, published_at: str | None, score: float, confidence: float, *, sign: int
     ) -> None:
-        self.conn.execute(
+        """Add (sign=+1) or remove (sign=-1) one headline from every rollup's running totals."""
+        if published_at is None:
+            return
+        buckets = self.conn.execute(
+            "SELECT " + ", ".join(expr.format(ts="?") for _, _, expr in MOOD_ROLLUPS.values()),
+            (published_at,) * len(MOOD_ROLLUPS),
+        ).fetchone()
+        for (table, column, _), bucket in zip(MOOD_ROLLUPS.values(), buckets):
+            if bucket is None:
+                continue
+            self.conn.execute(
+                f"""
+                INSERT INTO {table}(
+                  symbol, {column}, mood_avg, mood_count, mood_pos, mood_neg, mood_sum, weighted_sum, weight_sum
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(symbol, {column}) DO UPDATE SET
+                  mood_sum=mood_sum + excluded.mood_sum,
+                  mood_count=mood_count + excluded.mood_count,
+                  mood_pos=mood_pos + excluded.mood_pos,
+                  mood_neg=mood_neg + excluded.mood_neg,
+                  weighted_sum=weighted_sum + excluded.weighted_sum,
+                  weight_sum=weight_sum + excluded.weight_sum,
+                  mood_avg=CASE WHEN mood_count + excluded.mood_count > 0
+                    THEN (mood_sum + excluded.mood_sum) / (mood_count + excluded.mood_count) ELSE 0 END
+                """,
+                (
+                    symbol.upper(),
+                    bucket,
+                    score,
+                    sign,
+                    sign if score > 0 else 0,
+                    sign if score < 0 else 0,
+                    sign * score,
+                    sign * score * confidence,
+                    sign * confidence,
+                ),
+            )
+            if sign < 0:
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE symbol=? AND {column}=? AND mood_count <= 0",
+                    (symbol.upper(), bucket),
+                )
+
+    def rebuild_mood_rollups(
+        self,
+        symbol: str | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        resolutions: Iterable[str] | None = None,
+    ) -> int:
+        """
+        Recompute mood rollups from `news_headlines` for buckets starting within the date range
+        (default: every symbol, every bucket, every resolution). Returns the rows written.
+        """
+        written = 0
+        for resolution in resolutions or MOOD_ROLLUPS:
+            table, column, expr = MOOD_ROLLUPS[resolution]
+            where = ["1=1"]
+            params: list[Any] = []
+            if symbol:
+                where.append("symbol=?")
+                params.append(symbol.upper())
+            if from_date:
+                where.append(f"date({column}) >= date(?)")
+                params.append(from_date)
+            if to_date:
+                where.append(f"date({column}) <= date(?)")
+                params.append(to_date)
+            cond = " AND ".join(where)
+            self.conn.execute(f"DELETE FROM {table} WHERE {cond}", params)
+            cur = self.conn.execute(
+                f"""
+                INSERT INTO {table}(
+                  symbol, {column}, mood_avg, mood_count, mood_pos, mood_neg, mood_sum, weighted_sum, weight_sum
+                )
+                SELECT symbol, {column}, AVG(mood_score), COUNT(*), SUM(mood_score > 0), SUM(mood_score < 0),
+                       SUM(mood_score), SUM(mood_score * confidence), SUM(confidence)
+                FROM (SELECT symbol, {expr.format(ts="published_at")} AS {column}, mood_score, confidence
+                      FROM news_headlines)
+                WHERE {column} IS NOT NULL AND {cond}
+                GROUP BY symbol, {column}
+                """,
+                params,
+            )
+            written += cur.rowcount
+        return written
+
+    # Near-duplicate headlines
+    def headline_state(self, headline_id: str) -> str | None:
+        """'headline' if stored, 'duplicate' if recorded as a near-duplicate copy, else None."""
+        if self.conn.execute("SELECT 1 FROM news_headlines WHERE id=?", (headline_id,)).fetchone():
+            return "headline"
+        if self.conn.execute("SELECT 1 FROM news_duplicates WHERE id=?", (headline_id,)).fetchone():
+            return "duplicate"
+        return None
+
+    def find_lsh_candidates(
+        self, symbol: str, bands: list[int], at: str | None, window_hours: float
+    ) -> list[dict[str, Any]]:
+        """Stored headlines sharing at least one LSH band, published within `window_hours` of `at`."""
+        match = " OR ".join("(b.band=? AND b.value=?)" for _ in bands)
+        params: list[Any] = [symbol.upper()]
+        for i, value in enumerate(bands):
+            params += [i, value]
+        rows = self.conn.execute(
+            f"""
+            SELECT DISTINCT h.id, h.minhash
+            FROM headline_lsh_bands b JOIN news_headlines h ON h.id=b.headline_id
+            WHERE b.symbol=? AND ({match})
+              AND ABS(julianday(COALESCE(h.published_at, h.created_at))
+                      - julianday(COALESCE(?, datetime('now')))) * 24.0 <= ?
+            """,
+            (*params, at, window_hours),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def index_headline_minhash(self, headline_id: str, symbol: str, signature: bytes, bands: list[int]) -> None:
+        self.conn.execute("UPDATE news_headlines SET minhash=? WHERE id=?", (signature, headline_id))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO headline_lsh_bands(symbol, band, value, headline_id) VALUES (?, ?, ?, ?)",
+            [(symbol.upper(), i, value, headline_id) for i, value in enumerate(bands)],
+        )
+
+    def add_news_duplicate(
+        self,
+        *,
+        headline_id: str,
+        canonical_id: str,
+        symbol: str,
+        published_at: str | None,
+        source: str,
+        title: str,
+        url: str,
+        similarity: float,
+    ) -> None:
+        cur = self.conn.execute(
             """
-            INSERT INTO news_headlines(id, symbol, published_at, source, title, url, mood_score, confidence)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-              published_at=excluded.published_at,
-              source=excluded.source,
-              title=excluded.title,
-              url=excluded.url,
-              mood_score=excluded.mood_score,
-              confidence=excluded.confidence
+            INSERT OR IGNORE INTO news_duplicates(
+              id, canonical_id, symbol, published_at, source, title, url, similarity
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                headline_id,
-                symbol.upper(),
-                published_at,
-                source,
-                title,
-                url,
-                float(mood_score),
-                float(confidence),
-            ),
+            (headline_id, canonical_id, symbol.upper(), published_at, source, title, url, similarity),
         )
+        if cur.rowcount:
+            self.conn.execute("UPDATE news_headlines SET cluster_size=cluster_size + 1 WHERE id=?", (canonical_id,))
 
     def list_headlines(self, symbol: str, from_date: str, to_date: str) -> list[dict[str, Any]]:
         rows = self.conn.execute(
             """
-            SELECT *
+            SELECT id, symbol, published_at, source, title, url, mood_score, confidence, cluster_size, created_at
             FROM news_headlines
             WHERE symbol=? AND date(COALESCE(published_at, created_at)) BETWEEN date(?) AND date(?)
             ORDER BY COALESCE(published_at, created_at) ASC
@@ -261,24 +691,21 @@ class Repos:
         ).fetchall()
         return [dict(r) for r in rows]
 
-    def upsert_mood_daily(self, symbol: str, day: date, scores: list[float]) -> None:
-        if not scores:
-            return
-        avg = sum(scores) / len(scores)
-        pos = sum(1 for s in scores if s > 0)
-        neg = sum(1 for s in scores if s < 0)
-        self.conn.execute(
-            """
-            INSERT INTO mood_daily(symbol, date, mood_avg, mood_count, mood_pos, mood_neg)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(symbol, date) DO UPDATE SET
-              mood_avg=excluded.mood_avg,
-              mood_count=excluded.mood_count,
-              mood_pos=excluded.mood_pos,
-              mood_neg=excluded.mood_neg
+    def list_mood(self, symbol: str, from_date: str, to_date: str, resolution: str = "day") -> list[dict[str, Any]]:
+        """Rollup rows at `resolution` (hour/day/week) whose bucket starts within the date range."""
+        table, column, _ = MOOD_ROLLUPS[resolution]
+        rows = self.conn.execute(
+            f"""
+            SELECT {column} AS bucket, mood_avg,
+                   CASE WHEN weight_sum > 0 THEN weighted_sum / weight_sum END AS mood_wavg,
+                   mood_count, mood_pos, mood_neg
+            FROM {table}
+            WHERE symbol=? AND {column} >= ? AND {column} < date(?, '+1 day')
+            ORDER BY {column} ASC
             """,
-            (symbol.upper(), day.isoformat(), float(avg), len(scores), pos, neg),
-        )
+            (symbol.upper(), from_date, to_date),
+        ).fetchall()
+        return [dict(r) for r in rows]
 
     def list_mood_daily(self, symbol: str, from_date: str, to_date: str) -> list[dict[str, Any]]:
         rows = self.conn.execute(
@@ -293,6 +720,17 @@ class Repos:
         return [dict(r) for r in rows]
 
     # Prices
+    _UPSERT_PRICE_SQL = """
+        INSERT INTO prices(symbol, ts, open, high, low, close, volume)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(symbol, ts) DO UPDATE SET
+          open=excluded.open,
+          high=excluded.high,
+          low=excluded.low,
+          close=excluded.close,
+          volume=excluded.volume
+        """
+
     def upsert_prices(self, symbol: str, rows: Iterable[dict[str, Any]]) -> None:
         payload = []
         for r in rows:
@@ -307,21 +745,140 @@ class Repos:
                     r.get("volume"),
                 )
             )
-        self.conn.executemany(
+        from ims.providers.price import PriceColumns
+
+        with write_transaction(self.conn, "upsert_prices"):
+            in_sync = self._price_store_in_sync(symbol)
+            self.conn.executemany(self._UPSERT_PRICE_SQL, payload)
+        self._update_price_store(symbol, PriceColumns.from_rows(payload), in_sync)
+
+    def upsert_price_columns(self, symbol: str, cols: PriceColumns) -> int:
+        """Upsert a columnar price history straight from its arrays; returns the number of bars."""
+        with write_transaction(self.conn, "upsert_prices"):
+            in_sync = self._price_store_in_sync(symbol)
+            self.conn.executemany(self._UPSERT_PRICE_SQL, cols.rows(symbol))
+        self._update_price_store(symbol, cols, in_sync)
+        return len(cols)
+
+    # A symbol is listed in price_store_symbols while the price store holds its whole history.
+    # Every price write without the store drops the symbol, so reads fall back to SQLite until
+    # the next write with the store enabled copies the history over again.
+    def _price_store_in_sync(self, symbol: str) -> bool:
+        if self.price_store is None:
+            return False
+        row = self.conn.execute("SELECT 1 FROM price_store_symbols WHERE symbol=?", (symbol.upper(),)).fetchone()
+        return row is not None
+
+    def _set_price_store_synced(self, symbol: str, synced: bool) -> None:
+        if synced:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO price_store_symbols(symbol, synced_at) VALUES (?, datetime('now'))",
+                (symbol.upper(),),
+            )
+        else:
+            self.conn.execute("DELETE FROM price_store_symbols WHERE symbol=?", (symbol.upper(),))
+
+    def sync_price_store(self, symbol: str) -> int:
+        """Copy a symbol's whole history from `prices` into the price store; returns the bar count."""
+        from ims.providers.price import PriceColumns
+
+        if self.price_store is None:
+            raise RuntimeError("Price store is not enabled")
+        rows = self.conn.execute(
+            "SELECT symbol, ts, open, high, low, close, volume FROM prices WHERE symbol=? ORDER BY ts",
+            (symbol.upper(),),
+        ).fetchall()
+        # Unmarked (and committed) before the files change; marked once every month is written.
+        self._unset_price_store_synced(symbol)
+        n = self.price_store.replace(symbol, PriceColumns.from_rows([tuple(r) for r in rows]))
+        self._set_price_store_synced(symbol, True)
+        return n
+
+    def _unset_price_store_synced(self, symbol: str) -> None:
+        with write_transaction(self.conn, "price_store_unsync"):
+            self._set_price_store_synced(symbol, False)
+
+    def _update_price_store(self, symbol: str, cols: PriceColumns, in_sync: bool) -> None:
+        """Follow a committed price write in the store (or mark the symbol out of sync)."""
+        if self.price_store is None:
+            self._unset_price_store_synced(symbol)
+            return
+        if not in_sync:
+            # First write with the store enabled (or the store fell behind): copy the whole
+            # history, so the store never serves a partial one.
+            self.sync_price_store(symbol)
+            return
+        try:
+            self.price_store.upsert(symbol, cols)
+        except Exception:
+            self._unset_price_store_synced(symbol)
+            raise
+
+    def price_symbols(self) -> list[str]:
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT symbol FROM prices ORDER BY symbol")]
+
+    def price_bounds(self, symbols: Iterable[str]) -> dict[str, tuple[str, str]]:
+        """`(first ts, last ts)` of the stored bars per symbol (symbols without bars are absent)."""
+        wanted = {s.upper() for s in symbols}
+        if not wanted:
+            return {}
+        marks = ",".join("?" * len(wanted))
+        rows = self.conn.execute(
+            f"SELECT symbol, MIN(ts) AS first_ts, MAX(ts) AS last_ts FROM prices WHERE symbol IN ({marks}) GROUP BY symbol",
+            tuple(wanted),
+        ).fetchall()
+        return {r["symbol"]: (r["first_ts"], r["last_ts"]) for r in rows}
+
+    def price_closes(self, symbol: str, since_ts: str) -> dict[str, float | None]:
+        rows = self.conn.execute(
+            "SELECT ts, close FROM prices WHERE symbol=? AND ts >= ?", (symbol.upper(), since_ts)
+        ).fetchall()
+        return {r["ts"]: r["close"] for r in rows}
+
+    def replace_price_columns(self, symbol: str, cols: PriceColumns) -> int:
+        """Replace a symbol's whole stored history (after Yahoo re-based it, e.g. for a split)."""
+        with write_transaction(self.conn, "replace_prices"):
+            # Reads fall back to SQLite until the store holds the new history too.
+            self._set_price_store_synced(symbol, False)
+            self.conn.execute("DELETE FROM prices WHERE symbol=?", (symbol.upper(),))
+            self.conn.executemany(self._UPSERT_PRICE_SQL, cols.rows(symbol))
+        if self.price_store is not None:
+            self.price_store.replace(symbol, cols)
+            self._set_price_store_synced(symbol, True)
+        return len(cols)
+
+    # Yahoo ticker resolution
+    def get_yahoo_tickers(self, symbols: Iterable[str], *, max_age_days: float) -> dict[str, str]:
+        """Resolved tickers younger than `max_age_days`, keyed by symbol."""
+        out: dict[str, str] = {}
+        for symbol in {s.upper() for s in symbols}:
+            row = self.conn.execute(
+                """
+                SELECT ticker FROM yahoo_tickers
+                WHERE symbol=? AND resolved_at >= datetime('now', '-' || ? || ' days')
+                """,
+                (symbol, max_age_days),
+            ).fetchone()
+            if row:
+                out[symbol] = row["ticker"]
+        return out
+
+    def set_yahoo_ticker(self, symbol: str, ticker: str) -> None:
+        self.conn.execute(
             """
-            INSERT INTO prices(symbol, ts, open, high, low, close, volume)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(symbol, ts) DO UPDATE SET
-              open=excluded.open,
-              high=excluded.high,
-              low=excluded.low,
-              close=excluded.close,
-              volume=excluded.volume
+            INSERT INTO yahoo_tickers(symbol, ticker, resolved_at) VALUES (?, ?, datetime('now'))
+            ON CONFLICT(symbol) DO UPDATE SET ticker=excluded.ticker, resolved_at=excluded.resolved_at
             """,
-            payload,
+            (symbol.upper(), ticker),
         )
 
+    def delete_yahoo_ticker(self, symbol: str) -> None:
+        self.conn.execute("DELETE FROM yahoo_tickers WHERE symbol=?", (symbol.upper(),))
+
     def list_prices(self, symbol: str, from_date: str, to_date: str) -> list[dict[str, Any]]:
+        store = self.price_store
+        if store is not None and store.has(symbol) and self._price_store_in_sync(symbol):
+            return store.list_prices(symbol, from_date, to_date)
         rows = self.conn.execute(
             """
             SELECT symbol, ts, open, high, low, close, volume
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+from ims.core.settings import Settings
+from ims.storage.repos import Repos, stable_id
+
+
+@dataclass(frozen=True)
+class CachedText:
+    text: str
+    text_source: str
+    ocr_page_list: list[int]
+    engine_version: str | None
+    complete: bool = True
+    # Pages needed OCR beyond `ocr_max_pages` and kept their (missing/garbled) text layer.
+    ocr_truncated: bool = False
+
+
+_counters = {"hits": 0, "misses": 0, "evictions": 0}
+_counters_lock = threading.Lock()
+
+
+def _bump(name: str, n: int = 1) -> None:
+    with _counters_lock:
+        _counters[name] += n
+
+
+def cache_counters() -> dict[str, int]:
+    """Process-wide hit/miss/eviction counters since startup."""
+    with _counters_lock:
+        return dict(_counters)
+
+
+class TextCache:
+    """
+    Content-addressed cache of extracted filing text.
+
+    Entries are keyed by the PDF's sha256 plus everything that changes the extracted text
+    (extractor, OCR language, DPI, tesseract version, OCR selection thresholds), so the same
+    bytes filed under several symbols are extracted/OCRed once. Stored in SQLite and trimmed
+    least-recently-used first once the total text size exceeds `text_cache_max_mb`.
+    """
+
+    def __init__(self, repos: Repos, settings: Settings):
+        self.repos = repos
+        self.settings = settings
+        self.max_bytes = int(settings.text_cache_max_mb * 1024 * 1024)
+
+    def key(self, *, pdf_sha256: str, extractor: str, engine_version: str | None, budgeted: bool = True) -> str:
+        s = self.settings
+        budget = f"{s.pdf_text_page_budget}/{s.pdf_text_char_budget}" if budgeted else "full"
+        return stable_id(
+            pdf_sha256,
+            extractor,
+            s.ocr_lang,
+            str(s.ocr_dpi),
+            engine_version or "",
+            f"{s.pdf_text_min_chars}/{s.pdf_page_text_min_chars}/{s.ocr_max_pages}",
+            budget,
+        )
+
+    def get(self, cache_key: str) -> CachedText | None:
+        row = self.repos.get_text_cache(cache_key)
+        if row is None:
+            _bump("misses")
+            return None
+        _bump("hits")
+        return CachedText(
+            text=row["text"],
+            text_source=row["text_source"],
+            ocr_page_list=row["ocr_page_list"],
+            engine_version=row["engine_version"],
+            complete=bool(row["complete"]),
+            ocr_truncated=bool(row["ocr_truncated"]),
+        )
+
+    def put(self, cache_key: str, *, pdf_sha256: str, extractor: str, entry: CachedText) -> None:
+        self.repos.put_text_cache(
+            cache_key=cache_key,
+            pdf_sha256=pdf_sha256,
+            extractor=extractor,
+            ocr_lang=self.settings.ocr_lang,
+            dpi=self.settings.ocr_dpi,
+            engine_version=entry.engine_version,
+            text=entry.text,
+            text_source=entry.text_source,
+            ocr_page_list=entry.ocr_page_list,
+            complete=entry.complete,
+            ocr_truncated=entry.ocr_truncated,
+        )
+        evicted = self.repos.evict_text_cache(self.max_bytes)
+        if evicted:
+            _bump("evictions", evicted)
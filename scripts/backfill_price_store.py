@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+
+from ims.core.settings import get_settings
+from ims.storage.db import connect, init_db
+from ims.storage.price_store import PriceStore
+from ims.storage.repos import Repos
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Copy stored prices into the columnar price store (data_dir/prices)."
+    )
+    ap.add_argument("--symbol", action="append", help="repeatable (default: every symbol with prices)")
+    args = ap.parse_args()
+
+    settings = get_settings()
+    init_db(settings.db_path)
+    store = PriceStore(settings.data_dir / "prices")
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn, price_store=store)
+        symbols = [s.upper() for s in args.symbol] if args.symbol else repos.price_symbols()
+        total = sum(repos.sync_price_store(symbol) for symbol in symbols)
+    print(f"Backfilled {total} bars for {len(symbols)} symbols into {store.root}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: per-call `httpx.Client` (old behaviour) vs the pooled `HttpClient`.
+
+Runs against a local stand-in server. `--handshake-ms` delays every *new* connection to
+model the TCP+TLS setup cost we pay against api.bseindia.com / www.bseindia.com.
+
+    python scripts/bench_http_client.py --requests 200 --handshake-ms 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from ims.providers.http import HttpClient
+
+PAYLOAD = b'{"Table": []}'
+
+
+def _make_server(handshake_ms: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            time.sleep(handshake_ms / 1000.0)
+            super().setup()
+
+        def do_GET(self) -> None:  # noqa: N802
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(PAYLOAD)))
+            self.end_headers()
+            self.wfile.write(PAYLOAD)
+
+        def log_message(self, *args) -> None:  # noqa: ANN002
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _old_get_text(url: str) -> str:
+    with httpx.Client(timeout=20.0, headers={"User-Agent": "bench"}, follow_redirects=True) as c:
+        r = c.get(url)
+        r.raise_for_status()
+        return r.text
+
+
+def _timed(fn, url: str, n: int) -> list[float]:
+    out: list[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn(url)
+        out.append((time.perf_counter() - t0) * 1000.0)
+    return out
+
+
+def _report(name: str, samples: list[float]) -> None:
+    total = sum(samples)
+    p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+    print(
+        f"{name:<10} total={total:8.1f}ms mean={statistics.mean(samples):6.2f}ms "
+        f"p50={statistics.median(samples):6.2f}ms p95={p95:6.2f}ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--handshake-ms", type=float, default=40.0)
+    args = ap.parse_args()
+
+    server = _make_server(args.handshake_ms)
+    url = f"http://127.0.0.1:{server.server_address[1]}/BseIndiaAPI/api/AnnGetData/w"
+
+    pooled = HttpClient(timeout_s=20.0, retries=1, user_agent="bench")
+    try:
+        old = _timed(_old_get_text, url, args.requests)
+        new = _timed(pooled.get_text, url, args.requests)
+    finally:
+        pooled.close()
+        server.shutdown()
+
+    print(f"requests={args.requests} handshake_ms={args.handshake_ms}")
+    _report("per-call", old)
+    _report("pooled", new)
+    print(f"speedup={sum(old) / max(sum(new), 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark the PDF text-layer backends in `ims.services.pdf_text`.
+
+Builds a synthetic corpus (text-layer PDFs of varying length plus image-only "scanned" PDFs)
+and reports pages/sec and character yield for every locally available backend.
+
+    python scripts/bench_pdf_text.py --docs 20 --pages 30
+    python scripts/bench_pdf_text.py --corpus path/to/pdfs   # real filings instead
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+from ims.services.pdf_text import BACKENDS, available_backends
+
+_WORDS = (
+    "board meeting dividend results quarter revenue profit order contract rating crisil "
+    "sebi compliance shareholders approved crore rupees per share record date outcome annexure"
+).split()
+
+
+def _text_pdf(pages: list[str]) -> bytes:
+    """Minimal multi-page PDF with a Helvetica text layer."""
+    n = len(pages)
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(n))}] /Count {n} >>",
+    ]
+    font_ref = 3 + 2 * n
+    for i, text in enumerate(pages):
+        objs.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_ref} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        )
+        ops = []
+        for row, line in enumerate(textwrap.wrap(text, 90)[:50]):
+            safe = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"BT /F1 10 Tf 40 {750 - 14 * row} Td ({safe}) Tj ET")
+        stream = "\n".join(ops)
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objs.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def _scanned_pdf(path: Path, pages: list[str]) -> None:
+    """Image-only PDF (no text layer), like a scanned board outcome."""
+    from PIL import Image, ImageDraw
+
+    images = []
+    for text in pages:
+        img = Image.new("L", (1240, 1754), color=255)
+        draw = ImageDraw.Draw(img)
+        for row, line in enumerate(textwrap.wrap(text, 70)[:40]):
+            draw.text((80, 80 + 36 * row), line, fill=0)
+        images.append(img)
+    images[0].save(path, "PDF", resolution=150, save_all=True, append_images=images[1:])
+
+
+def _build_corpus(dst: Path, *, docs: int, max_pages: int, seed: int) -> list[Path]:
+    rng = random.Random(seed)
+    out: list[Path] = []
+    for i in range(docs):
+        n_pages = rng.randint(1, max_pages)
+        pages = [" ".join(rng.choice(_WORDS) for _ in range(rng.randint(150, 450))) for _ in range(n_pages)]
+        if i % 4 == 3:
+            path = dst / f"scan_{i:03d}.pdf"
+            _scanned_pdf(path, pages[:3])
+        else:
+            path = dst / f"text_{i:03d}.pdf"
+            path.write_bytes(_text_pdf(pages))
+        out.append(path)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", type=Path, default=None, help="directory of PDFs (default: synthetic)")
+    ap.add_argument("--docs", type=int, default=20)
+    ap.add_argument("--pages", type=int, default=30, help="max pages per synthetic text PDF")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--repeat", type=int, default=2)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            pdfs = sorted(args.corpus.glob("*.pdf"))
+        else:
+            pdfs = _build_corpus(Path(tmp), docs=args.docs, max_pages=args.pages, seed=args.seed)
+        print(f"corpus: {len(pdfs)} PDFs")
+        print(f"{'backend':<10} {'pages':>7} {'sec':>8} {'pages/s':>9} {'chars':>10} {'chars/page':>11} {'empty pages':>12}")
+        for name in available_backends():
+            backend = BACKENDS[name]
+            best = float("inf")
+            pages = chars = empty = 0
+            for _ in range(args.repeat):
+                pages = chars = empty = 0
+                t0 = time.perf_counter()
+                for pdf in pdfs:
+                    for text in backend.iter_pages(pdf):
+                        pages += 1
+                        chars += len(text.strip())
+                        empty += not text.strip()
+                best = min(best, time.perf_counter() - t0)
+            print(
+                f"{name:<10} {pages:>7} {best:>8.3f} {pages / best:>9.1f} {chars:>10} "
+                f"{chars / max(pages, 1):>11.1f} {empty:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
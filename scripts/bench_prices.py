@@ -0,0 +1,116 @@
+"""
+Micro-benchmark: price history ingestion, `DataFrame.iterrows()` -> PriceBar -> dict -> tuple
+(the previous path) vs `price_columns` + `Repos.upsert_price_columns` (bulk column conversion
+straight into executemany).
+
+The frame mimics `yf.Ticker(...).history()`: a tz-aware Asia/Kolkata DatetimeIndex, daily or
+intraday bars.
+
+    python scripts/bench_prices.py --bars 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ims.providers.price import PriceBar, price_columns
+from ims.storage.db import init_db
+from ims.storage.repos import Repos
+
+
+def _to_float(v) -> float | None:
+    try:
+        if v is None or pd.isna(v):
+            return None
+        return float(v)
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def legacy_bars(df: pd.DataFrame) -> list[PriceBar]:
+    out: list[PriceBar] = []
+    for _, r in df.reset_index().iterrows():
+        ts = r.get("Date") or r.get("Datetime")
+        if isinstance(ts, pd.Timestamp):
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            ts_str = ts.isoformat()
+        elif isinstance(ts, datetime):
+            ts_str = ts.isoformat()
+        else:
+            ts_str = str(ts)
+        out.append(
+            PriceBar(
+                ts=ts_str,
+                open=_to_float(r.get("Open")),
+                high=_to_float(r.get("High")),
+                low=_to_float(r.get("Low")),
+                close=_to_float(r.get("Close")),
+                volume=_to_float(r.get("Volume")),
+            )
+        )
+    return out
+
+
+def make_frame(bars: int, freq: str) -> pd.DataFrame:
+    idx = pd.date_range("2015-01-01 09:15", periods=bars, freq=freq, tz="Asia/Kolkata", name="Date")
+    rng = np.random.default_rng(7)
+    close = 100 + rng.standard_normal(bars).cumsum()
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": rng.integers(1, 10**6, bars)},
+        index=idx,
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bars", type=int, default=20_000)
+    ap.add_argument("--freq", default="min", help="pandas frequency of the synthetic bars (D, h, min)")
+    args = ap.parse_args()
+
+    df = make_frame(args.bars, args.freq)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        init_db(db)
+        conn = sqlite3.connect(db)
+        conn.execute("INSERT INTO companies(symbol, name) VALUES ('BENCH', 'Bench Ltd')")
+        repos = Repos(conn)
+
+        t0 = time.perf_counter()
+        bars = legacy_bars(df)
+        rows = [
+            {"ts": b.ts, "open": b.open, "high": b.high, "low": b.low, "close": b.close, "volume": b.volume}
+            for b in bars
+        ]
+        t1 = time.perf_counter()
+        repos.upsert_prices("BENCH", rows)
+        conn.commit()
+        t2 = time.perf_counter()
+        legacy = conn.execute("SELECT * FROM prices ORDER BY ts").fetchall()
+
+        conn.execute("DELETE FROM prices")
+        conn.commit()
+        t3 = time.perf_counter()
+        cols = price_columns(df)
+        t4 = time.perf_counter()
+        repos.upsert_price_columns("BENCH", cols)
+        conn.commit()
+        t5 = time.perf_counter()
+        columnar = conn.execute("SELECT * FROM prices ORDER BY ts").fetchall()
+        conn.close()
+
+    print(f"bars={args.bars} freq={args.freq} identical_rows={legacy == columnar}")
+    print(f"legacy   convert={1000 * (t1 - t0):8.1f}ms  upsert={1000 * (t2 - t1):8.1f}ms")
+    print(f"columnar convert={1000 * (t4 - t3):8.1f}ms  upsert={1000 * (t5 - t4):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
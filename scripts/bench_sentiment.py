@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: headline sentiment scoring, per-call `TextBlob(title)` (the previous path)
+vs `ims.services.sentiment.score_headlines` (memoized batch API).
+
+The synthetic workload mimics a watchlist refresh: `--symbols` x 50 headlines with a share of
+syndicated duplicates, scored `--refreshes` times in a row (hourly refreshes see mostly the
+same headlines again).
+
+    python scripts/bench_sentiment.py --symbols 40 --refreshes 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from ims.services.sentiment import SentimentScore, _clip, _lexicon_score, clear_sentiment_memo, score_headlines
+
+try:
+    from textblob import TextBlob
+except Exception:  # noqa: BLE001
+    TextBlob = None  # type: ignore[assignment]
+
+_SUBJECTS = ["Bharat Electronics", "HAL", "Tata Motors", "Infosys", "Reliance", "ITC", "L&T", "SBI"]
+_EVENTS = [
+    "wins big defence order",
+    "shares rally on strong growth",
+    "Q2 profit beats estimates",
+    "faces SEBI probe over disclosures",
+    "stock drops after weak guidance",
+    "declares record dividend",
+    "downgrade by brokerage, shares slump",
+    "board to consider fund raising",
+]
+_SOURCES = ["Economic Times", "Moneycontrol", "Mint", "Business Standard"]
+
+
+def legacy_score(title: str) -> SentimentScore:
+    title = (title or "").strip()
+    if not title:
+        return SentimentScore(score=0.0, confidence=0.0)
+    if TextBlob is not None:
+        blob = TextBlob(title)
+        polarity = float(blob.sentiment.polarity)
+        subjectivity = float(getattr(blob.sentiment, "subjectivity", 0.5))
+        confidence = max(0.2, min(1.0, (1.0 - subjectivity) * 0.9 + 0.1))
+        return SentimentScore(score=_clip(polarity), confidence=confidence)
+    return _lexicon_score(title)
+
+
+def _headlines(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    unique = [
+        f"{rng.choice(_SUBJECTS)} {rng.choice(_EVENTS)} ({i % 97}) - {rng.choice(_SOURCES)}" for i in range(n // 3)
+    ]
+    # Syndication: most headlines appear more than once in a refresh.
+    return [rng.choice(unique) for _ in range(n)]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", type=int, default=40)
+    ap.add_argument("--refreshes", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    titles = _headlines(args.symbols * 50, args.seed)
+    print(f"headlines per refresh: {len(titles)} ({len(set(titles))} distinct), refreshes: {args.refreshes}")
+
+    t0 = time.perf_counter()
+    for _ in range(args.refreshes):
+        legacy = [legacy_score(t) for t in titles]
+    legacy_s = time.perf_counter() - t0
+
+    clear_sentiment_memo()
+    per_refresh = []
+    for _ in range(args.refreshes):
+        t = time.perf_counter()
+        batch = score_headlines(titles)
+        per_refresh.append(time.perf_counter() - t)
+    batch_s = sum(per_refresh)
+
+    print(f"{'path':<28} {'total ms':>10} {'per refresh ms':>16}")
+    print(f"{'per-call TextBlob':<28} {legacy_s * 1000:>10.1f} {legacy_s * 1000 / args.refreshes:>16.1f}")
+    print(f"{'score_headlines (cold)':<28} {per_refresh[0] * 1000:>10.1f} {per_refresh[0] * 1000:>16.1f}")
+    warm = per_refresh[1:] or per_refresh
+    print(f"{'score_headlines (warm)':<28} {sum(warm) * 1000:>10.1f} {sum(warm) * 1000 / len(warm):>16.1f}")
+    print(f"speedup over {args.refreshes} refreshes: {legacy_s / batch_s:.1f}x; identical scores: {legacy == batch}")
+
+
+if __name__ == "__main__":
+    main()
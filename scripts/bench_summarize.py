@@ -0,0 +1,106 @@
+"""
+Benchmark `ims.services.summarize.summarize_filing` against the previous implementation
+(one regex search per category over the whole `title + text`).
+
+Large synthetic OCR-like texts are where the old version hurt: a filing whose keywords do not
+match anything early was scanned up to eight times end to end.
+
+    python scripts/bench_summarize.py --docs 200 --chars 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+
+from ims.services.summarize import SummaryResult, summarize_filing
+
+_INR_RE = re.compile(r"(?:₹|INR)\s*([0-9][0-9,]*(?:\.[0-9]+)?)", re.IGNORECASE)
+_DIV_RE = re.compile(r"\bdividend\b", re.IGNORECASE)
+_BOARD_RE = re.compile(r"\bboard meeting\b|\bmeeting of the board\b", re.IGNORECASE)
+_RESULTS_RE = re.compile(r"\b(results?|financial results?)\b", re.IGNORECASE)
+_ORDER_RE = re.compile(r"\border\b|\bcontract\b|\bwork order\b|\baward(ed)?\b", re.IGNORECASE)
+_RATING_RE = re.compile(r"\bcredit rating\b|\brating\b|\bcrisil\b|\bcare\b|\bicra\b", re.IGNORECASE)
+_REG_RE = re.compile(r"\bsebi\b|\bregulat(ory|ion)\b|\bcompliance\b", re.IGNORECASE)
+
+
+def legacy_summarize_filing(title: str, text: str) -> SummaryResult:
+    blob = f"{(title or '').strip()}\n{(text or '').strip()}"
+
+    def first_inr() -> str | None:
+        m = _INR_RE.search(blob)
+        return m.group(1).replace(",", "") if m else None
+
+    if _DIV_RE.search(blob):
+        amt = first_inr()
+        if amt:
+            return SummaryResult("DIVIDEND", f"Company declared a dividend of ₹{amt} per share.", 0.86)
+        return SummaryResult("DIVIDEND", "Company announced a dividend.", 0.62)
+    if _BOARD_RE.search(blob):
+        return SummaryResult("BOARD_MEETING", "Company scheduled a board meeting to consider key corporate matters.", 0.60)
+    if _RESULTS_RE.search(blob):
+        return SummaryResult("RESULTS", "Company announced an update related to its financial results.", 0.58)
+    if _ORDER_RE.search(blob):
+        amt = first_inr()
+        if amt:
+            return SummaryResult("ORDER_WIN", f"Company received an order worth ₹{amt}.", 0.70)
+        return SummaryResult("ORDER_WIN", "Company announced an order win / contract update.", 0.55)
+    if _RATING_RE.search(blob):
+        return SummaryResult("CREDIT_RATING", "Company shared an update related to its credit rating.", 0.55)
+    if _REG_RE.search(blob):
+        return SummaryResult("REGULATORY", "Company shared a regulatory / compliance update.", 0.52)
+    return SummaryResult("OTHER", "Company made a corporate announcement.", 0.40)
+
+
+_FILLER = "the company hereby informs exchange that pursuant to applicable provisions annexure enclosed".split()
+_KEYWORDS = ["dividend", "board meeting", "financial results", "work order", "credit rating", "sebi", "₹ 1,250", "INR 42.5"]
+_TITLES = ["Outcome of Board Meeting", "Declaration of Dividend", "Award of Contract", "Disclosure", "Intimation", "Update"]
+
+
+def _corpus(n: int, chars: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(n):
+        # Keyword density varies: cover-page heavy, sparse, and keyword-free (OTHER) documents.
+        rate = rng.choice((0.0, 0.00005, 0.0005))
+        words: list[str] = []
+        size = 0
+        while size < chars:
+            w = rng.choice(_KEYWORDS) if rng.random() < rate else rng.choice(_FILLER)
+            words.append(w)
+            size += len(w) + 1
+        docs.append((rng.choice(_TITLES), " ".join(words)))
+    return docs
+
+
+def _time(fn, docs) -> tuple[float, list[SummaryResult]]:
+    t0 = time.perf_counter()
+    out = [fn(title, text) for title, text in docs]
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=100)
+    ap.add_argument("--chars", type=int, default=1_000_000, help="approximate text size per document")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    docs = _corpus(args.docs, args.chars, args.seed)
+    legacy_s, legacy = _time(legacy_summarize_filing, docs)
+    full_s, full = _time(lambda t, x: summarize_filing(t, x, scan_chars=None), docs)
+    window_s, window = _time(summarize_filing, docs)
+
+    print(f"corpus: {len(docs)} docs x ~{args.chars} chars")
+    print(f"{'variant':<26} {'sec':>8} {'docs/s':>9} {'speedup':>8}")
+    for name, sec in (("legacy (8 scans)", legacy_s), ("single pass, full text", full_s), ("single pass, window", window_s)):
+        print(f"{name:<26} {sec:>8.3f} {len(docs) / sec:>9.1f} {legacy_s / sec:>7.1f}x")
+    print(f"full-text results identical to legacy: {full == legacy}")
+    changed = sum(a != b for a, b in zip(legacy, window))
+    print(f"window results differing from full text: {changed}/{len(docs)}")
+
+
+if __name__ == "__main__":
+    main()
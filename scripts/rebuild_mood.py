@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import argparse
+
+from ims.core.settings import get_settings
+from ims.storage.db import connect, init_db
+from ims.storage.repos import MOOD_ROLLUPS, Repos
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Recompute mood rollups from stored headlines.")
+    ap.add_argument("--symbol", default=None, help="only this symbol (default: all)")
+    ap.add_argument("--from", dest="from_date", default=None, help="YYYY-MM-DD (inclusive)")
+    ap.add_argument("--to", dest="to_date", default=None, help="YYYY-MM-DD (inclusive)")
+    ap.add_argument(
+        "--resolution", action="append", choices=sorted(MOOD_ROLLUPS), help="repeatable (default: all)"
+    )
+    args = ap.parse_args()
+
+    settings = get_settings()
+    init_db(settings.db_path)
+    with connect(settings.db_path) as conn:
+        n = Repos(conn).rebuild_mood_rollups(args.symbol, args.from_date, args.to_date, args.resolution)
+    print(f"Rebuilt {n} mood rollup rows.")
+
+
+if __name__ == "__main__":
+    main()
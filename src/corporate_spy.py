@@ -21,6 +21,14 @@ def analyze_symbol(symbol: str, *, lookback_days: int = 30) -> str:
         run = repos.create_run(symbol.upper())
         from ims.pipelines.analyze import run_analyze
 
-        run_analyze(repos=repos, settings=settings, symbol=symbol.upper(), lookback_days=lookback_days, run_id=run.id)
-        repos.finish_run(run.id, "SUCCESS")
-        return run.id
+        result = run_analyze(
+            repos=repos, settings=settings, symbol=symbol.upper(), lookback_days=lookback_days, run_id=run.id
+        )
+        repos.finish_run(run.id, "SUCCESS" if result.ok else "FAILED")
+    if settings.ollama_enabled:
+        # No API process here to run the SummaryWorker: upgrade the queued summaries before returning.
+        from ims.pipelines.summaries import drain_summary_jobs
+
+        with connect(settings.db_path, autocommit=True, timeout_s=settings.db_busy_timeout_s) as conn:
+            drain_summary_jobs(Repos(conn), settings)
+    return run.id
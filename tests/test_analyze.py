@@ -0,0 +1,63 @@
+import threading
+from dataclasses import replace
+
+from ims.core.settings import Settings
+from ims.pipelines import analyze
+from ims.pipelines.news import NewsIngestStats
+from ims.pipelines.price import PriceIngestStats
+from ims.providers.price import PriceColumns
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+
+def test_failing_stage_does_not_cancel_siblings(tmp_path, monkeypatch):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db", price_store_enabled=False)
+    init_db(settings.db_path)
+    # Siblings are still running when the filings stage fails.
+    started = threading.Barrier(3, timeout=5)
+
+    def filings(*, repos, **kwargs):
+        started.wait()
+        raise RuntimeError("BSE is down")
+
+    def news(*, repos, symbol, **kwargs):
+        started.wait()
+        repos.upsert_headline(
+            headline_id="h1",
+            symbol=symbol,
+            published_at="2026-10-01T04:00:00+00:00",
+            source="Mint",
+            title="BEL wins order",
+            url="https://example.test/1",
+            mood_score=0.5,
+            confidence=0.5,
+        )
+        return NewsIngestStats(fetched=1, persisted=1)
+
+    def prices(*, repos, symbol, **kwargs):
+        started.wait()
+        rows = [(symbol, f"2026-10-0{d}T00:00:00+05:30", 1.0, 1.0, 1.0, 1.0, 10.0) for d in range(1, 4)]
+        bars = repos.upsert_price_columns(symbol, PriceColumns.from_rows(rows))
+        assert not repos.conn.in_transaction
+        return PriceIngestStats(bars=bars, period_days=30)
+
+    monkeypatch.setattr(analyze, "ingest_filings", filings)
+    monkeypatch.setattr(analyze, "ingest_news", news)
+    monkeypatch.setattr(analyze, "ingest_prices", prices)
+
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics", bse_scrip_code="500049")
+        run = repos.create_run("BEL")
+        result = analyze.run_analyze(repos=repos, settings=settings, symbol="BEL", lookback_days=30, run_id=run.id)
+
+        assert not result.ok
+        assert result.errors == {"filings": "BSE is down"}
+        assert result.filings is None
+        assert result.news == NewsIngestStats(fetched=1, persisted=1)
+        assert result.prices.bars == 3
+        # The siblings' writes were committed by their own connections.
+        assert conn.execute("SELECT COUNT(*) FROM news_headlines").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0] == 3
+        logs = [(log["level"], log["message"]) for log in repos.get_run(run.id)["logs"]]
+        assert ("ERROR", "Filings stage failed: BSE is down") in logs
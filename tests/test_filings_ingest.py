@@ -0,0 +1,243 @@
+import hashlib
+import threading
+from dataclasses import replace
+from datetime import date
+
+import httpx
+import pytest
+
+from ims.core.settings import Settings
+from ims.pipelines import filings
+from ims.providers.bse import BseAnnouncement
+from ims.providers.http import DownloadResult
+from ims.services.ocr import OcrPage, OcrResult
+from ims.services.pdf_text import PdfTextResult
+from ims.services.workers import CpuPool
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+_TEXT = "Bharat Electronics Limited has received orders worth Rs 500 crore from the Indian Army. " * 4
+
+
+def _ann(n: int) -> BseAnnouncement:
+    return BseAnnouncement(announced_at="2026-10-01", title=f"Order win {n}", pdf_url=f"https://bse.test/{n}.pdf")
+
+
+class FakeBse:
+    def __init__(self, anns):
+        self.anns = anns
+
+    def list_announcements(self, *, scrip_code, from_date, to_date):
+        return list(self.anns)
+
+
+class FakeHttp:
+    """Serves `<url> <version>` as the attachment body; `etags` change when a version bumps."""
+
+    def __init__(self):
+        self.versions: dict[str, int] = {}
+        self.downloads: list[str] = []
+        self.heads: list[str] = []
+        self.lock = threading.Lock()
+
+    def _body(self, url: str) -> bytes:
+        return f"{url} v{self.versions.get(url, 1)}".encode()
+
+    def head(self, url, *, headers=None):
+        with self.lock:
+            self.heads.append(url)
+        return httpx.Headers({"etag": f'"{self.versions.get(url, 1)}"'})
+
+    def download(self, url, dst_dir, *, suffix=".pdf", headers=None):
+        with self.lock:
+            self.downloads.append(url)
+        body = self._body(url)
+        digest = hashlib.sha256(body).hexdigest()
+        dst_dir.mkdir(parents=True, exist_ok=True)
+        path = dst_dir / f"{digest}{suffix}"
+        path.write_bytes(body)
+        return DownloadResult(path=path, sha256=digest, size=len(body), etag=f'"{self.versions.get(url, 1)}"')
+
+
+def _fake_text(pdf_path, *, backend, max_pages=None, max_chars=None):
+    return PdfTextResult(text=_TEXT, pages=1, page_texts=(_TEXT,))
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(filings, "get_cpu_pool", lambda s: CpuPool(0, task_timeout_s=5))
+    monkeypatch.setattr(filings, "extract_pdf_text", _fake_text)
+    s = replace(
+        Settings(),
+        db_path=tmp_path / "ims.db",
+        data_dir=tmp_path / "data",
+        text_cache_enabled=False,
+        ollama_enabled=False,
+    )
+    init_db(s.db_path)
+    return s
+
+
+def _ingest(repos: Repos, settings: Settings, http: FakeHttp, anns) -> filings.FilingIngestStats:
+    run = repos.create_run("BEL")
+    return filings.ingest_filings(
+        repos=repos,
+        settings=settings,
+        http=http,
+        provider=FakeBse(anns),
+        run_id=run.id,
+        symbol="BEL",
+        scrip_code="500049",
+        from_date=date(2026, 9, 1),
+        to_date=date(2026, 10, 1),
+    )
+
+
+def test_known_urls_are_skipped_without_a_request(settings):
+    http = FakeHttp()
+    anns = [_ann(1), _ann(2)]
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        first = _ingest(repos, settings, http, anns)
+        assert (first.downloaded, first.persisted, first.skipped_known_url) == (2, 2, 0)
+
+        again = _ingest(repos, settings, http, [*anns, _ann(3)])
+        assert sorted(http.downloads) == sorted([a.pdf_url for a in anns] + [_ann(3).pdf_url])
+        assert (again.skipped_known_url, again.requests_saved, again.downloaded) == (2, 2, 1)
+        assert again.bytes_saved == sum(len(http._body(a.pdf_url)) for a in anns)
+        assert http.heads == []
+
+
+def test_revalidated_urls_are_downloaded_again_only_when_changed(settings):
+    settings = replace(settings, filings_revalidate_urls=True)
+    http = FakeHttp()
+    anns = [_ann(1), _ann(2)]
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        _ingest(repos, settings, http, anns)
+        http.downloads.clear()
+
+        http.versions[_ann(2).pdf_url] = 2
+        stats = _ingest(repos, settings, http, anns)
+        assert sorted(http.heads) == [a.pdf_url for a in anns]
+        assert http.downloads == [_ann(2).pdf_url]
+        assert (stats.skipped_known_url, stats.downloaded, stats.persisted) == (1, 1, 1)
+        assert repos.get_pdf_url_index(_ann(2).pdf_url)["etag"] == '"2"'
+
+
+class GatedHttp(FakeHttp):
+    """Holds the first attachment's download until `release` is set; `broken` URLs fail."""
+
+    def __init__(self, slow: str, broken: str):
+        super().__init__()
+        self.slow, self.broken = slow, broken
+        self.release = threading.Event()
+        self.released_in_time = None
+
+    def download(self, url, dst_dir, *, suffix=".pdf", headers=None):
+        if url == self.broken:
+            raise RuntimeError("DOWNLOAD failed after 3 retries")
+        if url == self.slow:
+            self.released_in_time = self.release.wait(5)
+        return super().download(url, dst_dir, suffix=suffix, headers=headers)
+
+
+def test_extraction_starts_while_downloads_are_pending_and_failures_are_isolated(settings, monkeypatch):
+    anns = [_ann(n) for n in range(1, 5)]
+    http = GatedHttp(slow=anns[0].pdf_url, broken=anns[2].pdf_url)
+    extracted: list[str] = []
+
+    def text(pdf_path, *, backend, max_pages=None, max_chars=None):
+        url = pdf_path.read_text().split()[0]
+        extracted.append(url)
+        if url == anns[3].pdf_url:
+            raise ValueError("PdfReadError: EOF marker not found")
+        # The slow download finishes only once another attachment has been extracted.
+        http.release.set()
+        return _fake_text(pdf_path, backend=backend)
+
+    monkeypatch.setattr(filings, "extract_pdf_text", text)
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        run = repos.create_run("BEL")
+        stats = filings.ingest_filings(
+            repos=repos,
+            settings=replace(settings, filings_download_concurrency=4, filings_cpu_workers=2),
+            http=http,
+            provider=FakeBse(anns),
+            run_id=run.id,
+            symbol="BEL",
+            scrip_code="500049",
+            from_date=date(2026, 9, 1),
+            to_date=date(2026, 10, 1),
+        )
+
+        assert http.released_in_time
+        assert extracted.index(anns[1].pdf_url) < extracted.index(anns[0].pdf_url)
+        assert (stats.fetched, stats.downloaded, stats.persisted) == (4, 3, 2)
+        titles = {f["title"] for f in repos.list_filings("BEL", "2026-01-01", "2026-12-31")}
+        assert titles == {anns[0].title, anns[1].title}
+        errors = [log["message"] for log in repos.get_run(run.id)["logs"] if log["level"] == "ERROR"]
+        assert sorted(errors) == [
+            f"Filing ingest failed: {anns[2].title} (DOWNLOAD failed after 3 retries)",
+            f"Filing ingest failed: {anns[3].title} (PdfReadError: EOF marker not found)",
+        ]
+
+
+def test_failed_revalidation_keeps_the_known_copy(settings):
+    settings = replace(settings, filings_revalidate_urls=True)
+
+    class NoHeadHttp(FakeHttp):
+        def head(self, url, *, headers=None):
+            request = httpx.Request("HEAD", url)
+            raise httpx.HTTPStatusError("405 Method Not Allowed", request=request, response=httpx.Response(405))
+
+    http = NoHeadHttp()
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        _ingest(repos, settings, http, [_ann(1)])
+        http.downloads.clear()
+
+        stats = _ingest(repos, settings, http, [_ann(1)])
+        assert (stats.skipped_known_url, stats.downloaded) == (1, 0)
+        assert http.downloads == []
+        assert conn.execute("SELECT COUNT(*) FROM run_logs WHERE level='ERROR'").fetchone()[0] == 0
+
+
+def test_full_text_is_extracted_once_and_recorded(settings, monkeypatch):
+    settings = replace(settings, text_cache_enabled=True, pdf_text_page_budget=1)
+    pages = (_TEXT, _TEXT, "")
+    calls: list[int | None] = []
+
+    def text(pdf_path, *, backend, max_pages=None, max_chars=None):
+        calls.append(max_pages)
+        got = pages[:max_pages] if max_pages else pages
+        return PdfTextResult(text="\n".join(got), pages=len(got), page_texts=got, complete=max_pages is None)
+
+    def fake_ocr(pdf_path, *, lang, max_pages, dpi, workers, pages):
+        return OcrResult(text="", pages_ocr=1, engine_version="5.3.0", pages=(OcrPage(3, "ocr 3", 0.0, 0.0),))
+
+    monkeypatch.setattr(filings, "extract_pdf_text", text)
+    monkeypatch.setattr(filings, "ocr_pdf", fake_ocr)
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        _ingest(repos, settings, FakeHttp(), [_ann(1)])
+        (filing,) = repos.list_filings("BEL", "2026-01-01", "2026-12-31")
+        assert (filing["text_complete"], filing["text_source"]) == (0, "pdf_text")
+
+        full = filings.materialize_full_text(repos=repos, settings=settings, filing_id=filing["id"])
+        assert full["text"].endswith("ocr 3")
+        stored = repos.get_filing(filing["id"])
+        assert (stored["text_complete"], stored["text_source"], stored["ocr_page_list"]) == (1, "mixed", "[3]")
+        assert calls == [1, None]
+
+        # Another copy of the same bytes needing the full text is served from the text cache.
+        conn.execute("UPDATE filing_artifacts SET text_complete=0")
+        again = filings.materialize_full_text(repos=repos, settings=settings, filing_id=filing["id"])
+        assert again["text"] == full["text"]
+        assert calls == [1, None]
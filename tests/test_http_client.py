@@ -0,0 +1,58 @@
+import hashlib
+
+import httpx
+import pytest
+
+from ims.providers.http import HttpClient
+
+
+def _client(handler) -> HttpClient:
+    return HttpClient(timeout_s=5.0, retries=1, user_agent="test", transport=httpx.MockTransport(handler))
+
+
+def test_get_text_reuses_pooled_client():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["User-Agent"])
+        return httpx.Response(200, text="ok")
+
+    http = _client(handler)
+    first = http.client
+    assert http.get_text("https://example.test/a") == "ok"
+    assert http.get_text("https://example.test/b") == "ok"
+    assert http.client is first
+    assert seen == ["test", "test"]
+
+
+def test_close_drops_client():
+    http = _client(lambda request: httpx.Response(200, text="ok"))
+    first = http.client
+    http.close()
+    assert http.client is not first
+    http.close()
+
+
+def test_download_hashes_while_streaming(tmp_path):
+    body = b"%PDF-1.4 fake" * 1000
+    http = _client(lambda request: httpx.Response(200, content=body, headers={"etag": '"v1"'}))
+    got = http.download("https://example.test/x.pdf", tmp_path)
+    digest = hashlib.sha256(body).hexdigest()
+    assert got.sha256 == digest
+    assert got.size == len(body)
+    assert got.etag == '"v1"'
+    assert got.path == tmp_path / f"{digest}.pdf"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{digest}.pdf"]
+
+
+def test_head_client_errors_are_not_retried():
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(405)
+
+    http = HttpClient(timeout_s=5.0, retries=3, user_agent="test", transport=httpx.MockTransport(handler))
+    with pytest.raises(httpx.HTTPStatusError):
+        http.head("https://example.test/x.pdf")
+    assert calls == ["HEAD"]
@@ -0,0 +1,114 @@
+import pytest
+
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+
+def _headline(repos: Repos, n: int, published_at: str | None, score: float) -> bool:
+    return repos.upsert_headline(
+        headline_id=f"h{n}",
+        symbol="BEL",
+        published_at=published_at,
+        source="Mint",
+        title=f"headline {n}",
+        url=f"https://example.test/{n}",
+        mood_score=score,
+        confidence=0.5,
+    )
+
+
+def _mood(repos: Repos) -> list[tuple]:
+    return [
+        (r["date"], r["mood_count"], r["mood_pos"], r["mood_neg"], round(r["mood_avg"], 6))
+        for r in repos.list_mood_daily("BEL", "2026-01-01", "2026-12-31")
+    ]
+
+
+def test_mood_daily_is_incremental_and_matches_rebuild(tmp_path):
+    init_db(tmp_path / "ims.db")
+    with connect(tmp_path / "ims.db") as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        # First refresh.
+        _headline(repos, 1, "2026-10-01T04:00:00+00:00", 0.5)
+        _headline(repos, 2, "2026-10-01T05:00:00+00:00", -0.25)
+        # Later refresh: one old headline again (unchanged), one rescored and moved, one new.
+        changes = conn.total_changes
+        assert not _headline(repos, 1, "2026-10-01T04:00:00+00:00", 0.5)
+        assert conn.total_changes == changes
+        assert _headline(repos, 2, "2026-10-02T01:00:00+05:30", 0.1)
+        _headline(repos, 3, "2026-10-01T09:00:00+00:00", 0.0)
+        _headline(repos, 4, None, 0.9)
+
+        assert _mood(repos) == [("2026-10-01", 3, 2, 0, round(0.6 / 3, 6))]
+        incremental = _mood(repos)
+        repos.rebuild_mood_rollups("BEL")
+        assert _mood(repos) == incremental
+
+
+def test_migration_rebuilds_mood_daily(tmp_path):
+    db = tmp_path / "ims.db"
+    init_db(db)
+    with connect(db) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        _headline(repos, 1, "2026-10-01T04:00:00+00:00", 0.5)
+        _headline(repos, 2, "2026-10-01T05:00:00+00:00", 0.3)
+        conn.execute("ALTER TABLE mood_daily DROP COLUMN mood_sum")
+        conn.execute("UPDATE mood_daily SET mood_count=1, mood_avg=0.3")
+
+    init_db(db)
+    with connect(db) as conn:
+        assert _mood(Repos(conn)) == [("2026-10-01", 2, 2, 0, 0.4)]
+
+
+def test_hourly_weekly_rollups_and_weighted_average(tmp_path):
+    init_db(tmp_path / "ims.db")
+    with connect(tmp_path / "ims.db") as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        for n, (ts, score, conf) in enumerate(
+            [
+                ("2026-10-04T23:30:00+00:00", 0.6, 1.0),  # Sunday -> week of 2026-09-28
+                ("2026-10-05T04:10:00+00:00", 0.4, 0.5),  # Monday
+                ("2026-10-05T04:50:00+00:00", -0.2, 0.5),
+            ]
+        ):
+            repos.upsert_headline(
+                headline_id=f"h{n}", symbol="BEL", published_at=ts, source="Mint", title=f"t{n}",
+                url=f"https://example.test/{n}", mood_score=score, confidence=conf,
+            )
+
+        hourly = repos.list_mood("BEL", "2026-10-05", "2026-10-05", "hour")
+        assert [(r["bucket"], r["mood_count"]) for r in hourly] == [("2026-10-05T04:00:00", 2)]
+        assert round(hourly[0]["mood_wavg"], 6) == 0.1
+
+        weekly = repos.list_mood("BEL", "2026-09-01", "2026-10-31", "week")
+        assert [(r["bucket"], r["mood_count"]) for r in weekly] == [("2026-09-28", 1), ("2026-10-05", 2)]
+
+        before = {res: repos.list_mood("BEL", "2026-09-01", "2026-10-31", res) for res in ("hour", "day", "week")}
+        repos.rebuild_mood_rollups()
+        assert {res: repos.list_mood("BEL", "2026-09-01", "2026-10-31", res) for res in before} == before
+
+
+def test_headline_upsert_and_rollups_commit_together(tmp_path, monkeypatch):
+    init_db(tmp_path / "ims.db")
+    with connect(tmp_path / "ims.db", autocommit=True) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("rollup write failed")
+
+        monkeypatch.setattr(Repos, "_apply_mood_delta", fail)
+        with pytest.raises(RuntimeError):
+            _headline(repos, 1, "2026-10-01T04:00:00+00:00", 0.5)
+        monkeypatch.undo()
+        assert conn.execute("SELECT COUNT(*) FROM news_headlines").fetchone()[0] == 0
+
+        # Retrying counts the headline once; another connection adding it again changes nothing.
+        assert _headline(repos, 1, "2026-10-01T04:00:00+00:00", 0.5)
+        with connect(tmp_path / "ims.db", autocommit=True) as other:
+            assert not _headline(Repos(other), 1, "2026-10-01T04:00:00+00:00", 0.5)
+        assert _mood(repos) == [("2026-10-01", 1, 1, 0, 0.5)]
+        assert not conn.in_transaction
@@ -0,0 +1,113 @@
+import urllib.parse
+from dataclasses import replace
+
+import httpx
+
+from ims.core.settings import Settings
+from ims.pipelines import news
+from ims.providers.http import HttpClient
+from ims.providers.news import GoogleNewsRssProvider, canonical_url
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+_MARKET = ("BEL, HAL rally as defence stocks surge", "https://example.test/markets/rally?utm_source=gn")
+
+
+def _rss(items) -> str:
+    entries = "".join(
+        f"<item><title>{t}</title><link>{u.replace('&', '&amp;')}</link>"
+        "<pubDate>Mon, 05 Oct 2026 04:00:00 GMT</pubDate></item>"
+        for t, u in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>q</title>{entries}</channel></rss>'
+
+
+def test_canonical_url():
+    assert canonical_url("HTTPS://Example.test/a/?utm_medium=x&id=7&oc=5#top") == "https://example.test/a?id=7"
+
+
+def test_batch_dedupes_across_symbols_and_scores_once(tmp_path, monkeypatch):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    feeds = {
+        "BEL": [_MARKET, ("BEL wins order", "https://example.test/bel"), ("Sensex ends flat", "https://example.test/mkt")],
+        "HAL": [(_MARKET[0], "https://example.test/markets/rally?oc=5"), ("HAL profit beats", "https://example.test/hal")],
+    }
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        q = urllib.parse.parse_qs(request.url.query.decode())["q"][0]
+        requests.append(q)
+        return httpx.Response(200, text=_rss(feeds[q.split()[0]]))
+
+    scored: list[str] = []
+    real = news.score_headlines
+
+    def counting(titles):
+        titles = list(titles)
+        scored.extend(titles)
+        return real(titles)
+
+    monkeypatch.setattr(news, "score_headlines", counting)
+    http = HttpClient(timeout_s=5, retries=1, user_agent="t", transport=httpx.MockTransport(handler))
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        for sym in feeds:
+            repos.upsert_company(sym, sym)
+        run_ids = {sym: repos.create_run(sym).id for sym in feeds}
+        result = news.ingest_news_batch(
+            repos=repos,
+            settings=settings,
+            provider=GoogleNewsRssProvider(http=http, settings=settings),
+            companies=[{"symbol": s, "name": s} for s in feeds],
+            run_ids=run_ids,
+        )
+        assert sorted(requests) == ["BEL BEL stock", "HAL HAL stock"]
+        assert (result.items, result.unique_headlines) == (5, 4)
+        # The market wrap mentions neither company: dropped before scoring.
+        assert len(scored) == 3
+        assert result.stats["BEL"].dropped_irrelevant == 1
+        assert result.stats["HAL"].persisted == 2
+        hal_urls = {h["url"] for h in repos.list_headlines("HAL", "2026-10-01", "2026-10-31")}
+        assert canonical_url(_MARKET[1]) in hal_urls
+
+
+def test_batch_then_single_ingest_store_one_row_per_article(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    story = "BEL bags Rs 500 crore defence order"
+    feeds = {
+        "batch": [(story, "https://example.test/bel-order?oc=5")],
+        "single": [(story, "https://example.test/bel-order/?utm_source=gn&utm_medium=rss")],
+    }
+    current = ["batch"]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=_rss(feeds[current[0]]))
+
+    http = HttpClient(timeout_s=5, retries=1, user_agent="t", transport=httpx.MockTransport(handler))
+    provider = GoogleNewsRssProvider(http=http, settings=settings)
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics Ltd")
+        run_id = repos.create_run("BEL").id
+        news.ingest_news_batch(
+            repos=repos,
+            settings=settings,
+            provider=provider,
+            companies=[{"symbol": "BEL", "name": "Bharat Electronics Ltd"}],
+            run_ids={"BEL": run_id},
+        )
+        current[0] = "single"
+        news.ingest_news(
+            repos=repos,
+            settings=replace(settings, news_dedupe_enabled=False),
+            run_id=run_id,
+            symbol="BEL",
+            company_name="Bharat Electronics Ltd",
+            provider=provider,
+            lookback_days=7,
+        )
+        rows = repos.list_headlines("BEL", "2026-10-01", "2026-10-31")
+        assert [r["url"] for r in rows] == ["https://example.test/bel-order"]
+        assert [m["mood_count"] for m in repos.list_mood("BEL", "2026-10-01", "2026-10-31")] == [1]
@@ -0,0 +1,46 @@
+from dataclasses import replace
+
+from ims.core.settings import Settings
+from ims.pipelines.news import ingest_news
+from ims.providers.news import NewsItem
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+
+class _Provider:
+    def __init__(self, items):
+        self.items = items
+
+    def search(self, query, *, limit=30):
+        return self.items
+
+
+def _item(n: int, title: str, published_at: str) -> NewsItem:
+    return NewsItem(published_at=published_at, source="src", title=title, url=f"https://example.test/{n}")
+
+
+def test_near_duplicates_collapse_into_one_story(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    items = [
+        _item(1, "BEL wins Rs 500 crore order from Indian Army - Economic Times", "2026-10-05T04:00:00+00:00"),
+        _item(2, "BEL bags Rs 500 crore order from Indian Army - Mint", "2026-10-05T06:00:00+00:00"),
+        _item(3, "BEL wins Rs 300 crore order from Indian Navy", "2026-10-05T07:00:00+00:00"),
+        # Same story again, but outside the 48h window: a new story.
+        _item(4, "BEL wins Rs 500 crore order from Indian Army", "2026-10-09T04:00:00+00:00"),
+    ]
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        run_id = repos.create_run("BEL").id
+        for _ in range(2):  # the second refresh sees the same feed again
+            stats = ingest_news(
+                repos=repos, settings=settings, run_id=run_id, symbol="BEL", company_name="Bharat Electronics",
+                provider=_Provider(items), lookback_days=30,
+            )
+        assert (stats.persisted, stats.duplicates) == (3, 1)
+
+        stored = {h["url"]: h["cluster_size"] for h in repos.list_headlines("BEL", "2026-10-01", "2026-10-31")}
+        assert stored == {"https://example.test/1": 2, "https://example.test/3": 1, "https://example.test/4": 1}
+        day = repos.list_mood("BEL", "2026-10-05", "2026-10-05")
+        assert day[0]["mood_count"] == 2
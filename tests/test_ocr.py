@@ -0,0 +1,103 @@
+from dataclasses import replace
+from pathlib import Path
+
+from ims.core.settings import Settings
+from ims.pipelines import filings
+from ims.services import ocr
+from ims.services.ocr import OcrPage, OcrResult
+from ims.services.pdf_text import PdfTextResult
+from ims.services.workers import CpuPool
+
+_PAGE = "The Board of Directors approved the audited financial results for the quarter. " * 2
+
+
+def _fake_pages(monkeypatch, total: int) -> list[int]:
+    seen: list[int] = []
+    monkeypatch.setattr(ocr, "pdfinfo_from_path", lambda path: {"Pages": total})
+
+    def page(pdf_path, n, *, lang, dpi):
+        seen.append(n)
+        return OcrPage(page=n, text=f"page {n}", raster_ms=0.0, ocr_ms=0.0)
+
+    monkeypatch.setattr(ocr, "_ocr_page", page)
+    return seen
+
+
+def test_ocr_pdf_pages_through_the_selection_within_the_budget(monkeypatch):
+    seen = _fake_pages(monkeypatch, total=10)
+    first = ocr.ocr_pdf(Path("x.pdf"), lang="eng", max_pages=3)
+    assert [p.page for p in first.pages] == [1, 2, 3]
+
+    seen.clear()
+    # Out-of-range and repeated pages are dropped; the budget keeps the lowest page numbers.
+    picked = ocr.ocr_pdf(Path("x.pdf"), lang="eng", max_pages=3, workers=3, pages=[9, 2, 2, 15, 4, 7])
+    assert [p.page for p in picked.pages] == [2, 4, 7]
+    assert sorted(seen) == [2, 4, 7]
+    assert picked.text == "page 2\npage 4\npage 7"
+    assert (picked.pages_ocr, picked.total_pages) == (3, 10)
+
+
+def _extract_with(monkeypatch, page_texts: list[str], total_pages: int | None = None, **overrides):
+    total = len(page_texts) if total_pages is None else total_pages
+    calls: list[dict] = []
+
+    def text(pdf_path, *, backend, max_pages=None, max_chars=None):
+        return PdfTextResult(text="\n".join(page_texts), pages=len(page_texts), page_texts=tuple(page_texts))
+
+    def fake_ocr(pdf_path, *, lang, max_pages, dpi, workers, pages):
+        calls.append({"max_pages": max_pages, "pages": list(pages)})
+        done = sorted(n for n in pages if n <= total)[:max_pages]
+        return OcrResult(
+            text="",
+            pages_ocr=len(done),
+            engine_version="5.3.0",
+            pages=tuple(OcrPage(page=n, text=f"ocr {n}", raster_ms=0.0, ocr_ms=0.0) for n in done),
+            total_pages=total,
+        )
+
+    monkeypatch.setattr(filings, "get_cpu_pool", lambda s: CpuPool(0, task_timeout_s=5))
+    monkeypatch.setattr(filings, "extract_pdf_text", text)
+    monkeypatch.setattr(filings, "ocr_pdf", fake_ocr)
+    settings = replace(Settings(), pdf_text_min_chars=250, pdf_page_text_min_chars=40, **overrides)
+    return filings._extract(settings=settings, pdf_path=Path("x.pdf"), extractor="pypdf2"), calls
+
+
+def test_only_pages_without_a_usable_text_layer_are_ocred(monkeypatch):
+    pages = [_PAGE, "", _PAGE, "���� ~~~~ ���� ~~~~ ���� ~~~~ ��", _PAGE]
+    extracted, calls = _extract_with(monkeypatch, pages)
+    assert calls == [{"max_pages": Settings().ocr_max_pages, "pages": [2, 4]}]
+    assert extracted.ocr_page_list == [2, 4]
+    assert (extracted.text_source, extracted.ocr_truncated) == ("mixed", False)
+    assert extracted.text.split("\n")[1::2] == ["ocr 2", "ocr 4"]
+
+
+def test_text_free_document_is_ocred_from_the_first_page_up_to_the_budget(monkeypatch):
+    extracted, calls = _extract_with(monkeypatch, ["", " ", "", "", ""], ocr_max_pages=2)
+    assert calls == [{"max_pages": 2, "pages": [1, 2, 3, 4, 5]}]
+    assert extracted.ocr_page_list == [1, 2]
+    assert extracted.text == "ocr 1\nocr 2"
+    # Every page came from OCR; the budget cut-off is reported on its own.
+    assert (extracted.text_source, extracted.ocr_truncated) == ("ocr", True)
+
+
+def test_ocr_budget_cut_off_on_a_partly_scanned_document(monkeypatch):
+    extracted, _ = _extract_with(monkeypatch, [_PAGE, "", "", "", _PAGE], ocr_max_pages=2)
+    assert extracted.ocr_page_list == [2, 3]
+    assert (extracted.text_source, extracted.ocr_truncated) == ("mixed", True)
+
+
+def test_pdf_without_text_layer_pages_is_ocred_up_to_the_budget(monkeypatch):
+    extracted, calls = _extract_with(monkeypatch, [], total_pages=20, ocr_max_pages=3)
+    assert calls == [{"max_pages": 3, "pages": [1, 2, 3]}]
+    assert extracted.text == "ocr 1\nocr 2\nocr 3"
+    assert (extracted.text_source, extracted.ocr_truncated) == ("ocr", True)
+
+    short, _ = _extract_with(monkeypatch, [], total_pages=2, ocr_max_pages=3)
+    assert (short.text, short.ocr_page_list, short.ocr_truncated) == ("ocr 1\nocr 2", [1, 2], False)
+
+
+def test_clean_text_layer_skips_ocr(monkeypatch):
+    extracted, calls = _extract_with(monkeypatch, [_PAGE] * 4)
+    assert calls == []
+    assert (extracted.text_source, extracted.ocr_page_list, extracted.engine_version) == ("pdf_text", [], None)
+    assert not extracted.ocr_truncated
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+from ims.services.ollama import OllamaClient
+
+
+def _client(handler, **kw) -> OllamaClient:
+    return OllamaClient(base_url="http://ollama.test", model="m", transport=httpx.MockTransport(handler), **kw)
+
+
+def test_summary_is_cached_per_prompt():
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content)["prompt"])
+        return httpx.Response(200, json={"response": "Board approved a dividend.\n"})
+
+    c = _client(handler)
+    assert c.summarize_one_sentence(title="t", text="x") == "Board approved a dividend."
+    assert c.summarize_one_sentence(title="t", text="x") == "Board approved a dividend."
+    c.summarize_one_sentence(title="t", text="y")
+    assert len(calls) == 2
+    assert (c.hits, c.misses) == (1, 2)
+
+
+def test_concurrency_is_capped():
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.02)
+        with lock:
+            state["now"] -= 1
+        return httpx.Response(200, json={"response": "ok"})
+
+    c = _client(handler, max_concurrency=2)
+    items = [("t", f"text {i}") for i in range(8)]
+    out = asyncio.run(c.asummarize_many(items))
+    assert out == ["ok"] * 8
+    assert state["peak"] <= 2
+
+
+def test_summarize_many_returns_failures_in_place():
+    def handler(request: httpx.Request) -> httpx.Response:
+        ok = "good" in json.loads(request.content)["prompt"]
+        return httpx.Response(200, json={"response": "fine" if ok else ""})
+
+    out = _client(handler).summarize_many([("a", "good"), ("b", "bad")])
+    assert out[0] == "fine"
+    assert isinstance(out[1], RuntimeError)
@@ -0,0 +1,51 @@
+import pytest
+
+from ims.services import pdf_text
+from ims.services.pdf_text import extract_pdf_text, page_needs_ocr, resolve_backend
+
+
+def test_page_needs_ocr_empty_or_short():
+    assert page_needs_ocr("", min_chars=40)
+    assert page_needs_ocr("   Page 3  ", min_chars=40)
+
+
+def test_page_needs_ocr_garbage_text_layer():
+    assert page_needs_ocr("\x01\x02�� ~~~ ### @@@ ^^^ " * 5, min_chars=40)
+
+
+def test_page_with_real_text_skips_ocr():
+    assert not page_needs_ocr("The Board approved a final dividend of ₹5 per share for FY24. " * 2, min_chars=40)
+
+
+def test_resolve_backend():
+    assert resolve_backend("pypdf2").name == "pypdf2"
+    assert resolve_backend("auto").available()
+    with pytest.raises(ValueError):
+        resolve_backend("nope")
+
+
+class _CountingBackend:
+    name = "counting"
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.read = 0
+
+    def available(self):
+        return True
+
+    def iter_pages(self, pdf_path, *, last_page=None):
+        for text in self.pages[:last_page]:
+            self.read += 1
+            yield text
+
+
+def test_extract_stops_at_budget(monkeypatch):
+    backend = _CountingBackend(["x" * 100] * 50)
+    monkeypatch.setitem(pdf_text.BACKENDS, "counting", backend)
+
+    res = extract_pdf_text("doc.pdf", backend="counting", max_pages=10, max_chars=250)
+    assert (res.pages, backend.read, res.complete) == (3, 3, False)
+
+    full = extract_pdf_text("doc.pdf", backend="counting")
+    assert (full.pages, full.complete) == (50, True)
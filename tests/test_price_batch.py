@@ -0,0 +1,164 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from ims.core.settings import Settings
+from ims.pipelines.price import ingest_prices_batch
+from ims.providers.price import YahooPriceProvider
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+_INDEX = pd.date_range("2026-10-05", periods=3, freq="D", tz="Asia/Kolkata", name="Date")
+
+
+def _bars(base: float) -> pd.DataFrame:
+    close = base + np.arange(3.0)
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Adj Close": close, "Close": close, "Volume": 1000.0},
+        index=_INDEX,
+    )
+
+
+class FakeYf:
+    """Knows BEL/HAL/LT on NSE and KEI only on BSE."""
+
+    listed = {"BEL.NS": 100.0, "HAL.NS": 200.0, "LT.NS": 300.0, "KEI.BO": 400.0}
+
+    def __init__(self):
+        self.downloads: list[list[str]] = []
+        self.histories: list[str] = []
+
+    def download(self, tickers, **kwargs):
+        assert kwargs["group_by"] == "ticker" and kwargs["ignore_tz"] is False
+        self.downloads.append(list(tickers))
+        frames = {t: _bars(self.listed[t]) for t in tickers if t in self.listed}
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    def Ticker(self, ticker):  # noqa: N802 (yfinance API)
+        fake = self
+
+        class _T:
+            def history(self, **kwargs):
+                fake.histories.append(ticker)
+                return _bars(fake.listed[ticker]) if ticker in fake.listed else pd.DataFrame()
+
+        return _T()
+
+
+def test_batch_downloads_in_chunks_and_falls_back_for_missing(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    yf = FakeYf()
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        for sym in ("BEL", "HAL", "LT", "KEI", "NOPE"):
+            repos.upsert_company(sym, sym)
+        result = ingest_prices_batch(
+            repos=repos,
+            provider=YahooPriceProvider(yf=yf),
+            symbols=["BEL", "HAL", "LT", "KEI", "NOPE"],
+            lookback_days=90,
+            chunk_size=2,
+        )
+        assert yf.downloads == [["BEL.NS", "HAL.NS"], ["LT.NS", "KEI.NS"], ["NOPE.NS"]]
+        # Only tickers missing from the batch are fetched one by one, without retrying `.NS`.
+        assert yf.histories == ["KEI.BO", "NOPE.BO", "NOPE"]
+        assert (result.requests, result.fallbacks) == (3, 2)
+        assert {s: st.bars for s, st in result.stats.items()} == {"BEL": 3, "HAL": 3, "LT": 3, "KEI": 3}
+        assert set(result.errors) == {"NOPE"}
+        hal = repos.list_prices("HAL", "2026-10-01", "2026-10-31")
+        assert [r["close"] for r in hal] == [200.0, 201.0, 202.0]
+        assert hal[0]["ts"] == "2026-10-05T00:00:00+05:30"
+
+
+def test_resolved_tickers_are_cached_and_re_resolved_on_failure(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    yf = FakeYf()
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        for sym in ("BEL", "KEI"):
+            repos.upsert_company(sym, sym)
+
+        def run():
+            yf.downloads.clear()
+            yf.histories.clear()
+            return ingest_prices_batch(
+                repos=repos, provider=YahooPriceProvider(yf=yf), symbols=["BEL", "KEI"], lookback_days=90
+            )
+
+        run()
+        assert repos.get_yahoo_tickers(["BEL", "KEI"], max_age_days=30) == {"BEL": "BEL.NS", "KEI": "KEI.BO"}
+
+        # The cached ticker goes straight into the batch: no failed `.NS` attempt, no fallback.
+        assert run().fallbacks == 0
+        assert yf.downloads == [["BEL.NS", "KEI.BO"]] and yf.histories == []
+
+        # KEI moves to NSE: the cached ticker fails, the candidates are retried and the cache updated.
+        yf.listed = {**FakeYf.listed, "KEI.NS": 400.0}
+        del yf.listed["KEI.BO"]
+        assert run().fallbacks == 1
+        assert yf.histories == ["KEI.NS"]
+        assert repos.get_yahoo_tickers(["KEI"], max_age_days=30) == {"KEI": "KEI.NS"}
+
+        # Entries older than the TTL are ignored.
+        conn.execute("UPDATE yahoo_tickers SET resolved_at=datetime('now', '-40 days')")
+        assert repos.get_yahoo_tickers(["BEL", "KEI"], max_age_days=30) == {}
+
+
+class DailyYf:
+    """One bar per calendar day up to today; `factor` re-bases the whole history (e.g. a split)."""
+
+    def __init__(self):
+        self.factor = 1.0
+        self.periods: list[str] = []
+
+    def _bars(self, period: str) -> pd.DataFrame:
+        self.periods.append(period)
+        days = int(period.rstrip("d"))
+        index = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq="D", tz="Asia/Kolkata")
+        close = np.array([100.0 + d.toordinal() % 10 for d in index]) * self.factor
+        return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0}, index=index)
+
+    def download(self, tickers, *, period, **kwargs):
+        return pd.concat({t: self._bars(period) for t in tickers}, axis=1)
+
+    def Ticker(self, ticker):  # noqa: N802 (yfinance API)
+        fake = self
+
+        class _T:
+            def history(self, *, period, **kwargs):
+                return fake._bars(period)
+
+        return _T()
+
+
+def test_incremental_fetch_and_full_refetch_on_rebase(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    yf = DailyYf()
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "BEL")
+
+        def run(**kwargs):
+            yf.periods.clear()
+            result = ingest_prices_batch(
+                repos=repos, provider=YahooPriceProvider(yf=yf), symbols=["BEL"], lookback_days=60, **kwargs
+            )
+            return result.stats["BEL"]
+
+        assert (run().bars, yf.periods) == (60, ["60d"])
+        # Only the overlap before the last stored bar is re-read.
+        stats = run(overlap_days=3)
+        assert (stats.bars, stats.full_refresh, yf.periods) == (3, False, ["3d"])
+
+        # Re-read closes no longer match: the whole stored history is fetched again and replaced.
+        yf.factor = 0.5
+        stats = run(overlap_days=3)
+        assert (stats.bars, stats.full_refresh, yf.periods) == (60, True, ["3d", "60d"])
+        closes = [r["close"] for r in repos.list_prices("BEL", "2000-01-01", "2100-01-01")]
+        assert len(closes) == 60 and max(closes) < 60
+
+        assert run(full_refresh=True).period_days == 60
@@ -0,0 +1,45 @@
+import math
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from ims.core.settings import Settings
+from ims.providers.price import price_columns
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+
+def _frame(index: pd.DatetimeIndex) -> pd.DataFrame:
+    n = len(index)
+    close = np.linspace(100.0, 120.0, n)
+    close[1] = np.nan
+    return pd.DataFrame(
+        {"Open": close - 1, "High": close + 1, "Low": close - 2, "Close": close, "Volume": np.arange(n) * 10.0},
+        index=index,
+    )
+
+
+def test_timestamps_match_isoformat():
+    for index in (
+        pd.date_range("2024-01-01", periods=30, freq="D", tz="Asia/Kolkata", name="Date"),
+        pd.date_range("2026-03-06 09:30", periods=5, freq="D", tz="America/New_York"),
+        pd.date_range("2026-03-07", periods=3, freq="h"),
+    ):
+        expected = [(t if t.tzinfo else t.tz_localize("UTC")).isoformat() for t in index]
+        assert price_columns(_frame(index)).ts.tolist() == expected
+
+
+def test_upsert_price_columns_roundtrip(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    cols = price_columns(_frame(pd.date_range("2026-10-01", periods=5, freq="D", tz="Asia/Kolkata")))
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics Ltd")
+        assert repos.upsert_price_columns("bel", cols) == 5
+        assert repos.upsert_price_columns("BEL", cols) == 5
+        rows = repos.list_prices("BEL", "2026-09-30", "2026-10-31")
+    assert [r["ts"] for r in rows] == cols.ts.tolist()
+    assert rows[1]["close"] is None and rows[1]["open"] is None
+    assert math.isclose(rows[0]["close"], 100.0) and rows[4]["volume"] == 40.0
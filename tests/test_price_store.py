@@ -0,0 +1,121 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ims.core.settings import Settings
+from ims.providers.price import price_columns
+from ims.storage.db import connect, init_db
+from ims.storage.price_store import PriceStore
+from ims.storage.repos import Repos
+
+
+def _cols(start: str, periods: int, freq: str, base: float = 100.0):
+    index = pd.date_range(start, periods=periods, freq=freq, tz="Asia/Kolkata")
+    close = base + np.arange(periods, dtype=float)
+    if periods > 3:
+        close[3] = np.nan
+    return price_columns(
+        pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0}, index=index)
+    )
+
+
+def _stored_bars(store: PriceStore, symbol: str) -> int:
+    return len(store.read(symbol, 0, 2**40))
+
+
+def test_store_matches_sqlite_reads(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    store = PriceStore(tmp_path / "prices")
+    with connect(settings.db_path) as conn:
+        plain = Repos(conn)
+        stored = Repos(conn, price_store=store)
+        plain.upsert_company("BEL", "BEL")
+        stored.upsert_price_columns("BEL", _cols("2025-11-20", 90, "D"))
+        # Overlapping re-write: later values win, no duplicate bars.
+        stored.upsert_price_columns("BEL", _cols("2026-02-10", 10, "D", base=500.0))
+        assert sorted(p.name for p in (tmp_path / "prices" / "BEL").iterdir()) == [
+            "2025-11.npy",
+            "2025-12.npy",
+            "2026-01.npy",
+            "2026-02.npy",
+        ]
+        for lo, hi in (("2025-11-01", "2026-03-01"), ("2025-12-15", "2026-01-10"), ("2026-02-12", "2026-02-12")):
+            assert stored.list_prices("BEL", lo, hi) == plain.list_prices("BEL", lo, hi)
+        assert stored.list_prices("BEL", "2027-01-01", "2027-12-31") == []
+
+        # Replacing the history (after a split) replaces the store too.
+        stored.replace_price_columns("BEL", _cols("2026-01-05", 5, "D", base=50.0))
+        assert [r["close"] for r in stored.list_prices("BEL", "2025-01-01", "2026-12-31")] == [
+            50.0,
+            51.0,
+            52.0,
+            None,
+            54.0,
+        ]
+
+
+def test_range_read_is_a_view_within_one_month(tmp_path):
+    store = PriceStore(tmp_path)
+    store.upsert("HAL", _cols("2026-03-02 09:15", 300, "min"))
+    start = int(pd.Timestamp("2026-03-02 04:00", tz="UTC").timestamp())
+    bars = store.read("HAL", start, start + 3600)
+    # Single-month reads slice the memory-mapped file without copying.
+    assert len(bars) == 60 and isinstance(bars, np.memmap)
+    assert np.all(np.diff(bars["epoch"]) == 60)
+
+
+def test_enable_refresh_then_read_serves_full_history(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    store = PriceStore(tmp_path / "prices")
+    with connect(settings.db_path) as conn:
+        plain = Repos(conn)
+        plain.upsert_company("BEL", "BEL")
+        plain.upsert_price_columns("BEL", _cols("2026-07-01", 91, "D"))
+
+        # Store enabled without a backfill; an incremental refresh writes only the last bars.
+        stored = Repos(conn, price_store=store)
+        stored.upsert_price_columns("BEL", _cols("2026-09-25", 5, "D", base=190.0))
+        expected = plain.list_prices("BEL", "2026-01-01", "2026-12-31")
+        assert len(expected) == 91
+        assert _stored_bars(store, "BEL") == 91
+        assert stored.list_prices("BEL", "2026-01-01", "2026-12-31") == expected
+
+        # Bars written while the store was off: reads fall back to SQLite until the next write.
+        plain.upsert_price_columns("BEL", _cols("2026-10-01", 3, "D", base=300.0))
+        assert len(stored.list_prices("BEL", "2026-01-01", "2026-12-31")) == 94
+        assert _stored_bars(store, "BEL") == 91
+        stored.upsert_price_columns("BEL", _cols("2026-10-03", 2, "D", base=400.0))
+        assert _stored_bars(store, "BEL") == 95
+        assert stored.list_prices("BEL", "2026-01-01", "2026-12-31") == plain.list_prices(
+            "BEL", "2026-01-01", "2026-12-31"
+        )
+
+
+def test_failed_store_replace_keeps_reads_on_sqlite(tmp_path, monkeypatch):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    store = PriceStore(tmp_path / "prices")
+    with connect(settings.db_path) as conn:
+        stored = Repos(conn, price_store=store)
+        stored.upsert_company("BEL", "BEL")
+        stored.upsert_price_columns("BEL", _cols("2026-01-05", 20, "D"))
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(PriceStore, "replace", fail)
+        with pytest.raises(OSError):
+            stored.replace_price_columns("BEL", _cols("2026-01-05", 5, "D", base=50.0))
+        # The old month files are untouched, but reads serve the new history from SQLite.
+        assert _stored_bars(store, "BEL") == 20
+        assert [r["close"] for r in stored.list_prices("BEL", "2025-01-01", "2026-12-31")] == [
+            50.0,
+            51.0,
+            52.0,
+            None,
+            54.0,
+        ]
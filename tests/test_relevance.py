@@ -0,0 +1,33 @@
+from ims.services.relevance import alias_index
+
+
+def test_alias_index_matches_company_mentions():
+    bel = alias_index("BEL", "Bharat Electronics Ltd", "INE263A01024")
+    assert bel.matches("BEL bags Rs 500 crore order - Economic Times")
+    assert bel.matches("bharat electronics shares hit record high")
+    assert bel.matches("Record date set for INE263A01024")
+    # Short tickers are case-sensitive whole words.
+    assert not bel.matches("Bel Air property prices climb")
+    assert not bel.matches("Label makers rally")
+    assert not bel.matches("Sensex rallies as defence stocks surge")
+
+    lt = alias_index("LT", "Larsen & Toubro Ltd")
+    assert lt.matches("L&T wins mega order")
+    assert lt.matches("Larsen and Toubro Q2 profit rises")
+    assert not lt.matches("Lt. Gen. reviews defence exports")
+
+    assert alias_index("RELIANCE", "Reliance Industries Ltd").matches("RIL board approves demerger")
+
+
+def test_publisher_suffix_is_not_a_mention():
+    bel = alias_index("BEL", "Bharat Electronics Ltd")
+    assert not bel.matches("Defence stocks in focus - BEL Watch")
+
+
+def test_short_company_names_match_in_any_case():
+    wipro = alias_index("WIPRO", "Wipro Ltd")
+    assert wipro.matches("WIPRO Q2 results beat estimates")
+    assert wipro.matches("wipro shares rally")
+    titan = alias_index("TITAN", "Titan Company Ltd")
+    assert titan.matches("Titan posts record festive sales")
+    assert titan.matches("TITAN stock hits 52-week high")
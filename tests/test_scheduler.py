@@ -0,0 +1,45 @@
+import threading
+from dataclasses import replace
+
+from ims import scheduler
+from ims.core.settings import Settings
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+
+def test_watchlist_stages_run_concurrently_and_finish_every_run(tmp_path, monkeypatch):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        for symbol, name in (("BEL", "Bharat Electronics"), ("HAL", "Hindustan Aeronautics")):
+            repos.upsert_company(symbol, name)
+            repos.add_to_watchlist(symbol)
+
+    # Each stage only returns once all three are running at the same time.
+    started = threading.Barrier(3, timeout=5)
+
+    def stage(failed):
+        def run(settings, items, run_ids):
+            started.wait()
+            return failed
+
+        return run
+
+    def broken(settings, items, run_ids):
+        started.wait()
+        raise RuntimeError("Yahoo is down")
+
+    monkeypatch.setattr(scheduler, "_refresh_news", stage(set()))
+    monkeypatch.setattr(scheduler, "_refresh_prices", stage(set()))
+    monkeypatch.setattr(scheduler, "_refresh_filings", stage({"HAL"}))
+    scheduler.refresh_watchlist(settings)
+    # A stage that raises fails every run and is logged to each of them.
+    monkeypatch.setattr(scheduler, "_refresh_prices", broken)
+    scheduler.refresh_watchlist(settings)
+
+    with connect(settings.db_path) as conn:
+        rows = conn.execute("SELECT symbol, status FROM runs ORDER BY started_at, rowid").fetchall()
+        assert [tuple(r) for r in rows] == [("BEL", "SUCCESS"), ("HAL", "FAILED"), ("BEL", "FAILED"), ("HAL", "FAILED")]
+        errors = conn.execute("SELECT message FROM run_logs WHERE level='ERROR'").fetchall()
+        assert [r["message"] for r in errors] == ["Prices stage failed: Yahoo is down"] * 2
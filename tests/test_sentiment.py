@@ -1,4 +1,4 @@
-from ims.services.sentiment import score_headline
+from ims.services.sentiment import _lexicon_score, _score, clear_sentiment_memo, score_headline, score_headlines
 
 
 def test_score_headline_empty():
@@ -12,3 +12,17 @@ def test_score_headline_basic_positive():
     assert -1.0 <= s.score <= 1.0
     assert s.confidence >= 0.2
 
+
+def test_score_headlines_matches_single_and_memoizes():
+    clear_sentiment_memo()
+    titles = ["Company wins big order, shares rally", "  Company wins big  order, shares rally ", "Stock drops on probe"]
+    out = score_headlines(titles)
+    assert out == [score_headline(t) for t in titles]
+    assert out[0] == out[1]
+    assert _score.cache_info().misses == 2
+
+
+def test_lexicon_fallback():
+    s = _lexicon_score("Record profit and strong growth despite probe")
+    assert s.score > 0
+    assert s.confidence == 0.7
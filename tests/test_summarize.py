@@ -1,4 +1,4 @@
-from ims.services.summarize import summarize_filing
+from ims.services.summarize import summarize_filing, summarize_many
 
 
 def test_summarize_dividend_with_amount():
@@ -7,3 +7,21 @@ def test_summarize_dividend_with_amount():
     assert "₹5" in r.summary
     assert r.confidence >= 0.6
 
+
+def test_summarize_priority_and_first_amount():
+    r = summarize_filing("Award of contract", "Order worth INR 1,250.5 crore; earlier ₹ 9")
+    assert r.category == "ORDER_WIN"
+    assert "₹1250.5" in r.summary
+    # Dividend outranks an earlier order keyword.
+    assert summarize_filing("Outcome", "Work order received. Interim DIVIDEND declared.").category == "DIVIDEND"
+
+
+def test_summarize_scans_only_window():
+    text = "filler " * 5000 + "dividend of ₹5"
+    assert summarize_filing("Intimation", text).category == "OTHER"
+    assert summarize_filing("Intimation", text, scan_chars=None).category == "DIVIDEND"
+
+
+def test_summarize_many():
+    out = summarize_many([("Board Meeting", ""), ("Credit rating reaffirmed by CRISIL", ""), ("Misc", "")])
+    assert [r.category for r in out] == ["BOARD_MEETING", "CREDIT_RATING", "OTHER"]
@@ -0,0 +1,101 @@
+import json
+from dataclasses import replace
+
+import httpx
+
+from ims.core.settings import Settings
+from ims.pipelines.summaries import drain_summary_jobs, process_summary_jobs
+from ims.services.ollama import OllamaClient
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+
+
+def _filing(repos: Repos, tmp_path, n: int) -> str:
+    filing_id = f"f{n}"
+    repos.upsert_filing(
+        filing_id=filing_id,
+        symbol="BEL",
+        announced_at="2026-10-01",
+        title=f"Disclosure {n}",
+        category="OTHER",
+        summary="Company made a corporate announcement.",
+        confidence=0.40,
+        pdf_url=f"https://example.test/{n}.pdf",
+        pdf_sha256=f"sha{n}",
+        text_source="pdf_text",
+    )
+    text_path = tmp_path / f"{n}.txt"
+    text_path.write_text("good" if n == 0 else "bad", encoding="utf-8")
+    repos.insert_filing_artifact(
+        artifact_id=f"a{n}",
+        filing_id=filing_id,
+        pdf_path=str(tmp_path / f"{n}.pdf"),
+        text_path=str(text_path),
+        ocr_used=False,
+        ocr_pages=0,
+        ocr_engine_version=None,
+    )
+    repos.enqueue_summary_job(filing_id)
+    return filing_id
+
+
+def test_summary_jobs_upgrade_filings_and_retry(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db", summary_job_max_attempts=2)
+    init_db(settings.db_path)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ok = "good" in json.loads(request.content)["prompt"]
+        return httpx.Response(200, json={"response": "BEL won a defence order." if ok else ""})
+
+    client = OllamaClient(base_url="http://ollama.test", model="m", transport=httpx.MockTransport(handler))
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        good, bad = _filing(repos, tmp_path, 0), _filing(repos, tmp_path, 1)
+        assert repos.summary_queue_stats()["depth"] == 2
+
+        assert process_summary_jobs(repos, settings, client=client) == 2
+        assert repos.get_filing(good)["summary"] == "BEL won a defence order."
+        assert repos.get_filing(good)["confidence"] == 0.60
+        assert repos.summary_queue_stats()["pending"] == 1
+
+        # The failed job waits out its backoff (base 60s for the first retry).
+        retry_in = conn.execute(
+            "SELECT (julianday(next_attempt_at) - julianday('now')) * 86400.0 FROM summary_jobs WHERE filing_id=?",
+            (bad,),
+        ).fetchone()[0]
+        assert 55 < retry_in <= 60
+        assert process_summary_jobs(repos, settings, client=client) == 0
+        conn.execute("UPDATE summary_jobs SET next_attempt_at=datetime('now', '-1 second') WHERE filing_id=?", (bad,))
+
+        assert process_summary_jobs(repos, settings, client=client) == 1
+        stats = repos.summary_queue_stats()
+        assert (stats["depth"], stats["done"], stats["failed"]) == (0, 1, 1)
+        assert repos.get_filing(bad)["confidence"] == 0.40
+        assert process_summary_jobs(repos, settings, client=client) == 0
+
+
+def test_claims_never_overlap_and_drain_empties_the_queue(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db", summary_job_max_attempts=2)
+    init_db(settings.db_path)
+    client = OllamaClient(
+        base_url="http://ollama.test",
+        model="m",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"response": "Order win."})),
+    )
+    with connect(settings.db_path, autocommit=True) as conn:
+        repos = Repos(conn)
+        repos.upsert_company("BEL", "Bharat Electronics")
+        ids = [_filing(repos, tmp_path, n) for n in range(5)]
+
+        with connect(settings.db_path, autocommit=True) as other:
+            first = repos.claim_summary_jobs(2)
+            second = Repos(other).claim_summary_jobs(10)
+        assert [j["filing_id"] for j in first] == ids[:2]
+        assert [j["filing_id"] for j in second] == ids[2:]
+        assert repos.claim_summary_jobs(10) == []
+
+        assert repos.requeue_running_summary_jobs() == 5
+        assert drain_summary_jobs(repos, settings, client=client) == 5
+        stats = repos.summary_queue_stats()
+        assert (stats["depth"], stats["done"]) == (0, 5)
@@ -0,0 +1,42 @@
+from dataclasses import replace
+
+from ims.core.settings import Settings
+from ims.storage.db import connect, init_db
+from ims.storage.repos import Repos
+from ims.storage.text_cache import CachedText, TextCache
+
+
+def _entry(n: int) -> CachedText:
+    return CachedText(text="x" * n, text_source="pdf_text", ocr_page_list=[], engine_version=None)
+
+
+def test_text_cache_roundtrip_and_lru_eviction(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db", text_cache_max_mb=250 / (1024 * 1024))
+    init_db(settings.db_path)
+    with connect(settings.db_path) as conn:
+        repos = Repos(conn)
+        cache = TextCache(repos, settings)
+        keys = [cache.key(pdf_sha256=f"sha{i}", extractor="pypdf2", engine_version=None) for i in range(3)]
+        assert cache.get(keys[0]) is None
+
+        cache.put(keys[0], pdf_sha256="sha0", extractor="pypdf2", entry=_entry(100))
+        cache.put(keys[1], pdf_sha256="sha1", extractor="pypdf2", entry=_entry(100))
+        conn.execute("UPDATE text_cache SET last_used_at='2000-01-01' WHERE cache_key=?", (keys[0],))
+        cache.put(keys[2], pdf_sha256="sha2", extractor="pypdf2", entry=_entry(100))
+
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[2]).text == "x" * 100
+        assert repos.text_cache_usage()["entries"] == 2
+
+
+def test_text_cache_keeps_the_ocr_truncation_flag(tmp_path):
+    settings = replace(Settings(), db_path=tmp_path / "ims.db")
+    init_db(settings.db_path)
+    with connect(settings.db_path) as conn:
+        cache = TextCache(Repos(conn), settings)
+        key = cache.key(pdf_sha256="sha0", extractor="pypdf2", engine_version="5.3.0")
+        entry = CachedText(
+            text="ocr 1", text_source="ocr", ocr_page_list=[1], engine_version="5.3.0", ocr_truncated=True
+        )
+        cache.put(key, pdf_sha256="sha0", extractor="pypdf2", entry=entry)
+        assert cache.get(key) == entry
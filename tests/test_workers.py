@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ims.services.workers import CpuPool
+
+
+def test_inline_backend_runs_in_caller():
+    pool = CpuPool(0, task_timeout_s=1.0)
+    assert pool.run(abs, -3) == 3
+
+
+def test_timeout_recycles_workers():
+    pool = CpuPool(1, task_timeout_s=0.5)
+    try:
+        with pytest.raises(TimeoutError):
+            pool.run(time.sleep, 10)
+        assert pool.run(abs, -4) == 4
+    finally:
+        pool.close()
+
+
+def test_queued_tasks_do_not_count_against_the_timeout():
+    pool = CpuPool(1, task_timeout_s=1.0)
+    try:
+        pool.run(abs, -1)  # start the worker
+        with ThreadPoolExecutor(2) as callers:
+            # The second task waits ~0.7s for the worker, then runs well within its own timeout.
+            assert list(callers.map(lambda _: pool.run(time.sleep, 0.7), range(2))) == [None, None]
+    finally:
+        pool.close()
+
+
+def test_timeout_only_restarts_the_stuck_worker():
+    pool = CpuPool(2, task_timeout_s=1.0)
+    try:
+        with ThreadPoolExecutor(2) as callers:
+            list(callers.map(lambda n: pool.run(abs, n), (-1, -2)))  # start both workers
+            stuck = callers.submit(pool.run, time.sleep, 10)
+            # Keep the other worker busy across the stuck task's timeout and restart.
+            for _ in range(4):
+                assert pool.run(time.sleep, 0.4) is None
+            with pytest.raises(TimeoutError):
+                stuck.result()
+        assert pool.run(abs, -4) == 4
+    finally:
+        pool.close()